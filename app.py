@@ -1,37 +1,150 @@
+import argparse
+import sys
 import threading
+import time
 import tkinter as tk
-from typing import Any, Dict, List, Optional
-
-from cry_player import CryPlaybackError, play_pokemon_cry
-from pokeapi_client import PokeAPIError, get_image_bytes, get_original_151, get_pokemon_details
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import metrics
+from dex_list import VirtualDexList
+from pokeapi_client import (
+    BACKENDS,
+    DEXES,
+    enable_offline_mode,
+    get_backend,
+    get_offline_pack,
+    get_type_chart,
+    iter_pokedex,
+    set_backend,
+)
+from pokeapi_async import AsyncPokeAPIClient, EventLoopThread
+from pokemon_models import PokemonDetails, PokemonSummary
+from prefetch import PrefetchEngine
+from request_scheduler import RequestScheduler
+from search_index import SearchIndex
 from shell_styles import Fonts, ShellStyle
-from ui_utils import image_bytes_to_photoimage, set_readonly_text
+from sprite_atlas import SpriteAtlas, atlas_available, build_atlas
+from sprite_pipeline import PreparedSprite, SpriteError, fit_scale, prepare_sprite, scale_sprite
+from stat_analytics import COLUMN_LABELS, StatMatrix
+from type_chart import MAX_TEAM_SIZE, TypeChart, TypeChartError, format_multiplier
+from ui_utils import SpriteRenderer, pil_to_photoimage, set_readonly_text
+
+RESIZE_DEBOUNCE_MS = 60
+SIMILAR_COUNT = 5
+RANKING_COUNT = 5
+COUNTER_COUNT = 4
+METRICS_REFRESH_MS = 500
+
+
+
+class StartupProfiler:
+    """Records startup milestones relative to `start` (default: now) and prints them once the list is ready."""
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        self.start = time.perf_counter() if start is None else start
+        self.marks: Dict[str, float] = {}
+        self._reported = False
+
+    def mark(self, name: str) -> None:
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.start
+        if not self._reported and "first_paint" in self.marks and "list_ready" in self.marks:
+            self._reported = True
+            self.report()
+
+    def report(self) -> None:
+        parts = [f"{name.replace('_', ' ')} {seconds * 1000:.1f} ms" for name, seconds in self.marks.items()]
+        print("startup: " + ", ".join(parts), file=sys.stderr)
+
 
 
 class PokedexApp:
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(
+        self,
+        root: tk.Tk,
+        profiler: Optional[StartupProfiler] = None,
+        metrics_out: Optional[Path] = None,
+        dex: str = "kanto",
+    ) -> None:
         self.root = root
-        self.root.title(ShellStyle.WINDOW_TITLE)
+        self.profiler = profiler
+        self.metrics_out = metrics_out
         self.root.geometry(ShellStyle.WINDOW_SIZE)
         self.root.minsize(ShellStyle.MIN_WIDTH, ShellStyle.MIN_HEIGHT)
         self.root.configure(bg=ShellStyle.WINDOW_BG)
 
-        self.all_pokemon: List[Dict[str, Any]] = []
-        self.filtered_pokemon: List[Dict[str, Any]] = []
-        self.current_details: Optional[Dict[str, Any]] = None
+        # The offline pack only carries Kanto, so the region menu shrinks to match.
+        self.dexes = {"kanto": DEXES["kanto"]} if get_offline_pack() is not None else dict(DEXES)
+        self.dex_name = dex if dex in self.dexes else "kanto"
+        self.root.title(ShellStyle.WINDOW_TITLE.format(dex=self._dex_label()))
+        self._list_generation = 0
+        self.all_pokemon: List[PokemonSummary] = []
+        self.filtered_pokemon: List[PokemonSummary] = []
+        self.search_index = SearchIndex()
+        self._known_types: Dict[int, Tuple[str, ...]] = {}
+        self._known_details: Dict[int, PokemonDetails] = {}
+        self._stat_matrix: Optional[StatMatrix] = None
+        self.type_chart: Optional[TypeChart] = None
+        self._type_chart_loading = False
+        self._type_chart_error: Optional[str] = None
+        self.team: List[PokemonDetails] = []
+        self.current_details: Optional[PokemonDetails] = None
         self.current_photo: Optional[tk.PhotoImage] = None
         self.current_image_data: Optional[bytes] = None
+        self.sprite_renderer = SpriteRenderer()
+        self._resize_after_id: Optional[str] = None
+        self.sprite_atlas: Optional[SpriteAtlas] = None
+        self._atlas_building = False
+        self._thumbnail_photos: Dict[int, Any] = {}
+        self._decorations: List[Callable[[], None]] = []
+        self._select_started: Dict[int, float] = {}
+        self._metrics_after_id: Optional[str] = None
 
         self.name_var = tk.StringVar(value="BOOTING...")
-        self.meta_var = tk.StringVar(value="Initializing Kanto registry")
+        self.meta_var = tk.StringVar(value=f"Initializing {self._dex_label()} registry")
         self.type_var = tk.StringVar(value="Types: --")
         self.ability_var = tk.StringVar(value="Abilities: --")
         self.status_var = tk.StringVar(value="Connecting to Professor Oak's network...")
         self.search_var = tk.StringVar()
+        self.metrics_var = tk.StringVar()
+        self.dex_var = tk.StringVar(value=self._dex_label())
+        self.rank_stat_var = tk.StringVar(value="Speed")
+        self.dex_title_var = tk.StringVar(value=f"{self._dex_label().upper()} INDEX")
+        self._status_message = self.status_var.get()
+        self._prefetch_progress = ""
+        self.scheduler = RequestScheduler()
+        self.async_loop = EventLoopThread()
+        self.async_client = AsyncPokeAPIClient(inflight=self.scheduler.inflight)
+        self.prefetch = PrefetchEngine(
+            on_progress=self._on_prefetch_progress,
+            on_details=self._on_prefetch_details,
+            coalesce=self.scheduler.coalesce,
+        )
+
+        # Start the list request first so the network round trip overlaps widget construction.
+        self._load_pokemon_list()
 
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.bind("<F3>", lambda _event: self._toggle_metrics_overlay())
         self._build_ui()
         self._set_idle_content()
-        self._load_pokemon_list()
+        self._mark_startup("ui_built")
+        self.root.after_idle(self._draw_decorations)
+        self.root.after_idle(lambda: self._mark_startup("first_paint"))
+
+    def _mark_startup(self, name: str) -> None:
+        if self.profiler is not None:
+            self.profiler.mark(name)
+
+    def _decorate(self, draw: Callable[[], None]) -> None:
+        """Queue purely decorative drawing until after the first paint."""
+        self._decorations.append(draw)
+
+    def _draw_decorations(self) -> None:
+        decorations, self._decorations = self._decorations, []
+        for draw in decorations:
+            draw()
 
     def _build_ui(self) -> None:
         self.root.columnconfigure(0, weight=1)
@@ -67,16 +180,16 @@ class PokedexApp:
 
         lens_canvas = tk.Canvas(top, width=92, height=92, bg=ShellStyle.SHELL_RED, highlightthickness=0)
         lens_canvas.grid(row=0, column=0, rowspan=2, sticky="w", padx=(0, 12))
-        lens_canvas.create_oval(6, 6, 86, 86, fill="#D8F0FF", outline="#EAF8FF", width=3)
-        lens_canvas.create_oval(18, 18, 74, 74, fill=ShellStyle.BUTTON_BLUE, outline="#B9E1FF", width=5)
-        lens_canvas.create_oval(28, 28, 45, 45, fill="#D9F4FF", outline="")
+        self._decorate(lambda: self._draw_lens(lens_canvas))
 
         lights = tk.Frame(top, bg=ShellStyle.SHELL_RED)
         lights.grid(row=0, column=1, sticky="nw")
         for color in ("#FF6B6B", "#FFD93D", "#6BCB77"):
             light = tk.Canvas(lights, width=24, height=24, bg=ShellStyle.SHELL_RED, highlightthickness=0)
             light.pack(side="left", padx=4)
-            light.create_oval(4, 4, 20, 20, fill=color, outline="#F3F3F3", width=1)
+            self._decorate(
+                lambda light=light, color=color: light.create_oval(4, 4, 20, 20, fill=color, outline="#F3F3F3", width=1)
+            )
 
         brand = tk.Label(
             top,
@@ -104,10 +217,10 @@ class PokedexApp:
         tk.Canvas(screen_header, width=18, height=18, bg=ShellStyle.BEZEL, highlightthickness=0).pack(side="left", padx=4)
         header_light_left = tk.Canvas(screen_header, width=18, height=18, bg=ShellStyle.BEZEL, highlightthickness=0)
         header_light_left.pack(side="left")
-        header_light_left.create_oval(3, 3, 15, 15, fill="#FF5C5C", outline="")
         header_light_right = tk.Canvas(screen_header, width=18, height=18, bg=ShellStyle.BEZEL, highlightthickness=0)
         header_light_right.pack(side="left", padx=(2, 0))
-        header_light_right.create_oval(3, 3, 15, 15, fill="#FF5C5C", outline="")
+        for header_light in (header_light_left, header_light_right):
+            self._decorate(lambda canvas=header_light: canvas.create_oval(3, 3, 15, 15, fill="#FF5C5C", outline=""))
 
         self.image_panel = tk.Frame(
             screen_bezel,
@@ -135,15 +248,14 @@ class PokedexApp:
 
         speaker_light = tk.Canvas(footer, width=28, height=28, bg=ShellStyle.BEZEL, highlightthickness=0)
         speaker_light.grid(row=0, column=0, sticky="w")
-        speaker_light.create_oval(5, 5, 23, 23, fill="#FF5C5C", outline="")
+        self._decorate(lambda: speaker_light.create_oval(5, 5, 23, 23, fill="#FF5C5C", outline=""))
 
         footer_spacer = tk.Frame(footer, bg=ShellStyle.BEZEL)
         footer_spacer.grid(row=0, column=1, sticky="ew")
 
         speaker = tk.Canvas(footer, width=70, height=26, bg=ShellStyle.BEZEL, highlightthickness=0)
         speaker.grid(row=0, column=2, sticky="e")
-        for x in range(10, 65, 10):
-            speaker.create_line(x, 6, x, 20, fill="#BBBBBB", width=2)
+        self._decorate(lambda: self._draw_speaker(speaker))
 
         info_panel = tk.Frame(left, bg=ShellStyle.PANEL_BG, padx=12, pady=12)
         info_panel.grid(row=2, column=0, sticky="ew", pady=(0, 12))
@@ -210,8 +322,9 @@ class PokedexApp:
 
         lower = tk.Frame(left, bg=ShellStyle.SHELL_RED)
         lower.grid(row=3, column=0, sticky="nsew")
-        lower.columnconfigure(0, weight=1)
-        lower.columnconfigure(1, weight=1)
+        # Equal widths whatever each text box asks for, so no panel gets squeezed out.
+        for column in range(4):
+            lower.columnconfigure(column, weight=1, uniform="lower")
         lower.rowconfigure(0, weight=1, minsize=180)
 
         entry_box = tk.Frame(lower, bg="#ABB87A", highlightbackground="#5F6F28", highlightthickness=2)
@@ -266,12 +379,96 @@ class PokedexApp:
         self.stats_text.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
         self.stats_text.config(state="disabled")
 
+        matchup_box = tk.Frame(lower, bg="#ABB87A", highlightbackground="#5F6F28", highlightthickness=2)
+        matchup_box.grid(row=0, column=2, sticky="nsew", padx=(10, 0))
+        matchup_box.columnconfigure(0, weight=1)
+        matchup_box.rowconfigure(1, weight=1)
+        tk.Label(
+            matchup_box,
+            text="MATCHUPS",
+            bg="#ABB87A",
+            fg=ShellStyle.SCREEN_TEXT,
+            font=Fonts.PANEL_TITLE,
+            anchor="w",
+        ).grid(row=0, column=0, sticky="ew", padx=10, pady=(8, 0))
+        self.team_button = tk.Button(
+            matchup_box,
+            text="+ TEAM",
+            command=self._toggle_team_member,
+            bg=ShellStyle.BUTTON_BLACK,
+            fg="#F4F4F4",
+            activebackground="#3A3A3A",
+            activeforeground="#FFFFFF",
+            relief="flat",
+            font=Fonts.BUTTON,
+            padx=6,
+            pady=0,
+            cursor="hand2",
+        )
+        self.team_button.grid(row=0, column=1, sticky="e", padx=(0, 8), pady=(8, 0))
+        self.matchup_text = tk.Text(
+            matchup_box,
+            wrap="word",
+            width=24,
+            bg=ShellStyle.SCREEN_BG,
+            fg=ShellStyle.SCREEN_TEXT,
+            relief="flat",
+            insertbackground=ShellStyle.SCREEN_TEXT,
+            font=Fonts.SCREEN_TEXT,
+            padx=10,
+            pady=10,
+        )
+        self.matchup_text.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=8, pady=8)
+        self.matchup_text.config(state="disabled")
+
+        compare_box = tk.Frame(lower, bg="#ABB87A", highlightbackground="#5F6F28", highlightthickness=2)
+        compare_box.grid(row=0, column=3, sticky="nsew", padx=(10, 0))
+        compare_box.columnconfigure(0, weight=1)
+        compare_box.rowconfigure(1, weight=1)
+        tk.Label(
+            compare_box,
+            text="COMPARE",
+            bg="#ABB87A",
+            fg=ShellStyle.SCREEN_TEXT,
+            font=Fonts.PANEL_TITLE,
+            anchor="w",
+        ).grid(row=0, column=0, sticky="ew", padx=10, pady=(8, 0))
+        rank_menu = tk.OptionMenu(compare_box, self.rank_stat_var, *COLUMN_LABELS, command=lambda _label: self._render_comparison())
+        rank_menu.configure(
+            bg="#ABB87A",
+            fg=ShellStyle.SCREEN_TEXT,
+            activebackground="#C3CF92",
+            activeforeground=ShellStyle.SCREEN_TEXT,
+            highlightthickness=0,
+            relief="flat",
+            font=("Courier", 10, "bold"),
+            cursor="hand2",
+        )
+        rank_menu["menu"].configure(font=("Courier", 10), bg=ShellStyle.SCREEN_BG, fg=ShellStyle.SCREEN_TEXT)
+        rank_menu.grid(row=0, column=1, sticky="e", padx=(0, 6), pady=(6, 0))
+        self.compare_text = tk.Text(
+            compare_box,
+            wrap="none",
+            width=28,
+            bg=ShellStyle.SCREEN_BG,
+            fg=ShellStyle.SCREEN_TEXT,
+            relief="flat",
+            insertbackground=ShellStyle.SCREEN_TEXT,
+            font=Fonts.SCREEN_TEXT,
+            padx=10,
+            pady=10,
+        )
+        self.compare_text.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=8, pady=8)
+        self.compare_text.config(state="disabled")
+
     def _build_hinge(self, parent: tk.Frame) -> None:
         hinge = tk.Frame(parent, bg=ShellStyle.SHELL_RED_DARK, width=34)
         hinge.grid(row=0, column=1, sticky="ns")
         hinge.grid_propagate(False)
         hinge.columnconfigure(0, weight=1)
+        self._decorate(lambda: self._draw_hinge_notches(hinge))
 
+    def _draw_hinge_notches(self, hinge: tk.Frame) -> None:
         for idx in range(7):
             spacer = tk.Frame(hinge, bg=ShellStyle.SHELL_RED_DARK, height=18)
             spacer.grid(row=idx * 2, column=0, sticky="ew")
@@ -290,7 +487,7 @@ class PokedexApp:
 
         tk.Label(
             search_panel,
-            text="SEARCH BY NAME OR #",
+            text="SEARCH BY NAME, # OR TYPE",
             bg=ShellStyle.PANEL_BG,
             fg="#1A1A1A",
             font=Fonts.LABEL_BOLD,
@@ -351,39 +548,42 @@ class PokedexApp:
         list_panel.columnconfigure(0, weight=1)
         list_panel.rowconfigure(1, weight=1)
 
+        list_header = tk.Frame(list_panel, bg="#ABB87A")
+        list_header.grid(row=0, column=0, sticky="ew", padx=10, pady=(8, 0))
+        list_header.columnconfigure(0, weight=1)
         tk.Label(
-            list_panel,
-            text="KANTO INDEX 001-151",
+            list_header,
+            textvariable=self.dex_title_var,
             bg="#ABB87A",
             fg=ShellStyle.SCREEN_TEXT,
             font=("Courier", 13, "bold"),
             anchor="w",
-        ).grid(row=0, column=0, sticky="ew", padx=10, pady=(8, 0))
-
-        list_inner = tk.Frame(list_panel, bg="#ABB87A")
-        list_inner.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
-        list_inner.columnconfigure(0, weight=1)
-        list_inner.rowconfigure(0, weight=1)
+        ).grid(row=0, column=0, sticky="ew")
 
-        self.listbox = tk.Listbox(
-            list_inner,
-            activestyle="none",
-            exportselection=False,
-            bg=ShellStyle.SCREEN_BG,
+        dex_menu = tk.OptionMenu(list_header, self.dex_var, *self.dexes.values(), command=self._on_dex_change)
+        dex_menu.configure(
+            bg="#ABB87A",
             fg=ShellStyle.SCREEN_TEXT,
-            selectbackground="#6F8D0D",
-            selectforeground="#F8F8F8",
+            activebackground="#C3CF92",
+            activeforeground=ShellStyle.SCREEN_TEXT,
+            highlightthickness=0,
             relief="flat",
-            borderwidth=0,
-            font=Fonts.LIST,
-            width=22,
+            font=("Courier", 11, "bold"),
+            cursor="hand2",
         )
-        self.listbox.grid(row=0, column=0, sticky="nsew")
-        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        dex_menu["menu"].configure(font=("Courier", 11), bg=ShellStyle.SCREEN_BG, fg=ShellStyle.SCREEN_TEXT)
+        dex_menu.grid(row=0, column=1, sticky="e")
 
-        scrollbar = tk.Scrollbar(list_inner, orient="vertical", command=self.listbox.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.listbox.config(yscrollcommand=scrollbar.set)
+        # Only the visible rows exist as canvas items; thumbnails appear once a sprite atlas is loaded.
+        self.dex_list = VirtualDexList(
+            list_panel,
+            on_select=self._on_select,
+            on_previous=self._select_previous,
+            on_next=self._select_next,
+            thumbnail=self._thumbnail_photo,
+            types=self._known_types.get,
+        )
+        self.dex_list.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
 
         bottom_controls = tk.Frame(right, bg=ShellStyle.SHELL_RED)
         bottom_controls.grid(row=3, column=0, sticky="ew", pady=(14, 0))
@@ -394,14 +594,14 @@ class PokedexApp:
         tk.Canvas(small_buttons, width=56, height=18, bg=ShellStyle.SHELL_RED, highlightthickness=0).pack(side="left", padx=(0, 10))
         btn_red = tk.Canvas(small_buttons, width=56, height=18, bg=ShellStyle.SHELL_RED, highlightthickness=0)
         btn_red.pack(side="left", padx=(0, 10))
-        btn_red.create_oval(2, 2, 54, 16, fill="#E53935", outline="#8E1C1C", width=2)
         btn_blue = tk.Canvas(small_buttons, width=56, height=18, bg=ShellStyle.SHELL_RED, highlightthickness=0)
         btn_blue.pack(side="left")
-        btn_blue.create_oval(2, 2, 54, 16, fill="#1E88E5", outline="#0D47A1", width=2)
+        self._decorate(lambda: btn_red.create_oval(2, 2, 54, 16, fill="#E53935", outline="#8E1C1C", width=2))
+        self._decorate(lambda: btn_blue.create_oval(2, 2, 54, 16, fill="#1E88E5", outline="#0D47A1", width=2))
 
         dpad = tk.Canvas(bottom_controls, width=120, height=110, bg=ShellStyle.SHELL_RED, highlightthickness=0)
         dpad.grid(row=0, column=2, sticky="e")
-        self._draw_dpad(dpad)
+        self._decorate(lambda: self._draw_dpad(dpad))
 
         tk.Label(
             right,
@@ -413,6 +613,28 @@ class PokedexApp:
             justify="left",
         ).grid(row=4, column=0, sticky="ew", pady=(10, 0))
 
+        # Hidden until F3 toggles it on.
+        self.metrics_label = tk.Label(
+            right,
+            textvariable=self.metrics_var,
+            bg=ShellStyle.SHELL_RED,
+            fg="#FFE082",
+            font=Fonts.LABEL,
+            anchor="w",
+            justify="left",
+        )
+        self.metrics_label.grid(row=5, column=0, sticky="ew", pady=(4, 0))
+        self.metrics_label.grid_remove()
+
+    def _draw_lens(self, canvas: tk.Canvas) -> None:
+        canvas.create_oval(6, 6, 86, 86, fill="#D8F0FF", outline="#EAF8FF", width=3)
+        canvas.create_oval(18, 18, 74, 74, fill=ShellStyle.BUTTON_BLUE, outline="#B9E1FF", width=5)
+        canvas.create_oval(28, 28, 45, 45, fill="#D9F4FF", outline="")
+
+    def _draw_speaker(self, canvas: tk.Canvas) -> None:
+        for x in range(10, 65, 10):
+            canvas.create_line(x, 6, x, 20, fill="#BBBBBB", width=2)
+
     def _draw_dpad(self, canvas: tk.Canvas) -> None:
         fill = ShellStyle.BUTTON_BLACK
         outline = "#111111"
@@ -423,49 +645,110 @@ class PokedexApp:
     def _set_idle_content(self) -> None:
         set_readonly_text(self.entry_text, "Select a Pokémon to load its Pokédex entry.")
         set_readonly_text(self.stats_text, "HP\nAttack\nDefense\nSpecial Attack\nSpecial Defense\nSpeed")
+        set_readonly_text(self.compare_text, "")
+        set_readonly_text(self.matchup_text, "")
         self._render_no_image("NO SIGNAL")
 
+    def _dex_label(self) -> str:
+        return self.dexes.get(self.dex_name, self.dex_name.title())
+
     def _load_pokemon_list(self) -> None:
+        """Stream the current dex page by page; a newer call (region change) makes older streams stop."""
+        self._list_generation += 1
+        generation = self._list_generation
+        dex = self.dex_name
+
         def worker() -> None:
             try:
-                pokemon = get_original_151()
-                self.root.after(0, lambda: self._finish_loading_list(pokemon))
+                for page in iter_pokedex(dex):
+                    if generation != self._list_generation:
+                        return
+                    self.root.after(0, lambda page=page: self._append_list_page(generation, page))
+                self.root.after(0, lambda: self._finish_loading_list(generation))
             except Exception as exc:
-                self.root.after(0, lambda: self._set_error(f"Could not load Pokémon list: {exc}"))
+                self.root.after(0, lambda: self._list_failed(generation, exc))
+                return
+
+            # Decoding the atlas is the only sprite decode for this dex; keep it off the Tk thread.
+            atlas = SpriteAtlas.load(dex)
+            if atlas is not None:
+                self.root.after(0, lambda: self._adopt_atlas(atlas, dex))
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _finish_loading_list(self, pokemon: List[Dict[str, Any]]) -> None:
-        self.all_pokemon = pokemon
-        self.filtered_pokemon = pokemon[:]
-        self._refresh_listbox()
-        self.status_var.set(f"Kanto registry online. Loaded {len(pokemon)} Pokémon.")
+    def _append_list_page(self, generation: int, page: List[PokemonSummary]) -> None:
+        if generation != self._list_generation:
+            return
+        self.all_pokemon.extend(page)
+        self.search_index.extend(page)
+        self._stat_matrix = None
+        self.dex_title_var.set(f"{self._dex_label().upper()} INDEX {len(self.all_pokemon)}...")
 
-        if pokemon:
-            self.listbox.selection_set(0)
-            self.listbox.activate(0)
-            self.listbox.see(0)
+        if self.search_var.get().strip():
+            self._filter_list()
+            return
+
+        # With no query the list shows every entry, so the page is appended in place.
+        self.filtered_pokemon.extend(page)
+        self.dex_list.rows_appended()
+        if self.dex_list.selection is None and self.filtered_pokemon:
+            self._mark_startup("first_rows")
+            self.dex_list.select(0, notify=False)
             self.root.after_idle(self._on_select)
 
-    def _filter_list(self) -> None:
-        query = self.search_var.get().strip().lower()
-        if not query:
-            self.filtered_pokemon = self.all_pokemon[:]
+    def _finish_loading_list(self, generation: int) -> None:
+        if generation != self._list_generation:
+            return
+        label = self._dex_label()
+        self.dex_title_var.set(f"{label.upper()} INDEX {len(self.all_pokemon)}")
+        self._set_status(f"{label} registry online. Loaded {len(self.all_pokemon)} Pokémon.")
+        self.prefetch.start(self.all_pokemon[:])
+        self.prefetch.focus(self._selected_pokemon_id())
+        self._mark_startup("list_ready")
+
+    def _list_failed(self, generation: int, exc: Exception) -> None:
+        if generation != self._list_generation:
+            return
+        if self.all_pokemon:
+            self._set_status(f"{self._dex_label()} list stopped after {len(self.all_pokemon)} Pokémon: {exc}")
         else:
-            self.filtered_pokemon = [
-                pokemon
-                for pokemon in self.all_pokemon
-                if query in pokemon["name"].lower() or query in str(pokemon["id"])
-            ]
+            self._set_error(f"Could not load Pokémon list: {exc}")
 
-        self._refresh_listbox()
-        if self.filtered_pokemon:
-            self.listbox.selection_set(0)
-            self.listbox.activate(0)
-            self.listbox.see(0)
+    def _on_dex_change(self, label: str) -> None:
+        dex = next((name for name, dex_label in self.dexes.items() if dex_label == label), self.dex_name)
+        if dex == self.dex_name:
+            return
+
+        self.dex_name = dex
+        self.root.title(ShellStyle.WINDOW_TITLE.format(dex=label))
+        self.prefetch.start([])
+        self._prefetch_progress = ""
+        self.all_pokemon = []
+        self.filtered_pokemon = []
+        self.search_index = SearchIndex()
+        self._stat_matrix = None
+        self.dex_list.set_rows(self.filtered_pokemon)
+        self.dex_title_var.set(f"{label.upper()} INDEX")
+        self._set_status(f"Connecting to the {label} registry...")
+        self._load_pokemon_list()
+
+    def _filter_list(self) -> None:
+        selected_id = self._selected_pokemon_id()
+        self.filtered_pokemon = self.search_index.search(self.search_var.get())
+        self.dex_list.set_rows(self.filtered_pokemon)
+        self.prefetch.focus(preferred_ids=[pokemon.id for pokemon in self.filtered_pokemon])
+
+        index = self.dex_list.index_of(selected_id) if selected_id is not None else None
+        if index is not None:
+            # The entry on screen survived the filter: keep it selected and skip the refetch.
+            self.dex_list.select(index, notify=False)
+            if not self.current_details or self.current_details.id != selected_id:
+                self.root.after_idle(self._on_select)
+        elif self.filtered_pokemon:
+            self.dex_list.select(0, notify=False)
             self.root.after_idle(self._on_select)
         else:
-            self.status_var.set("No Pokémon match that scan.")
+            self._set_status("No Pokémon match that scan.")
             self.current_details = None
             self.current_image_data = None
             self.current_photo = None
@@ -476,109 +759,331 @@ class PokedexApp:
             self._render_no_image("NO IMAGE")
             set_readonly_text(self.entry_text, "Select a Pokémon to load its Pokédex entry.")
             set_readonly_text(self.stats_text, "HP\nAttack\nDefense\nSpecial Attack\nSpecial Defense\nSpeed")
+            set_readonly_text(self.compare_text, "")
+            set_readonly_text(self.matchup_text, "")
 
-    def _refresh_listbox(self) -> None:
-        self.listbox.delete(0, tk.END)
-        for pokemon in self.filtered_pokemon:
-            self.listbox.insert(tk.END, f"#{pokemon['id']:03}  {pokemon['name']}")
+    def _selected_pokemon_id(self) -> Optional[int]:
+        pokemon = self.dex_list.selected_row()
+        return pokemon.id if pokemon is not None else None
 
     def _select_previous(self) -> None:
-        selection = self.listbox.curselection()
-        if not selection:
+        if self.dex_list.selection is None:
             return
-        new_index = max(0, selection[0] - 1)
-        self._select_listbox_index(new_index)
+        self.dex_list.select(max(0, self.dex_list.selection - 1))
 
     def _select_next(self) -> None:
-        selection = self.listbox.curselection()
-        if not selection:
+        if self.dex_list.selection is None:
             return
-        new_index = min(len(self.filtered_pokemon) - 1, selection[0] + 1)
-        self._select_listbox_index(new_index)
-
-    def _select_listbox_index(self, index: int) -> None:
-        self.listbox.selection_clear(0, tk.END)
-        self.listbox.selection_set(index)
-        self.listbox.activate(index)
-        self.listbox.see(index)
-        self.listbox.event_generate("<<ListboxSelect>>")
+        self.dex_list.select(min(len(self.filtered_pokemon) - 1, self.dex_list.selection + 1))
 
     def _on_select(self, _event: object = None) -> None:
-        selection = self.listbox.curselection()
-        if not selection:
+        index = self.dex_list.selection
+        if index is None or index >= len(self.filtered_pokemon):
             return
 
-        index = selection[0]
-        if index >= len(self.filtered_pokemon):
+        pokemon = self.filtered_pokemon[index]
+        self._set_status(f"Scanning #{pokemon.id:03} {pokemon.name}...")
+        self.prefetch.focus(pokemon.id)
+        self._render_atlas_preview(pokemon.id)
+
+        generation = self.scheduler.begin()
+        self._select_started = {generation: time.perf_counter()}
+
+        _, _, max_width, max_height = self._image_box()
+        atlas = self.sprite_atlas
+
+        def job(is_current) -> Optional[tuple]:
+            # One await for details and sprite, which overlap on the event loop. The async
+            # client shares the scheduler's in-flight keys and the cached records with the
+            # prefetcher, so a click on an entry it is fetching joins that fetch, and a
+            # prefetched entry costs no request.
+            details, image_data = self.async_loop.run(self.async_client.get_entry(pokemon.id))
+            if not is_current():
+                return None
+
+            # Decode and scale here so the Tk thread only has to wrap the pixels.
+            prepared = None
+            if image_data and atlas is not None and atlas.urls.get(pokemon.id) == details.image_url:
+                prepared = atlas.prepare(pokemon.id, image_data, max_width, max_height)
+            if image_data and prepared is None and is_current():
+                try:
+                    prepared = prepare_sprite(image_data, max_width, max_height)
+                except SpriteError:
+                    prepared = None
+            return details, image_data, prepared
+
+        self.scheduler.submit(
+            generation,
+            job,
+            on_success=lambda result: self.root.after(0, lambda: self._deliver_selection(generation, result)),
+            on_error=lambda exc: self.root.after(
+                0,
+                lambda: self._deliver_selection_error(generation, exc),
+            ),
+        )
+
+    def _deliver_selection(self, generation: int, result: Optional[tuple]) -> None:
+        if result is not None and self.scheduler.is_current(generation):
+            with metrics.span("ui.display", pokemon_id=result[0].id):
+                self._display_pokemon(*result)
+            started = self._select_started.pop(generation, None)
+            if started is not None:
+                metrics.observe("select_to_render", time.perf_counter() - started)
+
+    def _deliver_selection_error(self, generation: int, exc: Exception) -> None:
+        if self.scheduler.is_current(generation):
+            self._set_error(f"Could not load details: {exc}")
+
+    def _display_pokemon(
+        self,
+        details: PokemonDetails,
+        image_data: Optional[bytes],
+        prepared: Optional[PreparedSprite] = None,
+    ) -> None:
+        self.current_details = details
+        self._learn_details(details)
+        self.current_image_data = image_data
+        self.name_var.set(f"#{details.id:03} {details.name}")
+        self.meta_var.set(
+            f"{details.genus}   |   HT {details.height_m:.1f} m   |   WT {details.weight_kg:.1f} kg"
+        )
+        self.type_var.set("Types: " + ", ".join(details.types))
+        self.ability_var.set("Abilities: " + ", ".join(details.abilities))
+
+        set_readonly_text(self.entry_text, details.flavor_text)
+        self._render_stats(details)
+        self._render_comparison()
+        self._ensure_type_chart()
+        self._render_matchups()
+
+        self._render_current_image(prepared)
+        self._set_status(f"Entry ready for #{details.id:03} {details.name}.")
+
+    def _listed_details(self) -> List[PokemonDetails]:
+        """Details of every entry of the listed dex that has been loaded so far."""
+        listed = {pokemon.id for pokemon in self.all_pokemon}
+        return [details for pokemon_id, details in self._known_details.items() if pokemon_id in listed]
+
+    def _current_stat_matrix(self) -> StatMatrix:
+        """Stat matrix over the loaded entries of the listed dex, rebuilt only after new details arrive."""
+        if self._stat_matrix is None:
+            self._stat_matrix = StatMatrix(self._listed_details())
+        return self._stat_matrix
+
+    def _render_stats(self, details: PokemonDetails) -> None:
+        matrix = self._current_stat_matrix()
+        if details.id not in matrix or len(matrix) < 2:
+            lines = [f"{name:<16} {value}" for name, value in details.stats.labelled()]
+        else:
+            lines = [f"{name:<16} {value:>3}  p{rank:.0f}" for name, value, rank in matrix.percentiles(details.id)]
+            lines.append(f"\n(percentiles of {len(matrix)} loaded)")
+        set_readonly_text(self.stats_text, "\n".join(lines))
+
+    def _render_comparison(self) -> None:
+        details = self.current_details
+        if details is None:
+            return
+        matrix = self._current_stat_matrix()
+        if details.id not in matrix:
+            set_readonly_text(self.compare_text, "")
             return
 
-        pokemon = self.filtered_pokemon[index]
-        self.status_var.set(f"Scanning #{pokemon['id']:03} {pokemon['name']}...")
+        lines = ["SIMILAR SPREAD"]
+        for entry in matrix.similar(details.id, SIMILAR_COUNT):
+            lines.append(f"#{entry.id:03} {entry.name:<12.12} {entry.score:5.1f}")
+
+        stat = self.rank_stat_var.get()
+        type_name = details.types[0] if details.types else None
+        lines.append("")
+        lines.append(f"TOP {stat.upper()}" + (f" / {type_name.upper()}" if type_name else ""))
+        for position, entry in enumerate(matrix.top(stat, RANKING_COUNT, type_name), start=1):
+            marker = ">" if entry.id == details.id else " "
+            lines.append(f"{marker}{position} #{entry.id:03} {entry.name:<10.10} {entry.score:>3}")
+        if type_name:
+            rank = matrix.percentile(details.id, stat, type_name)
+            lines.append(f"  {details.name}: p{rank:.0f} of {type_name}")
+        set_readonly_text(self.compare_text, "\n".join(lines))
+
+    def _ensure_type_chart(self) -> None:
+        """Fetch the type chart once, off the Tk thread; a failed fetch is retried on the next entry."""
+        if self.type_chart is not None or self._type_chart_loading:
+            return
+        self._type_chart_loading = True
 
         def worker() -> None:
             try:
-                details = get_pokemon_details(pokemon["id"])
-                image_data = None
-                if details.get("image_url"):
-                    try:
-                        image_data = get_image_bytes(details["image_url"])
-                    except PokeAPIError:
-                        image_data = None
-                self.root.after(0, lambda: self._display_pokemon(details, image_data))
+                chart = get_type_chart()
             except Exception as exc:
-                self.root.after(0, lambda: self._set_error(f"Could not load details: {exc}"))
+                message = str(exc)
+                self.root.after(0, lambda: self._adopt_type_chart(None, message))
+                return
+            self.root.after(0, lambda: self._adopt_type_chart(chart, None))
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _display_pokemon(self, details: Dict[str, Any], image_data: Optional[bytes]) -> None:
-        self.current_details = details
-        self.current_image_data = image_data
-        self.name_var.set(f"#{details['id']:03} {details['name']}")
-        self.meta_var.set(
-            f"{details['genus']}   |   HT {details['height_m']:.1f} m   |   WT {details['weight_kg']:.1f} kg"
-        )
-        self.type_var.set("Types: " + ", ".join(details["types"]))
-        self.ability_var.set("Abilities: " + ", ".join(details["abilities"]))
+    def _adopt_type_chart(self, chart: Optional[TypeChart], error: Optional[str]) -> None:
+        self._type_chart_loading = False
+        self.type_chart = chart
+        self._type_chart_error = error
+        self._render_matchups()
 
-        set_readonly_text(self.entry_text, details["flavor_text"])
-        stats_order = ["Hp", "Attack", "Defense", "Special Attack", "Special Defense", "Speed"]
-        stats_lines = [f"{name:<16} {details['stats'].get(name, '--')}" for name in stats_order]
-        set_readonly_text(self.stats_text, "\n".join(stats_lines))
+    def _render_matchups(self) -> None:
+        details = self.current_details
+        if details is None:
+            return
+        self.team_button.config(text="- TEAM" if any(member.id == details.id for member in self.team) else "+ TEAM")
 
-        self._render_current_image()
-        self.status_var.set(f"Entry ready for #{details['id']:03} {details['name']}.")
+        chart = self.type_chart
+        if chart is None:
+            message = f"Type chart unavailable:\n{self._type_chart_error}" if self._type_chart_error else "Loading type chart..."
+            set_readonly_text(self.matchup_text, message)
+            return
+
+        try:
+            lines = [
+                "WEAK: " + (", ".join(f"{m.type} {format_multiplier(m.multiplier)}" for m in chart.weaknesses(details.types)) or "-"),
+                "RESISTS: " + (", ".join(f"{m.type} {format_multiplier(m.multiplier)}" for m in chart.resistances(details.types)) or "-"),
+                "IMMUNE: " + (", ".join(chart.immunities(details.types)) or "-"),
+                "",
+                "COUNTERS",
+            ]
+            others = [entry for entry in self._listed_details() if entry.id != details.id]
+            for counter in chart.best_counters(details.types, others, COUNTER_COUNT):
+                lines.append(f"#{counter.id:03} {counter.name:<11.11} {format_multiplier(counter.offense)}")
+
+            if self.team:
+                coverage = chart.team_coverage([member.types for member in self.team])
+                lines.append("")
+                lines.append(f"TEAM {len(self.team)}/{MAX_TEAM_SIZE}: " + ", ".join(member.name for member in self.team))
+                lines.append("No super-effective hit: " + (", ".join(coverage.offensive_gaps) or "-"))
+                lines.append("Team weak to: " + (", ".join(coverage.defensive_gaps) or "-"))
+        except TypeChartError as exc:
+            lines = [str(exc)]
+        set_readonly_text(self.matchup_text, "\n".join(lines))
+
+    def _toggle_team_member(self) -> None:
+        details = self.current_details
+        if details is None:
+            return
+        if any(member.id == details.id for member in self.team):
+            self.team = [member for member in self.team if member.id != details.id]
+        elif len(self.team) >= MAX_TEAM_SIZE:
+            self._set_status(f"The team already has {MAX_TEAM_SIZE} members; remove one first.")
+            return
+        else:
+            self.team.append(details)
+        self._render_matchups()
 
     def _on_image_panel_resize(self, _event: tk.Event) -> None:
+        # A window drag fires <Configure> continuously; only redraw once it settles.
+        if self._resize_after_id is not None:
+            self.root.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.root.after(RESIZE_DEBOUNCE_MS, self._finish_image_panel_resize)
+
+    def _finish_image_panel_resize(self) -> None:
+        self._resize_after_id = None
         if self.current_image_data:
             self._render_current_image()
         else:
             self._render_no_image("NO SIGNAL")
 
-    def _render_current_image(self) -> None:
+    def _image_box(self) -> Tuple[int, int, int, int]:
+        """Canvas size and the box a sprite has to fit in, as (width, height, max_width, max_height)."""
+        width = max(self.image_canvas.winfo_width(), 360)
+        height = max(self.image_canvas.winfo_height(), 220)
+        return width, height, max(96, width - 24), max(96, height - 24)
+
+    def _render_current_image(self, prepared: Optional[PreparedSprite] = None) -> None:
         if not self.current_image_data:
             self._render_no_image("NO IMAGE")
             return
 
-        width = max(self.image_canvas.winfo_width(), 360)
-        height = max(self.image_canvas.winfo_height(), 220)
-        target_width = max(96, width - 24)
-        target_height = max(96, height - 24)
+        width, height, target_width, target_height = self._image_box()
 
         try:
-            self.current_photo = image_bytes_to_photoimage(
-                self.current_image_data,
-                max_width=target_width,
-                max_height=target_height,
-            )
+            if prepared is not None and prepared.source is self.current_image_data:
+                self.current_photo = self.sprite_renderer.adopt(prepared)
+            else:
+                self.current_photo = self.sprite_renderer.render(
+                    self.current_image_data,
+                    max_width=target_width,
+                    max_height=target_height,
+                )
             self.image_canvas.delete("all")
             
             x = width // 2
             y = height // 2 - 25 
             self.image_canvas.create_image(x, y, image=self.current_photo, anchor="center")
-        except tk.TclError:
+        except (tk.TclError, SpriteError):
             self.current_photo = None
             self._render_no_image("SPRITE ERROR")
 
+    def _render_atlas_preview(self, pokemon_id: int) -> None:
+        """Paint the sprite straight from the atlas while the entry's details are still loading."""
+        if self.sprite_atlas is None:
+            return
+        crop = self.sprite_atlas.crop(pokemon_id)
+        if crop is None:
+            return
+
+        width, height, target_width, target_height = self._image_box()
+        scale = fit_scale(crop.size[0], crop.size[1], target_width, target_height)
+        try:
+            self.current_photo = pil_to_photoimage(scale_sprite(crop, scale))
+        except tk.TclError:
+            return
+        self.image_canvas.delete("all")
+        self.image_canvas.create_image(width // 2, height // 2 - 25, image=self.current_photo, anchor="center")
+
+    def _adopt_atlas(self, atlas: SpriteAtlas, dex: str) -> None:
+        # A region change while the atlas was loading or building leaves it for the old dex.
+        if dex != self.dex_name:
+            return
+        self.sprite_atlas = atlas
+        self._thumbnail_photos.clear()
+        self.dex_list.schedule_redraw()
+
+    def _maybe_build_atlas(self) -> None:
+        pokemon_ids = [pokemon.id for pokemon in self.all_pokemon]
+        if not atlas_available() or self._atlas_building or not pokemon_ids:
+            return
+        if self.sprite_atlas is not None and self.sprite_atlas.covers(pokemon_ids):
+            return
+
+        self._atlas_building = True
+        pokemon = self.all_pokemon[:]
+        dex = self.dex_name
+
+        def worker() -> None:
+            try:
+                atlas = build_atlas(dex, pokemon)
+            except OSError:
+                atlas = None
+
+            def finish() -> None:
+                self._atlas_building = False
+                if atlas is not None:
+                    self._adopt_atlas(atlas, dex)
+                if dex != self.dex_name and self.prefetch.finished:
+                    # The new dex finished prefetching while this build ran.
+                    self._maybe_build_atlas()
+
+            try:
+                self.root.after(0, finish)
+            except (RuntimeError, tk.TclError):
+                pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _thumbnail_photo(self, pokemon_id: int):
+        photo = self._thumbnail_photos.get(pokemon_id)
+        if photo is None and self.sprite_atlas is not None:
+            thumbnail = self.sprite_atlas.thumbnail(pokemon_id, self.dex_list.thumbnail_size)
+            if thumbnail is not None:
+                photo = pil_to_photoimage(thumbnail)
+                self._thumbnail_photos[pokemon_id] = photo
+        return photo
+
     def _render_no_image(self, message: str) -> None:
         width = max(self.image_canvas.winfo_width(), 280)
         height = max(self.image_canvas.winfo_height(), 180)
@@ -594,35 +1099,130 @@ class PokedexApp:
 
     def _play_current_cry(self) -> None:
         if not self.current_details:
-            self.status_var.set("Pick a Pokémon first before playing a cry.")
+            self._set_status("Pick a Pokémon first before playing a cry.")
             return
 
-        cry_url = self.current_details.get("cry_url")
+        cry_url = self.current_details.cry_url
         if not cry_url:
-            self.status_var.set("No cry is available for this Pokémon.")
+            self._set_status("No cry is available for this Pokémon.")
             return
 
-        pokemon_id = self.current_details["id"]
-        pokemon_name = self.current_details["name"]
-        self.status_var.set(f"Opening cry for #{pokemon_id:03} {pokemon_name}...")
+        pokemon_id = self.current_details.id
+        pokemon_name = self.current_details.name
+        self._set_status(f"Loading cry for #{pokemon_id:03} {pokemon_name}...")
 
         def worker() -> None:
+            # Imported here: the audio stack (and its optional numpy/soundfile imports) is not needed to start up.
+            from cry_player import CryPlaybackError, play_pokemon_cry
+
             try:
-                cry_path = play_pokemon_cry(cry_url, pokemon_id, pokemon_name)
+                play_pokemon_cry(cry_url, pokemon_id, pokemon_name)
                 self.root.after(
                     0,
-                    lambda: self.status_var.set(f"Cry opened in your system audio app: {cry_path.name}"),
+                    lambda: self._set_status(f"Playing cry for #{pokemon_id:03} {pokemon_name}."),
                 )
             except CryPlaybackError as exc:
-                self.root.after(0, lambda: self.status_var.set(f"Cry error: {exc}"))
+                self.root.after(0, lambda: self._set_status(f"Cry error: {exc}"))
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def _set_status(self, message: str) -> None:
+        self._status_message = message
+        self._update_status()
+
+    def _update_status(self) -> None:
+        if self._prefetch_progress:
+            self.status_var.set(f"{self._status_message}\n{self._prefetch_progress}")
+        else:
+            self.status_var.set(self._status_message)
+
+    def _on_prefetch_progress(self, done: int, failed: int, total: int) -> None:
+        if not total:
+            # A job that finished after a region change emptied the queue.
+            return
+        if done + failed >= total:
+            summary = f"Prefetch complete: {done}/{total} entries cached."
+            if failed:
+                summary += f" {failed} failed."
+        else:
+            summary = f"Prefetching entries... {done + failed}/{total}"
+
+        def apply() -> None:
+            self._prefetch_progress = summary
+            self._update_status()
+            if done + failed >= total:
+                self._maybe_build_atlas()
+
+        try:
+            self.root.after(0, apply)
+        except (RuntimeError, tk.TclError):
+            # The window is already gone; the engine is being cancelled.
+            pass
+
+    def _on_prefetch_details(self, details: PokemonDetails) -> None:
+        try:
+            self.root.after(0, lambda: self._learn_details(details))
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _learn_details(self, details: PokemonDetails) -> None:
+        """Feed a loaded entry to search (types, abilities), the list's type badges and the stat matrix."""
+        self.search_index.add_details(details)
+        if self._known_details.get(details.id) != details:
+            self._known_details[details.id] = details
+            self._stat_matrix = None
+        if self._known_types.get(details.id) != details.types:
+            self._known_types[details.id] = details.types
+            self.dex_list.schedule_redraw()
+
+    def _toggle_metrics_overlay(self) -> None:
+        if self._metrics_after_id is not None:
+            self.root.after_cancel(self._metrics_after_id)
+            self._metrics_after_id = None
+            self.metrics_label.grid_remove()
+            return
+        self.metrics_label.grid()
+        self._refresh_metrics_overlay()
+
+    def _refresh_metrics_overlay(self) -> None:
+        stats = metrics.snapshot()
+        latency = metrics.latency_summary("select_to_render")
+        counters = stats["counters"]
+
+        def ms(value: Optional[float]) -> str:
+            return "--" if value is None else f"{value * 1000:.0f}"
+
+        hits = counters.get("http_cache.hits", 0) + counters.get("asset_store.hits", 0)
+        misses = counters.get("http_cache.misses", 0) + counters.get("asset_store.misses", 0)
+        for cache in stats["caches"].values():
+            hits += cache["hits"]
+            misses += cache["misses"]
+
+        self.metrics_var.set(
+            f"select→render p50 {ms(latency['p50'])} ms  p95 {ms(latency['p95'])} ms  (n={latency['count']})\n"
+            f"in flight {stats['gauges'].get('http.in_flight', 0)}  |  "
+            f"cache {hits} hit / {misses} miss  |  "
+            f"{counters.get('http.bytes', 0) / 1024:.0f} KiB fetched"
+        )
+        self._metrics_after_id = self.root.after(METRICS_REFRESH_MS, self._refresh_metrics_overlay)
+
+    def _on_close(self) -> None:
+        if self.metrics_out is not None:
+            try:
+                metrics.export(self.metrics_out)
+            except OSError as exc:
+                print(f"Could not write metrics to {self.metrics_out}: {exc}", file=sys.stderr)
+        self.prefetch.cancel()
+        self.scheduler.shutdown()
+        self.async_loop.stop()
+        self.async_client.close()
+        self.root.destroy()
+
     def _set_error(self, message: str) -> None:
         self.current_details = None
         self.current_image_data = None
         self.current_photo = None
-        self.status_var.set(message)
+        self._set_status(message)
         self.name_var.set("SYSTEM ERROR")
         self.meta_var.set("")
         self.type_var.set("Types: --")
@@ -630,10 +1230,40 @@ class PokedexApp:
         self._render_no_image("NO SIGNAL")
         set_readonly_text(self.entry_text, message)
         set_readonly_text(self.stats_text, "")
-
-
-
-def main() -> None:
+        set_readonly_text(self.compare_text, "")
+        set_readonly_text(self.matchup_text, "")
+
+
+
+def main(argv: Optional[List[str]] = None, started: Optional[float] = None) -> None:
+    """Run the app. `started` is the `perf_counter()` reading startup profiling counts from."""
+    parser = argparse.ArgumentParser(description="Pokédex")
+    parser.add_argument("--offline", metavar="PACK", type=Path, help="serve all data from an offline data pack")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=get_backend() if get_backend() in BACKENDS else "rest",
+        help="fetch entries one by one over REST or in batches over GraphQL",
+    )
+    parser.add_argument("--dex", choices=list(DEXES), default="kanto", help="regional dex (or the National Dex) to list")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print time to first paint and time until the list is ready",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        metavar="PATH",
+        type=Path,
+        help="on exit, write timing spans and counters (.json: Chrome trace, otherwise JSON lines)",
+    )
+    args = parser.parse_args(argv)
+
+    set_backend(args.backend)
+    if args.offline is not None:
+        enable_offline_mode(args.offline)
+
+    profiler = StartupProfiler(started) if args.profile_startup else None
     root = tk.Tk()
-    PokedexApp(root)
+    PokedexApp(root, profiler=profiler, metrics_out=args.metrics_out, dex=args.dex)
     root.mainloop()
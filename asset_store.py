@@ -0,0 +1,172 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path, PurePosixPath
+from typing import Optional
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    url TEXT PRIMARY KEY,
+    blob TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def blob_name(url: str, data: bytes) -> str:
+    """SHA-256 of the content, keeping the URL's extension so OS players recognise the file."""
+    suffix = PurePosixPath(urlsplit(url).path).suffix.lower()
+    if not suffix[1:].isalnum() or len(suffix) > 6:
+        suffix = ""
+    return hashlib.sha256(data).hexdigest() + suffix
+
+
+class AssetStore:
+    """
+    Content-addressed file store for sprites and cries.
+
+    Each distinct payload is written once to `blobs/<aa>/<sha256><ext>` with a
+    temp-file-and-rename, so readers never see a partial file. A SQLite manifest
+    maps URLs to blobs; several URLs with identical content share one blob.
+    When the blobs exceed `max_bytes`, least recently used URLs are dropped and
+    blobs nobody references any more are deleted.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.root / "manifest.sqlite3"), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+        except (OSError, sqlite3.Error):
+            # Without a usable store every asset is simply fetched again.
+            self._conn = None
+
+    def _blob_path(self, blob: str) -> Path:
+        return self.blob_dir / blob[:2] / blob
+
+    def path_for(self, url: str) -> Optional[Path]:
+        """Path of the stored file for `url`, or None. Costs one manifest lookup and one stat."""
+        if self._conn is None:
+            return None
+
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT blob FROM assets WHERE url = ?", (url,)).fetchone()
+                if row is None:
+                    return None
+                path = self._blob_path(row[0])
+                if not path.is_file():
+                    # Removed behind our back (e.g. a temp dir cleaner); forget it.
+                    self._conn.execute("DELETE FROM assets WHERE url = ?", (url,))
+                    return None
+                self._conn.execute("UPDATE assets SET last_access = ? WHERE url = ?", (time.time(), url))
+            except sqlite3.Error:
+                return None
+        return path
+
+    def get(self, url: str) -> Optional[bytes]:
+        path = self.path_for(url)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def put(self, url: str, data: bytes) -> Optional[Path]:
+        """Store `data` for `url` and return its blob path (None if the store is unusable)."""
+        if self._conn is None or len(data) > self.max_bytes:
+            return None
+
+        blob = blob_name(url, data)
+        path = self._blob_path(blob)
+        with self._lock:
+            try:
+                if not path.is_file():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                    tmp_path.write_bytes(data)
+                    os.replace(tmp_path, path)
+
+                previous = self._conn.execute("SELECT blob FROM assets WHERE url = ?", (url,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO assets (url, blob, size, last_access) VALUES (?, ?, ?, ?)",
+                    (url, blob, len(data), time.time()),
+                )
+                if previous is not None and previous[0] != blob:
+                    self._delete_if_unreferenced(previous[0])
+                self._evict()
+            except (OSError, sqlite3.Error):
+                return None
+        return path
+
+    def clear(self) -> None:
+        """Forget every URL and delete every blob."""
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                blobs = [row[0] for row in self._conn.execute("SELECT DISTINCT blob FROM assets").fetchall()]
+                self._conn.execute("DELETE FROM assets")
+            except sqlite3.Error:
+                return
+            for blob in blobs:
+                try:
+                    self._blob_path(blob).unlink()
+                except OSError:
+                    pass
+
+    def total_bytes(self) -> int:
+        if self._conn is None:
+            return 0
+
+        with self._lock:
+            try:
+                return self._blob_bytes()
+            except sqlite3.Error:
+                return 0
+
+    def _blob_bytes(self) -> int:
+        # Caller holds the lock. Shared blobs only count once.
+        return int(
+            self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT blob, MAX(size) AS size FROM assets GROUP BY blob)"
+            ).fetchone()[0]
+        )
+
+    def _delete_if_unreferenced(self, blob: str) -> None:
+        # Caller holds the lock.
+        if self._conn.execute("SELECT 1 FROM assets WHERE blob = ? LIMIT 1", (blob,)).fetchone() is None:
+            try:
+                self._blob_path(blob).unlink()
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        # Caller holds the lock.
+        total = self._blob_bytes()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT url, blob, size FROM assets ORDER BY last_access ASC").fetchall()
+        for url, blob, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM assets WHERE url = ?", (url,))
+            if self._conn.execute("SELECT 1 FROM assets WHERE blob = ? LIMIT 1", (blob,)).fetchone() is None:
+                self._delete_if_unreferenced(blob)
+                total -= size
@@ -0,0 +1,230 @@
+"""
+In-process audio playback for cries.
+
+Cries are decoded to 16-bit PCM once and kept in a bounded in-memory LRU, then
+handed to an `AudioSink`. OGG decoding needs the optional `soundfile` package;
+WAV data is decoded with the standard library. Sinks:
+
+- `SoundDeviceSink` / `SimpleAudioSink`: real output through `sounddevice` or `simpleaudio`.
+- `WavFileSink`: writes each clip to a `.wav` file, for headless runs.
+- `NullSink`: remembers what it was asked to play and nothing else.
+
+Set `POKEDEX_AUDIO_SINK` to `null` or `wav:<directory>` to force a headless sink.
+"""
+
+import io
+import os
+import threading
+import wave
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+try:
+    import soundfile  # pyright: ignore[reportMissingImports]
+except Exception:  # pragma: no cover - optional dependency fallback
+    soundfile = None
+
+try:
+    import sounddevice  # pyright: ignore[reportMissingImports]
+    import numpy  # pyright: ignore[reportMissingImports]
+except Exception:  # pragma: no cover - optional dependency fallback
+    sounddevice = None
+    numpy = None
+
+try:
+    import simpleaudio  # pyright: ignore[reportMissingImports]
+except Exception:  # pragma: no cover - optional dependency fallback
+    simpleaudio = None
+
+CLIP_CACHE_MAX_BYTES = 32 * 1024 * 1024
+SAMPLE_WIDTH = 2
+
+
+class AudioError(Exception):
+    """Raised when a clip cannot be decoded or played."""
+
+
+
+class PCMClip(NamedTuple):
+    samples: bytes  # interleaved signed 16-bit little-endian frames
+    sample_rate: int
+    channels: int
+
+
+
+def can_decode_ogg() -> bool:
+    return soundfile is not None
+
+
+
+def decode_audio(data: bytes) -> PCMClip:
+    """Decode OGG (with `soundfile`) or WAV bytes to 16-bit PCM."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return _decode_wav(data)
+    if soundfile is None:
+        raise AudioError("Decoding OGG audio requires the soundfile package.")
+
+    try:
+        samples, sample_rate = soundfile.read(io.BytesIO(data), dtype="int16", always_2d=True)
+    except Exception as exc:  # libsndfile raises its own error types
+        raise AudioError(f"Could not decode audio: {exc}") from exc
+    return PCMClip(samples.tobytes(), int(sample_rate), int(samples.shape[1]))
+
+
+
+def _decode_wav(data: bytes) -> PCMClip:
+    try:
+        with wave.open(io.BytesIO(data), "rb") as reader:
+            if reader.getsampwidth() != SAMPLE_WIDTH:
+                raise AudioError("Only 16-bit WAV audio is supported.")
+            return PCMClip(reader.readframes(reader.getnframes()), reader.getframerate(), reader.getnchannels())
+    except (wave.Error, EOFError) as exc:
+        raise AudioError(f"Could not decode audio: {exc}") from exc
+
+
+
+def encode_wav(clip: PCMClip) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(clip.channels)
+        writer.setsampwidth(SAMPLE_WIDTH)
+        writer.setframerate(clip.sample_rate)
+        writer.writeframes(clip.samples)
+    return buffer.getvalue()
+
+
+
+class ClipCache:
+    """Thread-safe LRU of decoded clips, bounded by total PCM size."""
+
+    def __init__(self, max_bytes: int = CLIP_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._clips: "OrderedDict[str, PCMClip]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[PCMClip]:
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None:
+                self._clips.move_to_end(key)
+            return clip
+
+    def put(self, key: str, clip: PCMClip) -> None:
+        with self._lock:
+            previous = self._clips.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.samples)
+            self._clips[key] = clip
+            self._size += len(clip.samples)
+            while self._size > self.max_bytes and len(self._clips) > 1:
+                _, evicted = self._clips.popitem(last=False)
+                self._size -= len(evicted.samples)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clips.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._clips)
+
+
+
+class AudioSink:
+    """Somewhere to send PCM clips. `play` replaces whatever is still playing."""
+
+    name = "sink"
+
+    def play(self, clip: PCMClip) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        pass
+
+
+
+class NullSink(AudioSink):
+    name = "null"
+
+    def __init__(self) -> None:
+        self.played: List[PCMClip] = []
+
+    def play(self, clip: PCMClip) -> None:
+        self.played.append(clip)
+
+
+
+class WavFileSink(AudioSink):
+    name = "wav"
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.last_path: Optional[Path] = None
+        self._count = 0
+
+    def play(self, clip: PCMClip) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._count += 1
+        path = self.directory / f"clip_{self._count:04}.wav"
+        try:
+            path.write_bytes(encode_wav(clip))
+        except OSError as exc:
+            raise AudioError(f"Could not write {path}: {exc}") from exc
+        self.last_path = path
+
+
+
+class SoundDeviceSink(AudioSink):
+    name = "sounddevice"
+
+    def play(self, clip: PCMClip) -> None:
+        frames = numpy.frombuffer(clip.samples, dtype="<i2").reshape(-1, clip.channels)
+        try:
+            sounddevice.play(frames, clip.sample_rate)
+        except Exception as exc:  # PortAudio errors are not a stable type
+            raise AudioError(f"Could not play audio: {exc}") from exc
+
+    def stop(self) -> None:
+        sounddevice.stop()
+
+
+
+class SimpleAudioSink(AudioSink):
+    name = "simpleaudio"
+
+    def __init__(self) -> None:
+        self._playing = None
+
+    def play(self, clip: PCMClip) -> None:
+        self.stop()
+        try:
+            self._playing = simpleaudio.play_buffer(clip.samples, clip.channels, SAMPLE_WIDTH, clip.sample_rate)
+        except Exception as exc:
+            raise AudioError(f"Could not play audio: {exc}") from exc
+
+    def stop(self) -> None:
+        if self._playing is not None:
+            self._playing.stop()
+            self._playing = None
+
+
+
+def default_sink() -> Optional[AudioSink]:
+    """Pick a sink from `POKEDEX_AUDIO_SINK`, else the first installed output backend."""
+    configured = os.environ.get("POKEDEX_AUDIO_SINK", "")
+    if configured == "null":
+        return NullSink()
+    if configured.startswith("wav:"):
+        return WavFileSink(Path(configured[len("wav:"):]))
+
+    if sounddevice is not None:
+        return SoundDeviceSink()
+    if simpleaudio is not None:
+        return SimpleAudioSink()
+    return None
@@ -0,0 +1,417 @@
+"""
+Reproducible benchmarks against a local PokéAPI stand-in.
+
+Starts `fixture_server.FixtureServer` on a free port (replaying `--fixtures`,
+or a freshly synthesized dex when none is given), points the client and its
+caches at it and a scratch directory, and measures:
+
+- `dex_list`: `get_original_151` cold (empty caches), warm from the disk cache, and warm in memory
+- `details`: per-entry `get_pokemon_details` latency, cold and warm from disk
+- `prefetch`: `PrefetchEngine` throughput over the whole dex
+- `filter_list`: the Tk-free part of `PokedexApp._filter_list` (search plus
+  finding the selected entry in the results) while typing, at 151, 1000 and
+  10000 entries
+- `stat_queries`: `StatMatrix` ranking, percentile and similarity queries at
+  151, 1025 (National Dex) and 10000 entries, with NumPy and the pure-Python fallback
+- `sprite`: `image_bytes_to_photoimage` and `prepare_sprite` with and without Pillow
+
+Results are printed (or written with `--output`) as one JSON document;
+`--compare` reports the change of every `*_ms` figure against a previous run.
+
+    python benchmark.py --latency-ms 30 --bandwidth-kbps 512 --output bench.json
+    python benchmark.py --fixtures fixtures/ --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import metrics
+from fixture_server import FixtureServer, bandwidth_from_kbps, synthesize
+
+SEARCH_SIZES = (151, 1000, 10000)
+STAT_SIZES = (151, 1025, 10000)
+TYPED_QUERIES = ("p", "pi", "pik", "pika", "pikac", "pikachu", "pikchu", "2", "25", "", "ch", "char", "fire")
+SPRITE_BOX = (320, 240)
+SCHEMA_VERSION = 1
+
+
+
+def _summary(samples: List[float]) -> Dict[str, Any]:
+    milliseconds = [sample * 1000 for sample in samples]
+    return {
+        "count": len(milliseconds),
+        "mean_ms": round(sum(milliseconds) / len(milliseconds), 3) if milliseconds else None,
+        "p50_ms": _round(metrics.percentile(milliseconds, 0.5)),
+        "p95_ms": _round(metrics.percentile(milliseconds, 0.95)),
+        "max_ms": _round(max(milliseconds, default=None)),
+    }
+
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+
+def _reset_client(disk: bool) -> None:
+    """Drop the in-memory caches, and with `disk` the HTTP cache and asset store as well."""
+    import pokeapi_client
+
+    pokeapi_client.get_original_151.cache_clear()
+    pokeapi_client.get_pokedex.cache_clear()
+    pokeapi_client.get_pokemon_details.cache_clear()
+    pokeapi_client.get_image_bytes.cache_clear()
+    if disk:
+        pokeapi_client.get_http_cache().clear()
+        pokeapi_client.get_asset_store().clear()
+
+
+
+def bench_dex_list(repeat: int) -> Dict[str, Any]:
+    from pokeapi_client import get_original_151
+
+    cold, warm_disk, warm_memory = [], [], []
+    for _ in range(repeat):
+        _reset_client(disk=True)
+        cold.append(_timed(get_original_151))
+        _reset_client(disk=False)
+        warm_disk.append(_timed(get_original_151))
+        warm_memory.append(_timed(get_original_151))
+    return {"cold": _summary(cold), "warm_disk": _summary(warm_disk), "warm_memory": _summary(warm_memory)}
+
+
+
+def bench_details(pokemon_ids: List[int]) -> Dict[str, Any]:
+    from pokeapi_client import get_pokemon_details
+
+    _reset_client(disk=True)
+    cold = [_timed(lambda: get_pokemon_details(pokemon_id)) for pokemon_id in pokemon_ids]
+    _reset_client(disk=False)
+    warm_disk = [_timed(lambda: get_pokemon_details(pokemon_id)) for pokemon_id in pokemon_ids]
+    return {"cold": _summary(cold), "warm_disk": _summary(warm_disk)}
+
+
+
+def bench_prefetch(timeout: float) -> Dict[str, Any]:
+    from pokeapi_client import get_original_151
+    from prefetch import PREFETCH_WORKERS, PrefetchEngine
+
+    pokemon = get_original_151()
+    _reset_client(disk=True)
+    finished = threading.Event()
+    outcome: Dict[str, int] = {}
+
+    def on_progress(done: int, failed: int, total: int) -> None:
+        if done + failed >= total:
+            outcome.update(done=done, failed=failed)
+            finished.set()
+
+    engine = PrefetchEngine(on_progress=on_progress)
+    start = time.perf_counter()
+    engine.start(pokemon)
+    completed = finished.wait(timeout)
+    elapsed = time.perf_counter() - start
+    engine.cancel()
+
+    return {
+        "entries": len(pokemon),
+        "workers": PREFETCH_WORKERS,
+        "completed": completed,
+        "failed": outcome.get("failed"),
+        "seconds": round(elapsed, 3),
+        "entries_per_second": round(outcome.get("done", 0) / elapsed, 2) if elapsed else None,
+    }
+
+
+
+def _synthetic_dex(size: int, base: List[Any]) -> List[Any]:
+    from pokemon_models import PokemonSummary
+
+    pokemon = list(base[:size])
+    for pokemon_id in range(len(pokemon) + 1, size + 1):
+        # Recombine real names so the grams look like the ones users search for.
+        left = base[pokemon_id % len(base)].api_name
+        right = base[(pokemon_id * 7) % len(base)].api_name
+        api_name = f"{left[: len(left) // 2 + 1]}{right[len(right) // 2:]}"
+        pokemon.append(PokemonSummary(pokemon_id, api_name.title(), api_name))
+    return pokemon
+
+
+
+def bench_filter_list(base: List[Any], sizes=SEARCH_SIZES, rounds: int = 5) -> Dict[str, Any]:
+    from search_index import SearchIndex
+
+    results = {}
+    for size in sizes:
+        pokemon = _synthetic_dex(size, base)
+        start = time.perf_counter()
+        index = SearchIndex(pokemon)
+        build = time.perf_counter() - start
+
+        keystrokes = []
+        for _ in range(rounds):
+            selected_id = pokemon[0].id
+            for query in TYPED_QUERIES:
+                start = time.perf_counter()
+                matches = index.search(query)
+                # What VirtualDexList.index_of does to keep the selection across a filter.
+                positions = {entry.id: position for position, entry in enumerate(matches)}
+                positions.get(selected_id)
+                keystrokes.append(time.perf_counter() - start)
+                if matches:
+                    selected_id = matches[0].id
+        results[str(size)] = {"index_build_ms": round(build * 1000, 3), "keystroke": _summary(keystrokes)}
+    return results
+
+
+
+def bench_stat_queries(sizes=STAT_SIZES, rounds: int = 200) -> Dict[str, Any]:
+    import random
+
+    from pokemon_models import BaseStats, PokemonDetails
+    from stat_analytics import StatMatrix, numpy_available
+
+    types = ("Normal", "Fire", "Water", "Grass", "Electric", "Psychic", "Dragon", "Steel")
+    engines = (True, False) if numpy_available() else (False,)
+    results: Dict[str, Any] = {}
+    for size in sizes:
+        rng = random.Random(size)
+        details = [
+            PokemonDetails(
+                pokemon_id, f"Entry {pokemon_id}", 1.0, 10.0, tuple(rng.sample(types, rng.randint(1, 2))), (),
+                BaseStats(*(rng.randint(5, 160) for _ in BaseStats._fields)), "", "", None, None,
+            )
+            for pokemon_id in range(1, size + 1)
+        ]
+        for use_numpy in engines:
+            start = time.perf_counter()
+            matrix = StatMatrix(details, use_numpy=use_numpy)
+            build = time.perf_counter() - start
+            queries = {
+                "top": lambda: matrix.top("speed", 10, "water"),
+                "percentile": lambda: matrix.percentile(rng.randint(1, size), "total"),
+                "similar": lambda: matrix.similar(rng.randint(1, size), 5),
+            }
+            results[f"{size}_{matrix.engine}"] = {
+                "build_ms": round(build * 1000, 3),
+                **{name: _summary([_timed(query) for _ in range(rounds)]) for name, query in queries.items()},
+            }
+    return results
+
+
+
+@contextmanager
+def _pillow_disabled() -> Iterator[None]:
+    import sprite_pipeline
+    import ui_utils
+
+    saved = (sprite_pipeline._pil_loaded, sprite_pipeline._pil_image, ui_utils._image_tk_loaded, ui_utils._image_tk)
+    sprite_pipeline._pil_loaded, sprite_pipeline._pil_image = True, None
+    ui_utils._image_tk_loaded, ui_utils._image_tk = True, None
+    try:
+        yield
+    finally:
+        sprite_pipeline._pil_loaded, sprite_pipeline._pil_image, ui_utils._image_tk_loaded, ui_utils._image_tk = saved
+
+
+
+def _bench_sprite_mode(image_data: bytes, repeat: int, root: Optional[Any]) -> Dict[str, Any]:
+    from sprite_pipeline import SpriteError, prepare_sprite
+    from ui_utils import image_bytes_to_photoimage
+
+    result: Dict[str, Any] = {}
+    try:
+        result["prepare_sprite"] = _summary([_timed(lambda: prepare_sprite(image_data, *SPRITE_BOX)) for _ in range(repeat)])
+    except SpriteError as exc:
+        result["prepare_sprite"] = {"skipped": str(exc)}
+    if root is None:
+        result["image_bytes_to_photoimage"] = {"skipped": "no Tk display"}
+    else:
+        result["image_bytes_to_photoimage"] = _summary(
+            [_timed(lambda: image_bytes_to_photoimage(image_data, *SPRITE_BOX)) for _ in range(repeat)]
+        )
+    return result
+
+
+
+def bench_sprite(repeat: int) -> Dict[str, Any]:
+    import tkinter as tk
+
+    from pokeapi_client import get_image_bytes, get_original_151, get_pokemon_details
+    from sprite_pipeline import pil_image
+
+    pokemon = get_original_151()
+    details = get_pokemon_details(pokemon[0].id)
+    if not details.image_url:
+        return {"skipped": "first entry has no sprite"}
+    image_data = get_image_bytes(details.image_url)
+
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+
+    try:
+        results: Dict[str, Any] = {"bytes": len(image_data)}
+        if pil_image() is None:
+            results["pillow"] = {"skipped": "Pillow is not installed"}
+        else:
+            results["pillow"] = _bench_sprite_mode(image_data, repeat, root)
+        with _pillow_disabled():
+            results["tk_only"] = _bench_sprite_mode(image_data, repeat, root)
+        return results
+    finally:
+        if root is not None:
+            root.destroy()
+
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool) and prefix.endswith("_ms."):
+        flat[prefix[:-1]] = float(data)
+    return flat
+
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Relative change (+0.10 = 10% slower) of every `*_ms` figure present in both runs."""
+    now = _flatten(current.get("results", {}))
+    before = _flatten(baseline.get("results", {}))
+    return {
+        key: round(now[key] / before[key] - 1, 3)
+        for key in sorted(now.keys() & before.keys())
+        if before[key] > 0
+    }
+
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="pokedex-bench-") as scratch:
+        fixtures = args.fixtures
+        if fixtures is None:
+            fixtures = Path(scratch, "fixtures")
+            synthesize(fixtures, args.count)
+
+        server = FixtureServer(fixtures, latency=args.latency_ms / 1000, bandwidth=bandwidth_from_kbps(args.bandwidth_kbps))
+        with server:
+            # The client reads both at import time, so set them before the first import.
+            os.environ["POKEDEX_BASE_URL"] = server.rest_url
+            os.environ["POKEDEX_CACHE_DIR"] = str(Path(scratch, "cache"))
+            os.environ["POKEDEX_BACKEND"] = "rest"
+            import pokeapi_client
+
+            if pokeapi_client.BASE_URL != server.rest_url:
+                raise SystemExit("benchmark.py must import pokeapi_client itself; run it as a script.")
+
+            metrics.reset()
+            results: Dict[str, Any] = {}
+            results["dex_list"] = bench_dex_list(args.repeat)
+            base = pokeapi_client.get_original_151()
+            results["details"] = bench_details([entry.id for entry in base[: args.details]])
+            results["prefetch"] = bench_prefetch(args.timeout)
+            results["filter_list"] = bench_filter_list(base)
+            results["stat_queries"] = bench_stat_queries()
+            results["sprite"] = bench_sprite(args.repeat * 10)
+            counters = metrics.snapshot()["counters"]
+
+            from http_transport import get_default_transport
+
+            get_default_transport().close()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "pillow": _pillow_version(),
+            "numpy": _numpy_version(),
+        },
+        "config": {
+            "fixtures": str(args.fixtures) if args.fixtures else f"synthetic:{args.count}",
+            "latency_ms": args.latency_ms,
+            "bandwidth_kbps": args.bandwidth_kbps,
+            "repeat": args.repeat,
+        },
+        "results": results,
+        "counters": counters,
+    }
+
+
+
+def _pillow_version() -> Optional[str]:
+    from sprite_pipeline import pil_image
+
+    Image = pil_image()
+    if Image is None:
+        return None
+    import PIL  # pyright: ignore[reportMissingImports]
+
+    return PIL.__version__
+
+
+
+def _numpy_version() -> Optional[str]:
+    from stat_analytics import numpy_available
+
+    if not numpy_available():
+        return None
+    import numpy  # pyright: ignore[reportMissingImports]
+
+    return numpy.__version__
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Pokédex client against a local PokéAPI stand-in.")
+    parser.add_argument("--fixtures", type=Path, help="recorded fixture directory (default: synthesize one)")
+    parser.add_argument("--count", type=int, default=151, help="entries in the synthesized dex")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay the stand-in adds to every response")
+    parser.add_argument("--bandwidth-kbps", type=float, default=0.0, help="throttle response bodies (kilobits/s, 0 = unlimited)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per dex-list measurement (sprite decoding does 10x as many)")
+    parser.add_argument("--details", type=int, default=30, help="entries timed in the per-entry details benchmark")
+    parser.add_argument("--timeout", type=float, default=300.0, help="give up on the prefetch run after this many seconds")
+    parser.add_argument("--output", type=Path, help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="previous results to report changes against")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.compare is not None:
+        report["compare"] = {
+            "baseline": str(args.compare),
+            "change": compare(report, json.loads(args.compare.read_text(encoding="utf-8"))),
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,18 @@
 import os
 import subprocess
 import sys
-import tempfile
-import urllib.error
-import urllib.request
+import threading
 from pathlib import Path
+from typing import Optional
 
-USER_AGENT = "TkinterPokedex/1.0"
-TIMEOUT_SECONDS = 15
+import metrics
+from audio_engine import AudioError, AudioSink, ClipCache, PCMClip, can_decode_ogg, decode_audio, default_sink
+from pokeapi_client import PokeAPIError, get_asset_path
+
+_clip_cache = ClipCache()
+_sink: Optional[AudioSink] = None
+_sink_resolved = False
+_sink_lock = threading.Lock()
 
 
 class CryPlaybackError(Exception):
@@ -15,26 +20,35 @@ class CryPlaybackError(Exception):
 
 
 
-def _download_cry(cry_url: str, pokemon_id: int, pokemon_name: str) -> Path:
+def set_audio_sink(sink: Optional[AudioSink]) -> None:
+    """Use `sink` for in-process playback (e.g. a `NullSink` in headless runs); None falls back to the OS audio player."""
+    global _sink, _sink_resolved
+    with _sink_lock:
+        if _sink is not None:
+            _sink.stop()
+        _sink = sink
+        _sink_resolved = True
+
+
+
+def get_audio_sink() -> Optional[AudioSink]:
+    global _sink, _sink_resolved
+    with _sink_lock:
+        if not _sink_resolved:
+            _sink = default_sink()
+            _sink_resolved = True
+        return _sink
+
+
+
+def _download_cry(cry_url: str) -> Path:
     if not cry_url:
         raise CryPlaybackError("No cry URL is available for this Pokémon.")
 
-    request = urllib.request.Request(cry_url, headers={"User-Agent": USER_AGENT})
-
     try:
-        with urllib.request.urlopen(request, timeout=TIMEOUT_SECONDS) as response:
-            data = response.read()
-    except urllib.error.HTTPError as exc:
-        raise CryPlaybackError(f"HTTP {exc.code} while downloading cry.") from exc
-    except urllib.error.URLError as exc:
-        raise CryPlaybackError(f"Network error while downloading cry: {exc.reason}") from exc
-
-    safe_name = "".join(char for char in pokemon_name.lower() if char.isalnum() or char in ("-", "_")) or "pokemon"
-    target_dir = Path(tempfile.gettempdir()) / "tkinter_pokedex_cries"
-    target_dir.mkdir(parents=True, exist_ok=True)
-    target_file = target_dir / f"{pokemon_id:03}_{safe_name}.ogg"
-    target_file.write_bytes(data)
-    return target_file
+        return get_asset_path(cry_url)
+    except PokeAPIError as exc:
+        raise CryPlaybackError(f"Could not download cry: {exc}") from exc
 
 
 
@@ -51,7 +65,38 @@ def _open_file(path: Path) -> None:
 
 
 
+def _load_clip(cry_url: str, cry_file: Path) -> PCMClip:
+    clip = _clip_cache.get(cry_url)
+    if clip is not None:
+        metrics.incr("clip_cache.hits")
+        return clip
+
+    metrics.incr("clip_cache.misses")
+    try:
+        with metrics.span("cry.decode", url=cry_url):
+            clip = decode_audio(cry_file.read_bytes())
+    except OSError as exc:
+        raise AudioError(f"Could not read {cry_file.name}: {exc}") from exc
+    _clip_cache.put(cry_url, clip)
+    return clip
+
+
+
 def play_pokemon_cry(cry_url: str, pokemon_id: int, pokemon_name: str) -> Path:
-    cry_file = _download_cry(cry_url, pokemon_id, pokemon_name)
-    _open_file(cry_file)
-    return cry_file
+    """
+    Play a cry, in-process when a decoder and an audio sink are available.
+    Decoded clips are cached by URL, so replaying a cry skips both the file read and the decode.
+    Otherwise the stored file is handed to the OS default player.
+    """
+    with metrics.span("cry.play", pokemon_id=pokemon_id):
+        cry_file = _download_cry(cry_url)
+        sink = get_audio_sink()
+        if sink is None or not can_decode_ogg():
+            _open_file(cry_file)
+            return cry_file
+
+        try:
+            sink.play(_load_clip(cry_url, cry_file))
+        except AudioError as exc:
+            raise CryPlaybackError(str(exc)) from exc
+        return cry_file
@@ -0,0 +1,302 @@
+"""
+Virtualized, canvas-backed Pokédex list.
+
+`VirtualDexList` draws only the rows inside the viewport plus `OVERSCAN` rows
+on each side. Each drawn row is a recycled slot of canvas items (background,
+thumbnail, label and two type badges); scrolling reassigns the slots that
+left the view to the rows that entered it, and `set_rows` just swaps the
+sequence being shown. Both therefore cost O(visible rows) however long the
+list is. The canvas scrolls natively over a scroll region of
+`len(rows) * row_height` pixels, so the scrollbar and mouse wheel behave like
+a Listbox's.
+"""
+
+import math
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import metrics
+from pokemon_models import PokemonSummary
+from shell_styles import Fonts, ShellStyle, TypeColors
+
+OVERSCAN = 4
+ROW_PADDING = 6
+BADGE_PADDING = 4
+MAX_BADGES = 2
+
+ThumbnailProvider = Callable[[int], Optional[tk.PhotoImage]]
+TypesProvider = Callable[[int], Optional[Tuple[str, ...]]]
+
+
+
+class _Slot:
+    __slots__ = ("background", "thumbnail", "label", "badges")
+
+    def __init__(self, canvas: tk.Canvas) -> None:
+        self.background = canvas.create_rectangle(0, 0, 0, 0, width=0)
+        self.thumbnail = canvas.create_image(0, 0, anchor="center")
+        self.label = canvas.create_text(0, 0, anchor="w", font=Fonts.LIST)
+        self.badges = [
+            (canvas.create_rectangle(0, 0, 0, 0, width=0), canvas.create_text(0, 0, font=Fonts.TYPE_BADGE, fill=TypeColors.BADGE_TEXT))
+            for _ in range(MAX_BADGES)
+        ]
+
+    def items(self) -> List[int]:
+        return [self.background, self.thumbnail, self.label] + [item for badge in self.badges for item in badge]
+
+
+
+class VirtualDexList(tk.Frame):
+    """
+    Scrollable list of `PokemonSummary` rows showing `#id Name`, a thumbnail and type badges.
+
+    `on_select()` fires when the user clicks a row (or `select` is called with
+    `notify=True`); Up/Down call `on_previous()`/`on_next()` so keyboard and
+    button navigation share one code path. `thumbnail(id)` and `types(id)` are
+    asked for each row as it is drawn and may return None until known;
+    `schedule_redraw()` repaints the visible rows once they change.
+    """
+
+    def __init__(
+        self,
+        parent: tk.Misc,
+        on_select: Callable[[], None],
+        on_previous: Callable[[], None],
+        on_next: Callable[[], None],
+        thumbnail: Optional[ThumbnailProvider] = None,
+        types: Optional[TypesProvider] = None,
+    ) -> None:
+        super().__init__(parent, bg=ShellStyle.LIST_PANEL_BG)
+        self.on_select = on_select
+        self.on_previous = on_previous
+        self.on_next = on_next
+        self.thumbnail = thumbnail
+        self.types = types
+
+        list_font = tkfont.Font(root=self, font=Fonts.LIST)
+        self._badge_font = tkfont.Font(root=self, font=Fonts.TYPE_BADGE)
+        self.row_height = list_font.metrics("linespace") + ROW_PADDING
+        self.thumbnail_size = self.row_height - 4
+        self._badge_widths: Dict[str, int] = {}
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.canvas = tk.Canvas(
+            self,
+            bg=ShellStyle.SCREEN_BG,
+            highlightthickness=0,
+            bd=0,
+            width=260,
+            takefocus=1,
+            yscrollincrement=self.row_height,
+        )
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.canvas.config(yscrollcommand=self._on_scroll)
+
+        self._rows: Sequence[PokemonSummary] = ()
+        self._positions: Optional[Dict[int, int]] = None
+        self._slots: Dict[int, _Slot] = {}
+        self._free: List[_Slot] = []
+        self._width = 0
+        self._redraw_after_id: Optional[str] = None
+        self.selection: Optional[int] = None
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda _event: self._scroll_units(-1))
+        self.canvas.bind("<Button-5>", lambda _event: self._scroll_units(1))
+        self.canvas.bind("<Up>", lambda _event: self.on_previous())
+        self.canvas.bind("<Down>", lambda _event: self.on_next())
+        self.canvas.bind("<Prior>", lambda _event: self._select_by_page(-1))
+        self.canvas.bind("<Next>", lambda _event: self._select_by_page(1))
+        self.canvas.bind("<Home>", lambda _event: self._select_edge(0))
+        self.canvas.bind("<End>", lambda _event: self._select_edge(len(self._rows) - 1))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def set_rows(self, rows: Sequence[PokemonSummary]) -> None:
+        """Show `rows` instead of the current ones. The selection is cleared."""
+        self._rows = rows
+        self._positions = None
+        self.selection = None
+        self._update_scrollregion()
+        self._release_all()
+        self._render()
+
+    def rows_appended(self) -> None:
+        """The sequence given to `set_rows` grew in place: extend the scroll region, keeping the selection and view."""
+        self._positions = None
+        self._update_scrollregion()
+        self._render()
+
+    def selected_row(self) -> Optional[PokemonSummary]:
+        if self.selection is None or self.selection >= len(self._rows):
+            return None
+        return self._rows[self.selection]
+
+    def index_of(self, pokemon_id: int) -> Optional[int]:
+        if self._positions is None:
+            self._positions = {pokemon.id: index for index, pokemon in enumerate(self._rows)}
+        return self._positions.get(pokemon_id)
+
+    def select(self, index: int, notify: bool = True) -> None:
+        if not self._rows:
+            return
+        index = max(0, min(index, len(self._rows) - 1))
+        previous, self.selection = self.selection, index
+        for changed in (previous, index):
+            slot = self._slots.get(changed) if changed is not None else None
+            if slot is not None:
+                self._draw_row(slot, changed)
+        self.see(index)
+        if notify:
+            self.on_select()
+
+    def see(self, index: int) -> None:
+        total = len(self._rows) * self.row_height
+        if total <= 0:
+            return
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        row_top = index * self.row_height
+        if row_top < top:
+            self.canvas.yview_moveto(row_top / total)
+        elif row_top + self.row_height > top + height:
+            self.canvas.yview_moveto(max(0, row_top + self.row_height - height) / total)
+
+    def schedule_redraw(self) -> None:
+        """Repaint the visible rows once the Tk loop is idle (e.g. after new thumbnails or types arrive)."""
+        if self._redraw_after_id is None:
+            self._redraw_after_id = self.after_idle(self._redraw)
+
+    def _redraw(self) -> None:
+        self._redraw_after_id = None
+        for index, slot in self._slots.items():
+            self._draw_row(slot, index)
+
+    def _yview(self, *args: str) -> None:
+        self.canvas.yview(*args)
+
+    def _on_scroll(self, first: str, last: str) -> None:
+        self.scrollbar.set(first, last)
+        self._render()
+
+    def _on_configure(self, event: tk.Event) -> None:
+        if event.width != self._width:
+            self._width = event.width
+            self._update_scrollregion()
+            self._redraw()
+        self._render()
+
+    def _update_scrollregion(self) -> None:
+        self.canvas.config(scrollregion=(0, 0, max(1, self._width), len(self._rows) * self.row_height))
+        if self.canvas.canvasy(0) > max(0, len(self._rows) * self.row_height - self.canvas.winfo_height()):
+            self.canvas.yview_moveto(0)
+
+    def _release_all(self) -> None:
+        for slot in self._slots.values():
+            self._hide(slot)
+            self._free.append(slot)
+        self._slots.clear()
+
+    def _render(self) -> None:
+        """Bind slots to the rows in (or near) the viewport and free the rest."""
+        with metrics.span("list.render"):
+            top = self.canvas.canvasy(0)
+            height = max(self.canvas.winfo_height(), self.row_height)
+            first = max(0, int(top // self.row_height) - OVERSCAN)
+            last = min(len(self._rows), int(math.ceil((top + height) / self.row_height)) + OVERSCAN)
+
+            for index in [index for index in self._slots if not first <= index < last]:
+                slot = self._slots.pop(index)
+                self._hide(slot)
+                self._free.append(slot)
+
+            for index in range(first, last):
+                if index not in self._slots:
+                    slot = self._free.pop() if self._free else _Slot(self.canvas)
+                    self._slots[index] = slot
+                    self._draw_row(slot, index)
+
+    def _hide(self, slot: _Slot) -> None:
+        for item in slot.items():
+            self.canvas.itemconfigure(item, state="hidden")
+
+    def _draw_row(self, slot: _Slot, index: int) -> None:
+        pokemon = self._rows[index]
+        canvas = self.canvas
+        selected = index == self.selection
+        y = index * self.row_height
+        middle = y + self.row_height / 2
+        width = max(self._width, 1)
+
+        canvas.coords(slot.background, 0, y, width, y + self.row_height)
+        canvas.itemconfigure(
+            slot.background,
+            fill=ShellStyle.LIST_SELECT_BG if selected else ShellStyle.SCREEN_BG,
+            state="normal",
+        )
+
+        photo = self.thumbnail(pokemon.id) if self.thumbnail is not None else None
+        canvas.coords(slot.thumbnail, 2 + self.thumbnail_size / 2, middle)
+        canvas.itemconfigure(slot.thumbnail, image=photo or "", state="normal" if photo else "hidden")
+
+        canvas.coords(slot.label, self.thumbnail_size + 8, middle)
+        canvas.itemconfigure(
+            slot.label,
+            text=f"#{pokemon.id:03}  {pokemon.name}",
+            fill=ShellStyle.LIST_SELECT_TEXT if selected else ShellStyle.SCREEN_TEXT,
+            state="normal",
+        )
+
+        type_names = (self.types(pokemon.id) if self.types is not None else None) or ()
+        right = width - BADGE_PADDING
+        badge_top, badge_bottom = y + 4, y + self.row_height - 4
+        # Badges are laid out right to left so the primary type ends up first.
+        for position, (rect, text) in enumerate(slot.badges):
+            slot_index = len(type_names) - 1 - position
+            if slot_index < 0:
+                canvas.itemconfigure(rect, state="hidden")
+                canvas.itemconfigure(text, state="hidden")
+                continue
+            type_name = type_names[slot_index]
+            badge_width = self._badge_width(type_name)
+            canvas.coords(rect, right - badge_width, badge_top, right, badge_bottom)
+            canvas.itemconfigure(rect, fill=TypeColors.BY_TYPE.get(type_name, TypeColors.DEFAULT), state="normal")
+            canvas.coords(text, right - badge_width / 2, middle)
+            canvas.itemconfigure(text, text=type_name.upper(), state="normal")
+            right -= badge_width + BADGE_PADDING
+
+    def _badge_width(self, type_name: str) -> int:
+        width = self._badge_widths.get(type_name)
+        if width is None:
+            width = self._badge_font.measure(type_name.upper()) + 2 * BADGE_PADDING
+            self._badge_widths[type_name] = width
+        return width
+
+    def _on_click(self, event: tk.Event) -> None:
+        self.canvas.focus_set()
+        index = int(self.canvas.canvasy(event.y) // self.row_height)
+        if 0 <= index < len(self._rows):
+            self.select(index)
+
+    def _on_mousewheel(self, event: tk.Event) -> None:
+        # Windows reports multiples of 120, macOS small deltas; only the direction matters here.
+        if event.delta:
+            self._scroll_units(-1 if event.delta > 0 else 1)
+
+    def _scroll_units(self, units: int) -> None:
+        self.canvas.yview_scroll(units * 3, "units")
+
+    def _select_by_page(self, direction: int) -> None:
+        page = max(1, self.canvas.winfo_height() // self.row_height - 1)
+        self.select((self.selection or 0) + direction * page)
+
+    def _select_edge(self, index: int) -> None:
+        if self._rows:
+            self.select(index)
@@ -0,0 +1,377 @@
+"""
+Headless export of the whole Pokédex for print and web material.
+
+    python export_dex.py export/ --scale 4
+    python export_dex.py export/ --format csv --no-cries --workers 16
+    python export_dex.py national/ --dex national
+
+writes, into the output directory:
+
+- `pokedex.jsonl`: one `PokemonDetails.to_dict()` object per line, plus the
+  relative paths of the exported sprite and cry
+- `pokedex.csv`: the same entries flattened to one row each
+- `sprites/<id>-<name>.png`: the red-blue sprite, nearest-neighbour scaled by `--scale`
+- `cries/<id>-<name>.ogg`: the cry as served by PokéAPI
+
+Entries are fetched on a thread pool through `pokeapi_client` (so the HTTP
+cache, asset store, offline pack and `--backend` all apply) but written in dex
+order, one line at a time, with at most `2 * workers` entries held in memory.
+Re-running the command skips entries that are already in every requested
+output, so an interrupted export picks up where it stopped. Nothing here
+imports Tk.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from pokeapi_client import (
+    BACKENDS,
+    DEXES,
+    PokeAPIError,
+    enable_offline_mode,
+    get_asset_path,
+    get_backend,
+    get_pokedex,
+    get_pokemon_details,
+    set_backend,
+)
+from pokemon_models import STAT_LABELS, PokemonDetails, PokemonSummary
+from sprite_pipeline import SpriteError, decode_sprite, pil_image, scale_sprite
+
+FORMATS = ("jsonl", "csv")
+DEFAULT_WORKERS = 8
+JSONL_NAME = "pokedex.jsonl"
+CSV_NAME = "pokedex.csv"
+CSV_COLUMNS = (
+    ("id", "name", "genus", "types", "abilities", "height_m", "weight_kg")
+    + tuple(label.lower().replace(" ", "_") for label in STAT_LABELS)
+    + ("flavor_text", "sprite_file", "cry_file", "image_url", "cry_url")
+)
+
+# Columns of an exported row that say which assets it has and which it should have.
+ASSET_COLUMNS = ("sprite_file", "cry_file", "image_url", "cry_url")
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+
+class ExportError(Exception):
+    """Raised when the export cannot be written."""
+
+
+
+class ExportedEntry(NamedTuple):
+    details: PokemonDetails
+    sprite_file: Optional[str]
+    cry_file: Optional[str]
+
+
+
+def _file_stem(pokemon: PokemonSummary) -> str:
+    return f"{pokemon.id:03}-{pokemon.api_name}"
+
+
+
+def _trim_partial_line(path: Path) -> None:
+    """Drop a half-written last line left behind by an interrupted run."""
+    with open(path, "rb+") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        handle.seek(size - 1)
+        if handle.read(1) == b"\n":
+            return
+        # Walk back in blocks until the previous newline.
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            handle.seek(position)
+            block = handle.read(step)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                handle.truncate(position + newline + 1)
+                return
+        handle.truncate(0)
+
+
+
+def _cry_suffix(cry_url: str) -> str:
+    return PurePosixPath(urlsplit(cry_url).path).suffix.lower() or ".ogg"
+
+
+
+def _copy_atomic(source: Path, path: Path) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, path)
+
+
+
+class _JSONLWriter:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # id -> the row's `ASSET_COLUMNS`
+        self.done: Dict[int, Dict[str, Optional[str]]] = {}
+        if path.exists():
+            _trim_partial_line(path)
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                        self.done[int(record["id"])] = {column: record.get(column) for column in ASSET_COLUMNS}
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue
+        self._file = open(path, "a", encoding="utf-8", newline="\n")
+
+    def write(self, entry: ExportedEntry) -> None:
+        record = entry.details.to_dict()
+        record["sprite_file"] = entry.sprite_file
+        record["cry_file"] = entry.cry_file
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+
+class _CSVWriter:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.done: Dict[int, Dict[str, Optional[str]]] = {}
+        is_new = not path.exists() or path.stat().st_size == 0
+        if not is_new:
+            _trim_partial_line(path)
+            with open(path, encoding="utf-8", newline="") as handle:
+                for row in csv.DictReader(handle):
+                    try:
+                        self.done[int(row["id"])] = {column: row.get(column) or None for column in ASSET_COLUMNS}
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        self._file = open(path, "a", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        if is_new:
+            self._writer.writerow(CSV_COLUMNS)
+
+    def write(self, entry: ExportedEntry) -> None:
+        details = entry.details
+        self._writer.writerow(
+            (details.id, details.name, details.genus, "/".join(details.types), "; ".join(details.abilities),
+             details.height_m, details.weight_kg)
+            + tuple(details.stats)
+            + (details.flavor_text, entry.sprite_file or "", entry.cry_file or "",
+               details.image_url or "", details.cry_url or "")
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+
+class DexExporter:
+    """
+    Fetches entries in parallel and streams them to the requested outputs in dex order.
+
+    `sprites`/`cries` switch the asset directories on or off; `scale` > 1
+    needs Pillow and falls back to the original sprite size without it.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        formats: Tuple[str, ...] = FORMATS,
+        sprites: bool = True,
+        cries: bool = True,
+        scale: int = 1,
+        workers: int = DEFAULT_WORKERS,
+        dex: str = "kanto",
+    ) -> None:
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ExportError(f"Unknown format(s): {', '.join(sorted(unknown))}")
+        self.output_dir = Path(output_dir)
+        self.formats = tuple(formats)
+        self.sprite_dir = self.output_dir / "sprites" if sprites else None
+        self.cry_dir = self.output_dir / "cries" if cries else None
+        self.scale = max(1, int(scale))
+        self.workers = max(1, int(workers))
+        self.dex = dex
+
+    def run(self, progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """Export every listed entry; returns counts of exported, skipped and failed entries."""
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            for folder in (self.sprite_dir, self.cry_dir):
+                if folder is not None:
+                    folder.mkdir(exist_ok=True)
+            writers = self._open_writers()
+        except OSError as exc:
+            raise ExportError(f"Cannot write to {self.output_dir}: {exc}") from exc
+
+        counts = {"exported": 0, "skipped": 0, "failed": 0}
+        try:
+            pokemon = get_pokedex(self.dex)
+            finished = self._finished_ids(pokemon, writers)
+            todo = [entry for entry in pokemon if entry.id not in finished]
+            counts["skipped"] = len(pokemon) - len(todo)
+
+            for position, (summary, result) in enumerate(self._fetch_in_order(todo), start=counts["skipped"] + 1):
+                if isinstance(result, Exception):
+                    counts["failed"] += 1
+                    label = f"{summary.name} failed: {result}"
+                else:
+                    for writer in writers:
+                        if summary.id not in writer.done:
+                            writer.write(result)
+                    counts["exported"] += 1
+                    label = summary.name
+                if progress is not None:
+                    progress(position, len(pokemon), label)
+        finally:
+            for writer in writers:
+                writer.close()
+        return counts
+
+    def _open_writers(self) -> List[Any]:
+        writers: List[Any] = []
+        if "jsonl" in self.formats:
+            writers.append(_JSONLWriter(self.output_dir / JSONL_NAME))
+        if "csv" in self.formats:
+            writers.append(_CSVWriter(self.output_dir / CSV_NAME))
+        return writers
+
+    def _finished_ids(self, pokemon: List[PokemonSummary], writers: List[Any]) -> Set[int]:
+        """
+        Ids that every output already has a row for, with every requested asset the
+        entry has. Built once from the rows read at start-up, without listing folders.
+        """
+        if not writers:
+            return set()
+        return {
+            entry.id
+            for entry in pokemon
+            if all(entry.id in writer.done for writer in writers) and self._has_assets(entry, writers[0].done[entry.id])
+        }
+
+    def _has_assets(self, pokemon: PokemonSummary, row: Dict[str, Optional[str]]) -> bool:
+        image_url, cry_url = row.get("image_url"), row.get("cry_url")
+        wanted = []
+        # No URL means there is nothing to download for this entry.
+        if self.sprite_dir is not None and image_url:
+            wanted.append((row.get("sprite_file"), self.sprite_dir / f"{_file_stem(pokemon)}.png"))
+        if self.cry_dir is not None and cry_url:
+            wanted.append((row.get("cry_file"), self.cry_dir / f"{_file_stem(pokemon)}{_cry_suffix(cry_url)}"))
+        # Asset files are written atomically, so one that exists is complete. A row written
+        # without an asset (e.g. by a `--no-cries` run) still counts once the file is there.
+        return all((self.output_dir / exported if exported else path).is_file() for exported, path in wanted)
+
+    def _fetch_in_order(self, pokemon: List[PokemonSummary]):
+        """Yield `(summary, ExportedEntry or exception)` in list order with a bounded window of work in flight."""
+        window: Deque[Tuple[PokemonSummary, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="export") as executor:
+            for summary in pokemon:
+                window.append((summary, executor.submit(self._export_one, summary)))
+                if len(window) >= self.workers * 2:
+                    yield self._settle(window.popleft())
+            while window:
+                yield self._settle(window.popleft())
+
+    @staticmethod
+    def _settle(item: Tuple[PokemonSummary, Future]) -> Tuple[PokemonSummary, Any]:
+        summary, future = item
+        try:
+            return summary, future.result()
+        except (PokeAPIError, SpriteError, OSError) as exc:
+            return summary, exc
+
+    def _export_one(self, pokemon: PokemonSummary) -> ExportedEntry:
+        details = get_pokemon_details(pokemon.id)
+        sprite_file = cry_file = None
+        if self.sprite_dir is not None and details.image_url:
+            sprite_file = self._write_sprite(pokemon, details.image_url)
+        if self.cry_dir is not None and details.cry_url:
+            cry_file = self._write_cry(pokemon, details.cry_url)
+        return ExportedEntry(details, sprite_file, cry_file)
+
+    def _write_sprite(self, pokemon: PokemonSummary, image_url: str) -> str:
+        path = self.sprite_dir / f"{_file_stem(pokemon)}.png"
+        source = get_asset_path(image_url)
+        if self.scale == 1 or pil_image() is None:
+            _copy_atomic(source, path)
+        else:
+            scaled = scale_sprite(decode_sprite(source.read_bytes()), self.scale)
+            tmp_path = path.with_name(path.name + ".tmp")
+            scaled.save(tmp_path, format="PNG")
+            os.replace(tmp_path, path)
+        return path.relative_to(self.output_dir).as_posix()
+
+    def _write_cry(self, pokemon: PokemonSummary, cry_url: str) -> str:
+        path = self.cry_dir / f"{_file_stem(pokemon)}{_cry_suffix(cry_url)}"
+        _copy_atomic(get_asset_path(cry_url), path)
+        return path.relative_to(self.output_dir).as_posix()
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export every entry of a dex to JSON Lines, CSV and asset folders.")
+    parser.add_argument("output", type=Path, help="directory to write (re-running resumes into it)")
+    parser.add_argument("--format", dest="formats", action="append", choices=FORMATS,
+                        help="output table(s) to write; repeat for several (default: all)")
+    parser.add_argument("--no-sprites", action="store_true", help="skip the sprites/ directory")
+    parser.add_argument("--no-cries", action="store_true", help="skip the cries/ directory")
+    parser.add_argument("--scale", type=int, default=1, help="integer sprite upscale factor (needs Pillow)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel fetches")
+    parser.add_argument("--dex", choices=list(DEXES), default="kanto", help="regional dex (or the National Dex) to export")
+    parser.add_argument("--offline", metavar="PACK", type=Path, help="export from an offline data pack")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=get_backend() if get_backend() in BACKENDS else "rest",
+        help="fetch entries one by one over REST or in batches over GraphQL",
+    )
+    parser.add_argument("--quiet", action="store_true", help="do not print per-entry progress")
+    args = parser.parse_args(argv)
+
+    set_backend(args.backend)
+    if args.offline is not None:
+        enable_offline_mode(args.offline)
+    if args.scale > 1 and pil_image() is None:
+        print("Pillow is not installed; sprites are exported at their original size.", file=sys.stderr)
+
+    def report(done: int, total: int, label: str) -> None:
+        print(f"[{done:3}/{total}] {label}", file=sys.stderr)
+
+    exporter = DexExporter(
+        args.output,
+        formats=tuple(args.formats or FORMATS),
+        sprites=not args.no_sprites,
+        cries=not args.no_cries,
+        scale=args.scale,
+        workers=args.workers,
+        dex=args.dex,
+    )
+    try:
+        counts = exporter.run(progress=None if args.quiet else report)
+    except (ExportError, PokeAPIError) as exc:
+        print(f"Export failed: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Exported {counts['exported']} entries to {args.output} "
+          f"({counts['skipped']} already present, {counts['failed']} failed)")
+    return 0 if counts["failed"] == 0 else 1
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
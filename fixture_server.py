@@ -0,0 +1,506 @@
+"""
+Local PokéAPI stand-in that replays recorded fixtures.
+
+Record fixtures once while online:
+
+    python fixture_server.py record fixtures/                 # GraphQL
+    python fixture_server.py record fixtures/ --api rest      # REST payloads, sprites and cries
+
+or generate a synthetic dex (REST and GraphQL) that needs no network at all:
+
+    python fixture_server.py synthesize fixtures/ --count 151
+
+then serve them and point the client at the stand-in:
+
+    python fixture_server.py serve fixtures/ --port 8765 --latency-ms 40
+    POKEDEX_BASE_URL=http://127.0.0.1:8765/api/v2 python main.py
+    POKEDEX_BACKEND=graphql POKEDEX_GRAPHQL_URL=http://127.0.0.1:8765/graphql python main.py
+
+Layout:
+- `graphql/DexList-<dex>.json` holds the `data` of a `DexList` query and
+  `graphql/species/<id>.json` one `SpeciesBatch` row per species; a batch query
+  is answered with whichever of the requested ids have a fixture.
+- `rest/<path>.json` answers `GET /api/v2/<path>/` (e.g. `rest/pokemon/25.json`).
+- `raw/<path>` answers `GET /raw/<path>` (sprites and cries).
+
+`{{origin}}` inside REST and GraphQL fixtures is replaced with the server's own address, so
+sprite and cry URLs in replayed payloads point back at the stand-in.
+`latency` delays every response and `bandwidth` throttles bodies to that many
+bytes per second (`--bandwidth-kbps` takes kilobits per second).
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+ORIGIN_PLACEHOLDER = "{{origin}}"
+LIVE_ORIGINS = {
+    "https://pokeapi.co": ORIGIN_PLACEHOLDER,
+    "https://raw.githubusercontent.com": ORIGIN_PLACEHOLDER + "/raw",
+}
+CONTENT_TYPES = {".json": "application/json", ".png": "image/png", ".ogg": "audio/ogg", ".wav": "audio/wav"}
+CHUNK_SIZE = 16 * 1024
+
+
+
+class FixtureServer:
+    """Serves a fixture directory on 127.0.0.1 from a background thread."""
+
+    def __init__(
+        self,
+        fixtures_dir: Path,
+        port: int = 0,
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+    ) -> None:
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self._bodies: Dict[str, Optional[Tuple[bytes, str]]] = {}
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def graphql_url(self) -> str:
+        return f"{self.base_url}/graphql"
+
+    @property
+    def rest_url(self) -> str:
+        return f"{self.base_url}/api/v2"
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def answer_graphql(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        operation = request.get("operationName")
+        variables = request.get("variables") or {}
+        graphql_dir = self.fixtures_dir / "graphql"
+
+        if operation == "DexList":
+            path = graphql_dir / f"DexList-{variables.get('dex', '')}.json"
+            return self._read_json(path) if path.is_file() else None
+
+        if operation == "SpeciesBatch":
+            rows = []
+            for pokemon_id in variables.get("ids") or []:
+                path = graphql_dir / "species" / f"{int(pokemon_id)}.json"
+                if path.is_file():
+                    rows.append(self._read_json(path))
+            return {"species": rows}
+
+        return None
+
+    def _read_json(self, path: Path) -> Any:
+        return json.loads(path.read_text(encoding="utf-8").replace(ORIGIN_PLACEHOLDER, self.base_url))
+
+    def answer_get(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """Body and content type for a GET of `path`, or None when there is no fixture."""
+        path = urlsplit(path).path
+        if path in self._bodies:
+            return self._bodies[path]
+
+        answer = None
+        if path.startswith("/api/v2/"):
+            file_path = self._fixture_path("rest", path[len("/api/v2/"):].strip("/") + ".json")
+            if file_path is not None:
+                text = file_path.read_text(encoding="utf-8").replace(ORIGIN_PLACEHOLDER, self.base_url)
+                answer = (text.encode("utf-8"), CONTENT_TYPES[".json"])
+        elif path.startswith("/raw/"):
+            file_path = self._fixture_path("raw", path[len("/raw/"):])
+            if file_path is not None:
+                answer = (file_path.read_bytes(), CONTENT_TYPES.get(file_path.suffix.lower(), "application/octet-stream"))
+
+        # Fixtures are immutable while serving, so keep replies in memory instead of re-reading files.
+        self._bodies[path] = answer
+        return answer
+
+    def _fixture_path(self, section: str, relative: str) -> Optional[Path]:
+        parts = PurePosixPath(relative).parts
+        if not parts or any(part in ("..", "") for part in parts):
+            return None
+        path = self.fixtures_dir.joinpath(section, *parts)
+        return path if path.is_file() else None
+
+
+
+def bandwidth_from_kbps(kbps: float) -> Optional[float]:
+    """`FixtureServer` bandwidth (bytes per second) for a rate in kilobits per second; None for 0 (unlimited)."""
+    return kbps * 1000 / 8 or None
+
+
+
+def _make_handler(server: FixtureServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, Nagle plus delayed ACKs add ~40 ms per reply.
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            answer = server.answer_get(self.path)
+            if answer is None:
+                self._send(404, json.dumps({"detail": "Not found."}).encode("utf-8"), CONTENT_TYPES[".json"])
+                return
+
+            body, content_type = answer
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", content_type, {"ETag": etag})
+                return
+            self._send(200, body, content_type, {"ETag": etag, "Cache-Control": "public, max-age=86400"})
+
+        def do_POST(self) -> None:
+            # Read the body even when refusing the request, or it would be parsed as the next one on this connection.
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path.rstrip("/") != "/graphql":
+                self._send_json(404, {"errors": [{"message": f"No fixture route for {self.path}"}]})
+                return
+            try:
+                request = json.loads(body)
+            except (ValueError, json.JSONDecodeError):
+                self._send_json(400, {"errors": [{"message": "Request body is not JSON."}]})
+                return
+
+            data = server.answer_graphql(request)
+            if data is None:
+                self._send_json(200, {"errors": [{"message": f"No fixture for {request.get('operationName')}"}]})
+            else:
+                self._send_json(200, {"data": data})
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            self._send(status, json.dumps(payload, separators=(",", ":")).encode("utf-8"), CONTENT_TYPES[".json"])
+
+        def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+            if server.latency > 0:
+                time.sleep(server.latency)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+
+            if not server.bandwidth:
+                self.wfile.write(body)
+                return
+            for start in range(0, len(body), CHUNK_SIZE):
+                chunk = body[start:start + CHUNK_SIZE]
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                time.sleep(len(chunk) / server.bandwidth)
+
+        def log_message(self, *_args: Any) -> None:
+            pass
+
+    return Handler
+
+
+
+def record(fixtures_dir: Path, dex: str = "kanto") -> int:
+    """Save the dex list and every listed species from the live GraphQL endpoint."""
+    from pokeapi_graphql import DEX_LIST_QUERY, SPECIES_BATCH_QUERY, GraphQLBackend
+
+    backend = GraphQLBackend()
+    graphql_dir = Path(fixtures_dir) / "graphql"
+    (graphql_dir / "species").mkdir(parents=True, exist_ok=True)
+
+    dex_data = backend.query("DexList", DEX_LIST_QUERY, {"dex": dex})
+    (graphql_dir / f"DexList-{dex}.json").write_text(json.dumps(dex_data), encoding="utf-8")
+
+    ids: List[int] = sorted({entry["species"]["id"] for entry in dex_data.get("entries", []) if entry.get("species")})
+    count = 0
+    for start in range(0, len(ids), backend.batch_size):
+        data = backend.query("SpeciesBatch", SPECIES_BATCH_QUERY, {"ids": ids[start:start + backend.batch_size]})
+        for row in data.get("species", []):
+            (graphql_dir / "species" / f"{row['id']}.json").write_text(json.dumps(row), encoding="utf-8")
+            count += 1
+    return count
+
+
+
+def _localize(text: str) -> str:
+    for origin, placeholder in LIVE_ORIGINS.items():
+        text = text.replace(origin, placeholder)
+    return text
+
+
+
+def _save_rest(fixtures_dir: Path, url: str, body: bytes) -> None:
+    from pokeapi_client import BASE_URL
+
+    relative = url[len(BASE_URL):].strip("/") + ".json"
+    path = Path(fixtures_dir, "rest", *PurePosixPath(relative).parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(_localize(body.decode("utf-8")), encoding="utf-8")
+
+
+
+def _save_raw(fixtures_dir: Path, url: str, body: bytes) -> None:
+    parts = urlsplit(url)
+    path = Path(fixtures_dir, "raw", *PurePosixPath(parts.path).parts[1:])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+
+
+
+def record_rest(fixtures_dir: Path, dex: str = "kanto") -> int:
+    """Save the dex, the 18 `/type/` resources, each entry's `/pokemon/` and `/pokemon-species/` payloads, and its sprite and cry."""
+    from pokeapi_client import BASE_URL, PokeAPIError, _request, build_details, get_cry_bytes, get_image_bytes
+    from type_chart import TYPES
+
+    dex_url = f"{BASE_URL}/pokedex/{dex}/"
+    dex_body = _request(dex_url)
+    _save_rest(fixtures_dir, dex_url, dex_body)
+    for type_name in TYPES:
+        type_url = f"{BASE_URL}/type/{type_name.lower()}/"
+        _save_rest(fixtures_dir, type_url, _request(type_url))
+
+    count = 0
+    for entry in json.loads(dex_body).get("pokemon_entries", []):
+        species_url = entry.get("pokemon_species", {}).get("url", "").rstrip("/")
+        pokemon_id = species_url.rsplit("/", 1)[-1]
+        if not pokemon_id.isdigit():
+            continue
+
+        payloads = []
+        for resource in ("pokemon", "pokemon-species"):
+            url = f"{BASE_URL}/{resource}/{pokemon_id}/"
+            body = _request(url)
+            _save_rest(fixtures_dir, url, body)
+            payloads.append(json.loads(body))
+
+        details = build_details(*payloads)
+        for url, fetch in ((details.image_url, get_image_bytes), (details.cry_url, get_cry_bytes)):
+            if url:
+                try:
+                    _save_raw(fixtures_dir, url, fetch(url))
+                except PokeAPIError:
+                    pass
+        count += 1
+    return count
+
+
+
+def _png(width: int, height: int, rgba: Tuple[int, int, int, int]) -> bytes:
+    """A minimal RGBA PNG: a filled ellipse on a transparent background."""
+    rows = []
+    for y in range(height):
+        row = bytearray(b"\x00")
+        for x in range(width):
+            dx = (x - width / 2) / (width / 2)
+            dy = (y - height / 2) / (height / 2)
+            row += bytes(rgba) if dx * dx + dy * dy <= 0.8 else b"\x00\x00\x00\x00"
+        rows.append(bytes(row))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"".join(rows))) + chunk(b"IEND", b"")
+
+
+
+def _species_row(pokemon: Dict[str, Any], species: Dict[str, Any]) -> Dict[str, Any]:
+    """The `SpeciesBatch` row PokéAPI's GraphQL endpoint returns for these REST payloads."""
+    return {
+        "id": species["id"],
+        "genera": [{"genus": genus["genus"]} for genus in species["genera"]],
+        "flavor_texts": [
+            {"flavor_text": entry["flavor_text"], "version": {"name": entry["version"]["name"]}}
+            for entry in species["flavor_text_entries"]
+        ],
+        "pokemon": [
+            {
+                "id": pokemon["id"],
+                "name": pokemon["name"],
+                "height": pokemon["height"],
+                "weight": pokemon["weight"],
+                "types": [{"type": {"name": row["type"]["name"]}} for row in pokemon["types"]],
+                "abilities": [{"ability": {"name": row["ability"]["name"]}} for row in pokemon["abilities"]],
+                "stats": [{"base_stat": row["base_stat"], "stat": {"name": row["stat"]["name"]}} for row in pokemon["stats"]],
+                # Hasura returns these jsonb columns as encoded strings.
+                "sprites": [{"sprites": json.dumps(pokemon["sprites"])}],
+                "cries": [{"cries": json.dumps(pokemon["cries"])}],
+            }
+        ],
+    }
+
+
+
+def synthesize(fixtures_dir: Path, count: int = 151, dex: str = "kanto", seed: int = 151) -> int:
+    """
+    Write a deterministic, made-up dex of `count` entries with the same payload
+    shape as the live API (including the bulky REST `moves` list), plus the
+    matching GraphQL `DexList` and `SpeciesBatch` fixtures, so the stand-in can
+    run either backend without ever recording from the network.
+    """
+    rng = random.Random(seed)
+    syllables = ("ba", "chu", "da", "ge", "ka", "li", "mo", "no", "pi", "ra", "sau", "ta", "vee", "zu", "char", "bul")
+    type_names = ("normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground",
+                  "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy")
+    stat_names = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+    fixtures_dir = Path(fixtures_dir)
+    rest_dir = fixtures_dir / "rest"
+    for folder in ("pokedex", "pokemon", "pokemon-species", "type"):
+        (rest_dir / folder).mkdir(parents=True, exist_ok=True)
+    sprite_dir = fixtures_dir / "raw" / "sprites"
+    sprite_dir.mkdir(parents=True, exist_ok=True)
+    graphql_dir = fixtures_dir / "graphql"
+    (graphql_dir / "species").mkdir(parents=True, exist_ok=True)
+
+    def resource(kind: str, name: str, number: int) -> Dict[str, str]:
+        return {"name": name, "url": f"{ORIGIN_PLACEHOLDER}/api/v2/{kind}/{number}/"}
+
+    entries = []
+    for pokemon_id in range(1, count + 1):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))) + f"-{pokemon_id}"
+        entries.append({"entry_number": pokemon_id, "pokemon_species": resource("pokemon-species", name, pokemon_id)})
+        sprite_url = f"{ORIGIN_PLACEHOLDER}/raw/sprites/{pokemon_id}.png"
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+        (sprite_dir / f"{pokemon_id}.png").write_bytes(_png(56, 56, color))
+
+        pokemon = {
+            "id": pokemon_id,
+            "name": name,
+            "height": rng.randint(3, 40),
+            "weight": rng.randint(20, 2000),
+            "types": [
+                {"slot": slot, "type": resource("type", type_name, type_names.index(type_name) + 1)}
+                for slot, type_name in enumerate(rng.sample(type_names, rng.randint(1, 2)), start=1)
+            ],
+            "abilities": [{"slot": 1, "is_hidden": False, "ability": resource("ability", "synthetic-ability", 1)}],
+            "stats": [
+                {"base_stat": rng.randint(20, 160), "effort": 0, "stat": resource("stat", stat, index)}
+                for index, stat in enumerate(stat_names, start=1)
+            ],
+            "sprites": {
+                "front_default": sprite_url,
+                "versions": {"generation-i": {"red-blue": {"front_default": sprite_url}}},
+            },
+            "cries": {"latest": None, "legacy": None},
+            "moves": [
+                {"move": resource("move", f"move-{move}", move), "version_group_details": [{"level_learned_at": move % 50}] * 8}
+                for move in rng.sample(range(1, 900), 60)
+            ],
+        }
+        species = {
+            "id": pokemon_id,
+            "name": name,
+            "genera": [{"genus": "Synthetic Pokémon", "language": resource("language", "en", 9)}],
+            "flavor_text_entries": [
+                {
+                    "flavor_text": f"A synthetic entry\nnumber {pokemon_id} for benchmarks.",
+                    "language": resource("language", "en", 9),
+                    "version": resource("version", "red", 1),
+                }
+            ],
+        }
+        (rest_dir / "pokemon" / f"{pokemon_id}.json").write_text(json.dumps(pokemon), encoding="utf-8")
+        (rest_dir / "pokemon-species" / f"{pokemon_id}.json").write_text(json.dumps(species), encoding="utf-8")
+        row = _species_row(pokemon, species)
+        (graphql_dir / "species" / f"{pokemon_id}.json").write_text(json.dumps(row), encoding="utf-8")
+
+    (rest_dir / "pokedex" / f"{dex}.json").write_text(json.dumps({"name": dex, "pokemon_entries": entries}), encoding="utf-8")
+    dex_list = {
+        "entries": [
+            {"pokedex_number": entry["entry_number"], "species": {"id": entry["entry_number"], "name": entry["pokemon_species"]["name"]}}
+            for entry in entries
+        ]
+    }
+    (graphql_dir / f"DexList-{dex}.json").write_text(json.dumps(dex_list), encoding="utf-8")
+
+    for number, type_name in enumerate(type_names, start=1):
+        targets = rng.sample(type_names, 6)
+        relations = {
+            "double_damage_to": [resource("type", target, type_names.index(target) + 1) for target in targets[:3]],
+            "half_damage_to": [resource("type", target, type_names.index(target) + 1) for target in targets[3:5]],
+            "no_damage_to": [resource("type", target, type_names.index(target) + 1) for target in targets[5:] if rng.random() < 0.2],
+        }
+        payload = {"id": number, "name": type_name, "damage_relations": relations}
+        (rest_dir / "type" / f"{type_name}.json").write_text(json.dumps(payload), encoding="utf-8")
+    return count
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record, generate or serve PokéAPI fixtures.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    record_cmd = subcommands.add_parser("record", help="download fixtures from the live API")
+    record_cmd.add_argument("fixtures", type=Path)
+    record_cmd.add_argument("--dex", default="kanto")
+    record_cmd.add_argument("--api", choices=("graphql", "rest"), default="graphql")
+    synth_cmd = subcommands.add_parser("synthesize", help="write a made-up dex without the network")
+    synth_cmd.add_argument("fixtures", type=Path)
+    synth_cmd.add_argument("--count", type=int, default=151)
+    synth_cmd.add_argument("--dex", default="kanto")
+    serve_cmd = subcommands.add_parser("serve", help="serve a fixture directory")
+    serve_cmd.add_argument("fixtures", type=Path)
+    serve_cmd.add_argument("--port", type=int, default=8765)
+    serve_cmd.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    serve_cmd.add_argument("--bandwidth-kbps", type=float, default=0.0, help="throttle bodies (kilobits/s, 0 = unlimited)")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        count = (record_rest if args.api == "rest" else record)(args.fixtures, args.dex)
+        print(f"Recorded {count} species to {args.fixtures}")
+        return 0
+
+    if args.command == "synthesize":
+        synthesize(args.fixtures, args.count, args.dex)
+        print(f"Wrote {args.count} synthetic entries to {args.fixtures}")
+        return 0
+
+    server = FixtureServer(
+        args.fixtures,
+        args.port,
+        latency=args.latency_ms / 1000,
+        bandwidth=bandwidth_from_kbps(args.bandwidth_kbps),
+    )
+    print(f"Serving {args.fixtures} at {server.rest_url} and {server.graphql_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
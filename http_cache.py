@@ -0,0 +1,216 @@
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Mapping, NamedTuple, Optional
+
+DEFAULT_MAX_AGE_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+
+class CacheEntry(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) < self.expires_at
+
+    def validator_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value
+
+
+def _parse_cache_control(value: Optional[str]) -> dict:
+    directives = {}
+    for part in (value or "").split(","):
+        key, _, arg = part.strip().partition("=")
+        if key:
+            directives[key.lower()] = arg.strip('"')
+    return directives
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds a response may be served without revalidation.
+    Returns None when the response must not be stored at all.
+    """
+    directives = _parse_cache_control(_header(headers, "Cache-Control"))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for key in ("s-maxage", "max-age"):
+        if key in directives:
+            try:
+                return max(0.0, float(directives[key]))
+            except ValueError:
+                return 0.0
+
+    expires = _header(headers, "Expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+        return max(0.0, expires_at - (time.time() if now is None else now))
+
+    return float(DEFAULT_MAX_AGE_SECONDS)
+
+
+class HTTPCache:
+    """SQLite-backed response store with conditional-GET validators and LRU eviction."""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+        except (OSError, sqlite3.Error):
+            # A broken or read-only cache location must never stop the app from loading.
+            self._conn = None
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        if self._conn is None:
+            return None
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT body, etag, last_modified, expires_at FROM responses WHERE url = ?",
+                    (url,),
+                ).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            except sqlite3.Error:
+                return None
+
+        return CacheEntry(bytes(row[0]), row[1], row[2], row[3])
+
+    def store(self, url: str, body: bytes, headers: Mapping[str, str]) -> None:
+        if self._conn is None:
+            return
+
+        now = time.time()
+        lifetime = freshness_lifetime(headers, now)
+        if lifetime is None or len(body) > self.max_bytes:
+            self.delete(url)
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(url, body, etag, last_modified, expires_at, last_access, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        url,
+                        sqlite3.Binary(body),
+                        _header(headers, "ETag"),
+                        _header(headers, "Last-Modified"),
+                        now + lifetime,
+                        now,
+                        len(body),
+                    ),
+                )
+                self._evict()
+            except sqlite3.Error:
+                pass
+
+    def refresh(self, url: str, headers: Mapping[str, str]) -> None:
+        """Extend the freshness of an entry after a 304 Not Modified response."""
+        if self._conn is None:
+            return
+
+        now = time.time()
+        lifetime = freshness_lifetime(headers, now)
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE responses SET expires_at = ?, last_access = ?, "
+                    "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                    (
+                        now + (lifetime or 0.0),
+                        now,
+                        _header(headers, "ETag"),
+                        _header(headers, "Last-Modified"),
+                        url,
+                    ),
+                )
+            except sqlite3.Error:
+                pass
+
+    def delete(self, url: str) -> None:
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            except sqlite3.Error:
+                pass
+
+    def clear(self) -> None:
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM responses")
+            except sqlite3.Error:
+                pass
+
+    def total_bytes(self) -> int:
+        if self._conn is None:
+            return 0
+
+        with self._lock:
+            try:
+                return int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+            except sqlite3.Error:
+                return 0
+
+    def _evict(self) -> None:
+        # Caller holds the lock. Drop least recently used rows until we fit the budget again.
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY last_access ASC").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
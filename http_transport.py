@@ -0,0 +1,204 @@
+import gzip
+import http.client
+import threading
+import zlib
+from email.message import Message
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+# Connecting should be quick; a slow upstream shows up as a slow read instead.
+CONNECT_TIMEOUT_SECONDS = 4.0
+READ_TIMEOUT_SECONDS = 10.0
+MAX_CONNECTIONS_PER_HOST = 4
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+# Only these are resent after a pooled connection turns out to be dead; the server may have acted on the first try.
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE")
+
+_HostKey = Tuple[str, str, int]
+
+
+class TransportError(Exception):
+    """Raised when a connection cannot be established or a response cannot be read."""
+
+
+
+class HTTPResponse(NamedTuple):
+    status: int
+    headers: Message
+    body: bytes
+    url: str
+
+
+
+def _decode_body(body: bytes, content_encoding: Optional[str]) -> bytes:
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        return body
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send a raw deflate stream without the zlib header.
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    raise TransportError(f"Unsupported Content-Encoding: {content_encoding}")
+
+
+
+class _HostPool:
+    def __init__(self, key: _HostKey, max_connections: int, connect_timeout: float, read_timeout: float) -> None:
+        self.key = key
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.idle: List[http.client.HTTPConnection] = []
+        self.lock = threading.Lock()
+
+    def checkout(self, fresh: bool = False) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection (and True), or a new unconnected one (and False) when `fresh` or none is idle."""
+        with self.lock:
+            if self.idle and not fresh:
+                return self.idle.pop(), True
+
+        scheme, host, port = self.key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.connect_timeout), False
+        return http.client.HTTPConnection(host, port, timeout=self.connect_timeout), False
+
+    def connect(self, connection: http.client.HTTPConnection) -> None:
+        """Open a fresh connection under the connect timeout, then switch the socket to the read timeout."""
+        connection.connect()
+        connection.sock.settimeout(self.read_timeout)
+
+    def checkin(self, connection: http.client.HTTPConnection) -> None:
+        with self.lock:
+            self.idle.append(connection)
+
+    def drop_idle(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+
+
+class HTTPTransport:
+    """
+    Thread-safe HTTP/1.1 client that keeps connections alive per host.
+    At most `max_connections_per_host` requests run against one host at a time;
+    extra callers wait for a free connection instead of opening new sockets.
+    `connect_timeout` bounds the TCP/TLS handshake and `read_timeout` each
+    wait for response bytes.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = READ_TIMEOUT_SECONDS,
+    ) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._pools: Dict[_HostKey, _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+    ) -> HTTPResponse:
+        current_url = url
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._request_once(method, current_url, headers or {}, body)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_CODES or not location:
+                return response
+            current_url = urljoin(current_url, location)
+            if response.status == 303:
+                method, body = "GET", None
+
+        raise TransportError(f"Too many redirects while requesting {url}")
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        return self.request("GET", url, headers=headers)
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.drop_idle()
+
+    def _pool_for(self, key: _HostKey) -> _HostPool:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _HostPool(key, self.max_connections_per_host, self.connect_timeout, self.read_timeout)
+                self._pools[key] = pool
+            return pool
+
+    def _request_once(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> HTTPResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise TransportError(f"Unsupported URL: {url}")
+
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        request_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        request_headers.update(headers)
+
+        pool = self._pool_for((scheme, parts.hostname, port))
+        pool.slots.acquire()
+        try:
+            # A pooled connection may have been closed by the server while idle. The
+            # other idle ones most likely were too, so an idempotent request is retried
+            # exactly once on a new socket and the rest of the idle pool is dropped.
+            for attempt in range(2):
+                connection, reused = pool.checkout(fresh=attempt > 0)
+                try:
+                    if not reused:
+                        pool.connect(connection)
+                    connection.request(method, path, body=body, headers=request_headers)
+                    response = connection.getresponse()
+                    raw_body = response.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as exc:
+                    connection.close()
+                    if reused and attempt == 0 and method.upper() in IDEMPOTENT_METHODS:
+                        pool.drop_idle()
+                        continue
+                    raise TransportError(str(exc) or exc.__class__.__name__) from exc
+                except (OSError, http.client.HTTPException) as exc:
+                    connection.close()
+                    raise TransportError(str(exc) or exc.__class__.__name__) from exc
+
+                if response.will_close:
+                    connection.close()
+                else:
+                    pool.checkin(connection)
+
+                try:
+                    decoded = _decode_body(raw_body, response.headers.get("Content-Encoding"))
+                except (OSError, EOFError, zlib.error) as exc:
+                    raise TransportError(f"Could not decode response body: {exc}") from exc
+
+                return HTTPResponse(response.status, response.headers, decoded, url)
+        finally:
+            pool.slots.release()
+
+        raise TransportError(f"Connection lost while requesting {url}")
+
+
+
+@lru_cache(maxsize=1)
+def get_default_transport() -> HTTPTransport:
+    """Shared transport used by every module that talks to PokéAPI or its asset hosts."""
+    return HTTPTransport()
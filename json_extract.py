@@ -0,0 +1,187 @@
+"""
+Selective JSON extraction.
+
+`extract(text, spec)` walks a JSON document and only builds Python objects for
+the paths named in `spec`; everything else is skipped by scanning for brackets
+and string ends, without allocating the skipped lists, dicts or strings. A spec
+is a dict of key -> True (keep the whole value) or key -> nested spec (descend
+into an object). Keys missing from the document are simply absent from the
+result, so callers keep using `.get` with defaults.
+
+Compare against a full `json.loads` with:
+
+    python json_extract.py 25            # /pokemon/25/ via the client cache
+    python json_extract.py payload.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import tracemalloc
+from json.decoder import scanstring
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+Spec = Dict[str, Union[bool, "Spec"]]
+
+SKIP_DEPTH = 8
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SKIP_TOKEN = re.compile(r'["\[\]{}]')
+
+
+class JSONExtractError(ValueError):
+    """Raised when the document is not valid JSON where the extractor looked."""
+
+
+
+def _container_pattern(depth: int) -> "re.Pattern[str]":
+    """
+    Regex matching a JSON array or object nested at most `depth` levels deep.
+    Every alternative starts with a different kind of character and a run of
+    plain characters must end at a bracket or quote, so a failed match only
+    backtracks linearly, and the whole skip runs inside the regex engine
+    instead of one Python iteration per token. Bracket kinds are not paired
+    up; that is fine for skipping well-formed input.
+    """
+    # No possessive quantifiers or atomic groups: those need Python 3.11.
+    run = r'[^"\[\]{}]+(?=["\[\]{}])'
+    string = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+    inner = r"(?:" + run + "|" + string + r")*"
+    for _ in range(depth):
+        inner = r"(?:" + run + "|" + string + r"|[\[{]" + inner + r"[\]}])*"
+    return re.compile(r"[\[{]" + inner + r"[\]}]")
+
+
+_SKIP_CONTAINER = _container_pattern(SKIP_DEPTH)
+
+
+
+def extract(text: Union[str, bytes], spec: Spec) -> Dict[str, Any]:
+    if isinstance(text, bytes):
+        text = text.decode("utf-8")
+    pos = _skip_ws(text, 0)
+    if not text.startswith("{", pos):
+        raise JSONExtractError("Expected a JSON object at the top level.")
+    result, _ = _extract_object(text, pos, spec)
+    return result
+
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+
+def _extract_object(text: str, pos: int, spec: Spec) -> Tuple[Dict[str, Any], int]:
+    # `pos` points at "{".
+    result: Dict[str, Any] = {}
+    pos = _skip_ws(text, pos + 1)
+    if text.startswith("}", pos):
+        return result, pos + 1
+
+    while True:
+        if not text.startswith('"', pos):
+            raise JSONExtractError(f"Expected an object key at offset {pos}.")
+        key, pos = scanstring(text, pos + 1)
+        pos = _skip_ws(text, pos)
+        if not text.startswith(":", pos):
+            raise JSONExtractError(f"Expected ':' at offset {pos}.")
+        pos = _skip_ws(text, pos + 1)
+
+        wanted = spec.get(key)
+        if wanted is True:
+            try:
+                result[key], pos = _DECODER.raw_decode(text, pos)
+            except json.JSONDecodeError as exc:
+                raise JSONExtractError(str(exc)) from exc
+        elif wanted and text.startswith("{", pos):
+            result[key], pos = _extract_object(text, pos, wanted)
+        else:
+            pos = _skip_value(text, pos)
+
+        pos = _skip_ws(text, pos)
+        if text.startswith(",", pos):
+            pos = _skip_ws(text, pos + 1)
+        elif text.startswith("}", pos):
+            return result, pos + 1
+        else:
+            raise JSONExtractError(f"Expected ',' or '}}' at offset {pos}.")
+
+
+
+def _skip_value(text: str, pos: int) -> int:
+    char = text[pos:pos + 1]
+    if char == '"':
+        return scanstring(text, pos + 1)[1]
+    if char not in ("{", "["):
+        # Scalars are short; let the C decoder find their end.
+        try:
+            return _DECODER.raw_decode(text, pos)[1]
+        except json.JSONDecodeError as exc:
+            raise JSONExtractError(str(exc)) from exc
+
+    match = _SKIP_CONTAINER.match(text, pos)
+    if match is not None:
+        return match.end()
+
+    # Nested deeper than the pattern handles: walk the brackets one by one.
+    depth = 0
+    while True:
+        match = _SKIP_TOKEN.search(text, pos)
+        if match is None:
+            raise JSONExtractError("Unterminated JSON container.")
+        token = match.group()
+        if token == '"':
+            pos = scanstring(text, match.end())[1]
+            continue
+        pos = match.end()
+        if token in ("{", "["):
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+
+def _measure(fn, text: str, repeat: int) -> Tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from pokeapi_client import BASE_URL, POKEMON_FIELDS, _request
+
+    parser = argparse.ArgumentParser(description="Compare selective extraction with a full json.loads.")
+    parser.add_argument("source", help="a Pokémon id to fetch /pokemon/{id}/, or a path to a saved payload")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.source.isdigit():
+        text = _request(f"{BASE_URL}/pokemon/{int(args.source)}/").decode("utf-8")
+    else:
+        text = Path(args.source).read_text(encoding="utf-8")
+
+    print(f"payload: {len(text) / 1024:.1f} KiB")
+    for label, fn in (("json.loads", json.loads), ("extract", lambda raw: extract(raw, POKEMON_FIELDS))):
+        elapsed, peak = _measure(fn, text, args.repeat)
+        print(f"{label:<11} {elapsed * 1000:8.2f} ms   peak {peak / 1024:8.1f} KiB")
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Lightweight hot-path instrumentation.
+
+- `span(name, **args)`: times a block and keeps it in a bounded trace buffer.
+- `incr(name, n)`: monotonically increasing counters (cache hits, bytes, ...).
+- `gauge_add(name, delta)`: up/down values such as in-flight requests.
+- `observe(name, seconds)`: latency samples summarised as percentiles.
+- `register_cache(name, fn)`: reports an `lru_cache`'s hits and misses.
+
+`export_jsonl(path)` writes spans and a final snapshot as JSON lines;
+`export_chrome_trace(path)` writes a file for chrome://tracing or Perfetto.
+Recording is on by default and costs a clock read and a deque append per span;
+`set_enabled(False)` turns every call into an early return.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional
+
+MAX_SPANS = 20000
+MAX_SAMPLES = 512
+
+_enabled = True
+_lock = threading.Lock()
+_spans: Deque["Span"] = deque(maxlen=MAX_SPANS)
+_counters: Dict[str, int] = {}
+_gauges: Dict[str, int] = {}
+_samples: Dict[str, Deque[float]] = {}
+_caches: Dict[str, Callable[[], Any]] = {}
+_origin_ns = time.perf_counter_ns()
+
+
+
+class Span(NamedTuple):
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    args: Optional[Dict[str, Any]]
+
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Iterator[None]:
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _spans.append(Span(name, start, time.perf_counter_ns() - start, threading.get_ident(), args or None))
+
+
+
+def incr(name: str, n: int = 1) -> None:
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+
+def gauge_add(name: str, delta: int) -> None:
+    if _enabled:
+        with _lock:
+            _gauges[name] = _gauges.get(name, 0) + delta
+
+
+
+@contextmanager
+def in_flight(name: str) -> Iterator[None]:
+    gauge_add(name, 1)
+    try:
+        yield
+    finally:
+        gauge_add(name, -1)
+
+
+
+def observe(name: str, seconds: float) -> None:
+    if _enabled:
+        with _lock:
+            samples = _samples.get(name)
+            if samples is None:
+                samples = _samples[name] = deque(maxlen=MAX_SAMPLES)
+            samples.append(seconds)
+
+
+
+def register_cache(name: str, cached_fn: Callable[..., Any]) -> None:
+    """Report `cached_fn.cache_info()` (from `functools.lru_cache`) in snapshots."""
+    _caches[name] = cached_fn.cache_info
+
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+
+def latency_summary(name: str) -> Dict[str, Optional[float]]:
+    with _lock:
+        values = list(_samples.get(name, ()))
+    return {"count": len(values), "p50": percentile(values, 0.5), "p95": percentile(values, 0.95)}
+
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        sample_names = list(_samples)
+    caches = {}
+    for name, cache_info in _caches.items():
+        info = cache_info()
+        caches[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return {
+        "counters": counters,
+        "gauges": gauges,
+        "caches": caches,
+        "latency": {name: latency_summary(name) for name in sample_names},
+    }
+
+
+
+def reset() -> None:
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _gauges.clear()
+        _samples.clear()
+
+
+
+def export_jsonl(path: Path) -> None:
+    """One line per recorded span, then one line with the counter/gauge/cache/latency snapshot."""
+    spans = list(_spans)
+    with open(path, "w", encoding="utf-8") as handle:
+        for item in spans:
+            record = {
+                "type": "span",
+                "name": item.name,
+                "start_ms": (item.start_ns - _origin_ns) / 1e6,
+                "duration_ms": item.duration_ns / 1e6,
+                "thread": item.thread_id,
+            }
+            if item.args:
+                record["args"] = item.args
+            handle.write(json.dumps(record, default=str) + "\n")
+        handle.write(json.dumps({"type": "snapshot", **snapshot()}, default=str) + "\n")
+
+
+
+def export_chrome_trace(path: Path) -> None:
+    """Complete ("X") events plus counter ("C") events, in the Trace Event Format."""
+    pid = os.getpid()
+    events: List[Dict[str, Any]] = []
+    for item in list(_spans):
+        event = {
+            "name": item.name,
+            "ph": "X",
+            "ts": (item.start_ns - _origin_ns) / 1000,
+            "dur": item.duration_ns / 1000,
+            "pid": pid,
+            "tid": item.thread_id,
+        }
+        if item.args:
+            event["args"] = item.args
+        events.append(event)
+
+    now_us = (time.perf_counter_ns() - _origin_ns) / 1000
+    for name, value in snapshot()["counters"].items():
+        events.append({"name": name, "ph": "C", "ts": now_us, "pid": pid, "args": {"value": value}})
+
+    Path(path).write_text(json.dumps({"traceEvents": events}, default=str), encoding="utf-8")
+
+
+
+def export(path: Path) -> None:
+    """Write a Chrome trace for `.json` paths and JSON lines for anything else."""
+    if Path(path).suffix.lower() == ".json":
+        export_chrome_trace(path)
+    else:
+        export_jsonl(path)
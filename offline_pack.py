@@ -0,0 +1,200 @@
+"""
+Offline Kanto data pack.
+
+Build once with network access:
+
+    python offline_pack.py build kanto.pack
+
+and run the Pokédex from the pack without any HTTP requests:
+
+    python main.py --offline kanto.pack
+
+Layout: a fixed header, the raw blobs back to back, then a small JSON index
+mapping keys to (offset, length). The reader maps the file with mmap and only
+touches the bytes of the entry that is asked for.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pokemon_models import PokemonDetails, PokemonSummary
+
+MAGIC = b"PKDXPACK"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIQQ")
+
+LIST_KEY = "list"
+TYPES_KEY = "types"
+
+
+
+def details_key(pokemon_id: int) -> str:
+    return f"details/{pokemon_id}"
+
+
+
+def asset_key(url: str) -> str:
+    return f"asset/{url}"
+
+
+
+class OfflinePackError(Exception):
+    """Raised when a data pack is missing, corrupt, or does not contain an entry."""
+
+
+
+class OfflinePack:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        try:
+            self._file = open(self.path, "rb")
+        except OSError as exc:
+            raise OfflinePackError(f"Could not open data pack {self.path}: {exc}") from exc
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error, OSError) as exc:
+            self._file.close()
+            raise OfflinePackError(f"{self.path} is not a Pokédex data pack.") from exc
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise OfflinePackError(f"{self.path} is not a version {FORMAT_VERSION} Pokédex data pack.")
+
+        try:
+            raw_index = self._map[index_offset:index_offset + index_length]
+            self._index: Dict[str, Tuple[int, int]] = {
+                key: (span[0], span[1]) for key, span in json.loads(raw_index.decode("utf-8")).items()
+            }
+        except (ValueError, UnicodeDecodeError) as exc:
+            self.close()
+            raise OfflinePackError(f"{self.path} has a corrupt index.") from exc
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def read(self, key: str) -> bytes:
+        span = self._index.get(key)
+        if span is None:
+            raise OfflinePackError(f"'{key}' is not in the data pack.")
+        offset, length = span
+        return self._map[offset:offset + length]
+
+    def read_json(self, key: str) -> Any:
+        return json.loads(self.read(key).decode("utf-8"))
+
+    def get_pokemon_list(self) -> List[PokemonSummary]:
+        return [PokemonSummary.from_dict(entry) for entry in self.read_json(LIST_KEY)]
+
+    def get_details(self, pokemon_id: int) -> PokemonDetails:
+        return PokemonDetails.from_dict(self.read_json(details_key(pokemon_id)))
+
+    def get_type_relations(self) -> Dict[str, Dict[str, float]]:
+        return self.read_json(TYPES_KEY)
+
+    def get_asset(self, url: str) -> Optional[bytes]:
+        key = asset_key(url)
+        return self.read(key) if key in self._index else None
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+
+class PackWriter:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+        self._index: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, key: str, data: bytes) -> None:
+        if key in self._index:
+            return
+        self._index[key] = (self._file.tell(), len(data))
+        self._file.write(data)
+
+    def add_json(self, key: str, value: Any) -> None:
+        self.add(key, json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+    def finish(self) -> None:
+        index = json.dumps(self._index, separators=(",", ":")).encode("utf-8")
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, index_offset, len(index)))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+
+def build_pack(path: Path, progress: Optional[Callable[[int, int, str], None]] = None) -> int:
+    """Fetch the whole Kanto dex with the online client and write it to `path`."""
+    from pokeapi_client import (
+        PokeAPIError,
+        get_cry_bytes,
+        get_image_bytes,
+        get_original_151,
+        get_pokemon_details,
+        get_type_relations,
+    )
+
+    pokemon = get_original_151()
+    writer = PackWriter(path)
+    try:
+        writer.add_json(LIST_KEY, [entry.to_dict() for entry in pokemon])
+        writer.add_json(TYPES_KEY, get_type_relations())
+        for position, entry in enumerate(pokemon, start=1):
+            details = get_pokemon_details(entry.id)
+            writer.add_json(details_key(entry.id), details.to_dict())
+
+            for url, fetch in ((details.image_url, get_image_bytes), (details.cry_url, get_cry_bytes)):
+                if not url:
+                    continue
+                try:
+                    writer.add(asset_key(url), fetch(url))
+                except PokeAPIError:
+                    pass
+
+            if progress is not None:
+                progress(position, len(pokemon), entry.name)
+        writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+    return len(pokemon)
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the offline Pokédex data pack.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="download every Kanto entry into a single pack file")
+    build.add_argument("output", type=Path)
+    args = parser.parse_args(argv)
+
+    def report(done: int, total: int, name: str) -> None:
+        print(f"[{done:3}/{total}] {name}", file=sys.stderr)
+
+    count = build_pack(args.output, progress=report)
+    print(f"Wrote {count} entries to {args.output}")
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+import pokeapi_client
+from pokeapi_client import PokeAPIError
+from pokemon_models import PokemonDetails, PokemonSummary
+from request_scheduler import InFlightTable
+
+DEFAULT_CONCURRENCY = 8
+
+T = TypeVar("T")
+SpriteURLCallback = Callable[[Optional[str]], Any]
+
+
+
+def _uses_rest() -> bool:
+    # The offline pack and the GraphQL backend have their own fetch paths in pokeapi_client.
+    return pokeapi_client.get_offline_pack() is None and pokeapi_client.get_backend() == "rest"
+
+
+
+class AsyncPokeAPIClient:
+    """
+    Async counterpart of the `pokeapi_client` functions.
+
+    Independent requests (the details of many entries, and within one entry the
+    `/pokemon/` and `/pokemon-species/` payloads and the sprite) are issued
+    concurrently. At most `concurrency` blocking fetches run at once; each one goes
+    through the same record caches, pooled transport and persistent cache as the
+    synchronous client. Passing the selection scheduler's `InFlightTable` lets
+    these fetches join identical ones made through `RequestScheduler.coalesce`.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, inflight: Optional[InFlightTable] = None) -> None:
+        self.concurrency = concurrency
+        self.inflight = inflight if inflight is not None else InFlightTable()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pokeapi-fetch")
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def get_original_151(self) -> List[PokemonSummary]:
+        return await self._run(pokeapi_client.get_original_151)
+
+    async def get_image_bytes(self, image_url: str) -> bytes:
+        return await self.inflight.run_async(image_url, lambda: self._run(pokeapi_client.get_image_bytes, image_url))
+
+    async def get_pokemon_details(self, pokemon_id: int) -> PokemonDetails:
+        return await self._get_details(pokemon_id)
+
+    async def get_many_details(self, pokemon_ids: Iterable[int]) -> List[PokemonDetails]:
+        if not _uses_rest():
+            return await self._run(pokeapi_client.get_many_details, list(pokemon_ids))
+        return list(await asyncio.gather(*(self.get_pokemon_details(pokemon_id) for pokemon_id in pokemon_ids)))
+
+    async def get_entry(self, pokemon_id: int) -> Tuple[PokemonDetails, Optional[bytes]]:
+        """
+        Details plus sprite bytes for one entry. The sprite request starts as soon as
+        the `/pokemon/` payload names it, so it overlaps the species request.
+        A missing sprite is reported as None rather than failing the entry.
+        """
+        sprite: "Optional[asyncio.Future[Optional[bytes]]]" = None
+
+        def start_sprite(image_url: Optional[str]) -> "asyncio.Future[Optional[bytes]]":
+            nonlocal sprite
+            if sprite is None:
+                sprite = asyncio.ensure_future(self._get_sprite_or_none(image_url))
+            return sprite
+
+        try:
+            details = await self._get_details(pokemon_id, start_sprite)
+        except BaseException:
+            if sprite is not None:
+                sprite.cancel()
+            raise
+
+        # A cached record, or a fetch this call joined, never reported the sprite URL.
+        return details, await start_sprite(details.image_url)
+
+    async def _get_details(
+        self, pokemon_id: int, on_sprite_url: Optional[SpriteURLCallback] = None
+    ) -> PokemonDetails:
+        cached = pokeapi_client.get_pokemon_details.cached(pokemon_id)
+        if cached is not None:
+            return cached
+        return await self.inflight.run_async(
+            ("details", pokemon_id),
+            lambda: self._load_details(pokemon_id, on_sprite_url),
+        )
+
+    async def _load_details(
+        self, pokemon_id: int, on_sprite_url: Optional[SpriteURLCallback]
+    ) -> PokemonDetails:
+        if not _uses_rest():
+            return await self._run(pokeapi_client.get_pokemon_details, pokemon_id)
+
+        species = asyncio.ensure_future(self._run(pokeapi_client.get_species_payload, pokemon_id))
+        try:
+            pokemon = await self._run(pokeapi_client.get_pokemon_payload, pokemon_id)
+        except BaseException:
+            species.cancel()
+            raise
+
+        if on_sprite_url is not None:
+            on_sprite_url(pokeapi_client.get_sprite_url(pokemon))
+        details = pokeapi_client.build_details(pokemon, await species)
+        return pokeapi_client.get_pokemon_details.remember(pokemon_id, details)
+
+    async def _get_sprite_or_none(self, image_url: Optional[str]) -> Optional[bytes]:
+        if not image_url:
+            return None
+        try:
+            return await self.get_image_bytes(image_url)
+        except PokeAPIError:
+            return None
+
+
+
+class EventLoopThread:
+    """Runs an asyncio event loop on a daemon thread so Tk code can submit coroutines to it."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="pokeapi-async", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine: Awaitable[T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        """Block the calling (non-loop) thread until the coroutine finishes."""
+        return self.submit(coroutine).result()
+
+    def stop(self) -> None:
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
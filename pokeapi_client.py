@@ -1,87 +1,504 @@
 import json
-import urllib.error
-import urllib.request
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
-
-BASE_URL = "https://pokeapi.co/api/v2"
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+from urllib.parse import urlsplit
+
+import metrics
+from asset_store import AssetStore
+from http_cache import HTTPCache
+from http_transport import TransportError, get_default_transport
+from json_extract import JSONExtractError, Spec, extract
+from offline_pack import OfflinePack, OfflinePackError
+from pokemon_models import BaseStats, PokemonDetails, PokemonSummary, intern_all
+from record_cache import record_cache
+from resilience import NEGATIVE_STATUSES, RETRYABLE_STATUSES, CircuitBreakers, NegativeCache, RetryPolicy
+from type_chart import TYPES, Relations, TypeChart
+
+BASE_URL = os.environ.get("POKEDEX_BASE_URL") or "https://pokeapi.co/api/v2"
 USER_AGENT = "TkinterPokedex/1.0"
-TIMEOUT_SECONDS = 15
+CACHE_DIR = Path(os.environ.get("POKEDEX_CACHE_DIR") or Path(tempfile.gettempdir()) / "tkinter_pokedex_cache")
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+ASSET_STORE_MAX_BYTES = 128 * 1024 * 1024
+BACKENDS = ("rest", "graphql")
+# Expired responses younger than this (past their expiry) are served at once and refreshed in the background.
+STALE_WHILE_REVALIDATE_SECONDS = 7 * 24 * 60 * 60
+REVALIDATE_WORKERS = 2
+SPECIES_PAGE_SIZE = 200
+TYPE_FETCH_WORKERS = 6
+PAYLOAD_FETCH_WORKERS = 8
+# Per-entry record caches hold a whole National Dex (1025 entries) so a full prefetch is never evicted.
+RECORD_CACHE_SIZE = 2048
+# After a failed GraphQL query, dex lists and details come from REST for this long.
+GRAPHQL_RETRY_SECONDS = 60.0
+NATIONAL_DEX = "national"
+# Dexes `iter_pokedex` knows by name, in menu order, with their display labels.
+DEXES = {
+    NATIONAL_DEX: "National",
+    "kanto": "Kanto",
+    "original-johto": "Johto",
+    "hoenn": "Hoenn",
+    "original-sinnoh": "Sinnoh",
+    "original-unova": "Unova",
+    "kalos-central": "Kalos",
+    "original-alola": "Alola",
+    "galar": "Galar",
+    "paldea": "Paldea",
+}
+
+# The parts of `/pokemon/{id}/` and `/pokemon-species/{id}/` that `build_details` reads.
+# Everything else (moves, game indices, the per-version sprite tree, ...) is skipped unparsed.
+POKEMON_FIELDS: Spec = {
+    "id": True,
+    "name": True,
+    "height": True,
+    "weight": True,
+    "types": True,
+    "abilities": True,
+    "stats": True,
+    "cries": True,
+    "sprites": {
+        "front_default": True,
+        "versions": {"generation-i": {"red-blue": {"front_default": True}}},
+    },
+}
+SPECIES_FIELDS: Spec = {
+    "genera": True,
+    "flavor_text_entries": True,
+}
+POKEDEX_FIELDS: Spec = {"pokemon_entries": True}
+SPECIES_LISTING_FIELDS: Spec = {"next": True, "results": True}
+TYPE_FIELDS: Spec = {"damage_relations": {"double_damage_to": True, "half_damage_to": True, "no_damage_to": True}}
+_DAMAGE_MULTIPLIERS = (("double_damage_to", 2.0), ("half_damage_to", 0.5), ("no_damage_to", 0.0))
 
 
 class PokeAPIError(Exception):
     """Raised when the PokéAPI request fails."""
 
 
+class NotFoundError(PokeAPIError):
+    """Raised for 404/410 answers, which are remembered for a while instead of re-requested."""
 
-def _request(url: str) -> bytes:
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json, image/png, image/*;q=0.9, */*;q=0.8",
-        },
-    )
 
+_offline_pack: Optional[OfflinePack] = None
+_backend = os.environ.get("POKEDEX_BACKEND", "rest").lower()
+_graphql_backend = None
+_graphql_retry_at = 0.0
+_retry_policy = RetryPolicy()
+_breakers = CircuitBreakers()
+_not_found = NegativeCache()
+_revalidation_queue: "queue.Queue[str]" = queue.Queue()
+_revalidating: Set[str] = set()
+_revalidate_lock = threading.Lock()
+_revalidate_threads: List[threading.Thread] = []
+
+
+
+def enable_offline_mode(pack_path: Path) -> None:
+    """Serve every public function from a prebuilt data pack instead of the network."""
+    global _offline_pack
     try:
-        with urllib.request.urlopen(req, timeout=TIMEOUT_SECONDS) as response:
-            return response.read()
-    except urllib.error.HTTPError as exc:
-        raise PokeAPIError(f"HTTP {exc.code} while requesting {url}") from exc
-    except urllib.error.URLError as exc:
-        raise PokeAPIError(f"Network error while requesting {url}: {exc.reason}") from exc
+        pack = OfflinePack(pack_path)
+    except OfflinePackError as exc:
+        raise PokeAPIError(str(exc)) from exc
+
+    disable_offline_mode()
+    _offline_pack = pack
+
+
+
+def disable_offline_mode() -> None:
+    global _offline_pack
+    if _offline_pack is not None:
+        _offline_pack.close()
+        _offline_pack = None
+    get_original_151.cache_clear()
+    get_pokedex.cache_clear()
+    get_type_chart.cache_clear()
+    get_pokemon_details.cache_clear()
+    get_image_bytes.cache_clear()
+
+
+
+def get_offline_pack() -> Optional[OfflinePack]:
+    return _offline_pack
+
+
+
+def set_backend(name: str) -> None:
+    """Choose how dex lists and details are fetched: "rest" (default) or "graphql"."""
+    global _backend, _graphql_retry_at
+    name = name.lower()
+    if name not in BACKENDS:
+        raise PokeAPIError(f"Unknown backend {name!r}; expected one of {', '.join(BACKENDS)}.")
+    _backend = name
+    _graphql_retry_at = 0.0
+    get_original_151.cache_clear()
+    get_pokedex.cache_clear()
+    get_type_chart.cache_clear()
+    get_pokemon_details.cache_clear()
+
+
+
+def get_backend() -> str:
+    return _backend
+
+
+
+def _get_graphql_backend():
+    global _graphql_backend
+    if _graphql_backend is None:
+        from pokeapi_graphql import GraphQLBackend
+
+        _graphql_backend = GraphQLBackend()
+    return _graphql_backend
+
+
+
+def _use_graphql() -> bool:
+    return _backend == "graphql" and time.monotonic() >= _graphql_retry_at
+
+
+
+def _fall_back_to_rest() -> None:
+    # PokéAPI's GraphQL endpoint is a beta; while it is failing, REST answers the same questions.
+    global _graphql_retry_at
+    metrics.incr("graphql.rest_fallbacks")
+    _graphql_retry_at = time.monotonic() + GRAPHQL_RETRY_SECONDS
+
+
 
+@lru_cache(maxsize=1)
+def _get_payload_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=PAYLOAD_FETCH_WORKERS, thread_name_prefix="pokeapi-payload")
+
+
+
+@lru_cache(maxsize=1)
+def get_http_cache() -> HTTPCache:
+    """The persistent response cache, shared with the GraphQL backend."""
+    return HTTPCache(CACHE_DIR / "http_cache.sqlite3", max_bytes=CACHE_MAX_BYTES)
+
+
+
+@lru_cache(maxsize=1)
+def get_asset_store() -> AssetStore:
+    """On-disk store for sprite and cry files, shared with `cry_player`."""
+    return AssetStore(CACHE_DIR / "assets", max_bytes=ASSET_STORE_MAX_BYTES)
+
+
+
+def fetch(url: str, headers: Dict[str, str], method: str = "GET", body: Optional[bytes] = None):
+    """
+    Send one logical request, retrying network errors and retryable statuses with
+    jittered backoff inside the retry deadline. Fails fast while the host's
+    circuit breaker is open. Bypasses the HTTP cache; backends that cache their
+    own requests (GraphQL) call this directly.
+    """
+    breaker = _breakers.for_url(url)
+    started = time.monotonic()
+    delays = _retry_policy.delays()
+    while True:
+        if not breaker.allow():
+            metrics.incr("http.circuit_open")
+            raise PokeAPIError(
+                f"{urlsplit(url).netloc} is not responding; trying again in {breaker.retry_in():.0f} s."
+            )
+
+        retry_after = None
+        try:
+            with metrics.span("http.request", url=url), metrics.in_flight("http.in_flight"):
+                response = get_default_transport().request(method, url, headers=headers, body=body)
+        except TransportError as exc:
+            breaker.record_failure()
+            metrics.incr("http.errors")
+            failure, cause = PokeAPIError(f"Network error while requesting {url}: {exc}"), exc
+        else:
+            metrics.incr("http.requests")
+            metrics.incr("http.bytes", len(response.body))
+            if response.status not in RETRYABLE_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            failure, cause = PokeAPIError(f"HTTP {response.status} while requesting {url}"), None
+            retry_after = RetryPolicy.retry_after(response.headers.get("Retry-After"), _retry_policy.max_delay)
+
+        delay = next(delays, None)
+        if retry_after is not None and delay is not None:
+            delay = retry_after
+        if delay is None or time.monotonic() - started + delay > _retry_policy.deadline:
+            raise failure from cause
+        metrics.incr("http.retries")
+        time.sleep(delay)
+
+
+
+def _request(url: str) -> bytes:
+    """
+    Response body for `url`, served from the HTTP cache when possible.
+
+    Fresh entries are returned as is. Expired ones within
+    `STALE_WHILE_REVALIDATE_SECONDS` are returned immediately while a
+    background worker revalidates them; older ones are revalidated inline, and
+    still served if the network fails. 404/410 answers are remembered by the
+    negative cache.
+    """
+    status = _not_found.get(url)
+    if status is not None:
+        metrics.incr("negative_cache.hits")
+        raise NotFoundError(f"HTTP {status} while requesting {url}")
+
+    cache = get_http_cache()
+    cached = cache.lookup(url)
+    if cached is not None and cached.is_fresh():
+        metrics.incr("http_cache.hits")
+        return cached.body
+    if cached is not None and time.time() < cached.expires_at + STALE_WHILE_REVALIDATE_SECONDS:
+        metrics.incr("http_cache.stale_served")
+        _revalidate_in_background(url)
+        return cached.body
+    metrics.incr("http_cache.misses" if cached is None else "http_cache.revalidations")
 
-@lru_cache(maxsize=512)
-def _get_json(url: str) -> Dict[str, Any]:
     try:
-        raw = _request(url)
-        return json.loads(raw.decode("utf-8"))
-    except json.JSONDecodeError as exc:
+        return _revalidate(url, cached)
+    except NotFoundError:
+        raise
+    except PokeAPIError:
+        if cached is None:
+            raise
+        metrics.incr("http_cache.stale_on_error")
+        return cached.body
+
+
+
+def _revalidate(url: str, cached) -> bytes:
+    cache = get_http_cache()
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": "application/json, image/png, image/*;q=0.9, */*;q=0.8",
+    }
+    if cached is not None:
+        headers.update(cached.validator_headers())
+
+    response = fetch(url, headers)
+
+    if response.status == 304 and cached is not None:
+        cache.refresh(url, response.headers)
+        return cached.body
+    if response.status in NEGATIVE_STATUSES:
+        _not_found.put(url, response.status)
+        cache.delete(url)
+        raise NotFoundError(f"HTTP {response.status} while requesting {url}")
+    if response.status >= 400:
+        raise PokeAPIError(f"HTTP {response.status} while requesting {url}")
+
+    cache.store(url, response.body, response.headers)
+    return response.body
+
+
+
+def _revalidate_in_background(url: str) -> None:
+    with _revalidate_lock:
+        if url in _revalidating:
+            return
+        _revalidating.add(url)
+        if len(_revalidate_threads) < REVALIDATE_WORKERS:
+            thread = threading.Thread(target=_revalidation_worker, name="revalidate", daemon=True)
+            thread.start()
+            _revalidate_threads.append(thread)
+    _revalidation_queue.put(url)
+
+
+
+def _revalidation_worker() -> None:
+    while True:
+        url = _revalidation_queue.get()
+        try:
+            cached = get_http_cache().lookup(url)
+            if cached is None or not cached.is_fresh():
+                _revalidate(url, cached)
+        except PokeAPIError:
+            # The stale copy stays in place; the next read past expiry tries again.
+            pass
+        finally:
+            with _revalidate_lock:
+                _revalidating.discard(url)
+
+
+def _get_json(url: str, fields: Optional[Spec] = None) -> Dict[str, Any]:
+    """
+    Fetch and parse a JSON resource. With `fields`, only those paths are materialized.
+    Deliberately uncached: callers reduce the payload to a compact record and
+    cache that, so the raw JSON tree can be freed straight away.
+    """
+    raw = _request(url)
+    try:
+        with metrics.span("json.parse", url=url, selective=fields is not None):
+            if fields is not None:
+                return extract(raw, fields)
+            return json.loads(raw.decode("utf-8"))
+    except (json.JSONDecodeError, JSONExtractError, UnicodeDecodeError) as exc:
         raise PokeAPIError(f"Invalid JSON returned from {url}") from exc
 
 
+def iter_pokedex(dex: str = "kanto", page_size: int = SPECIES_PAGE_SIZE) -> Iterator[List[PokemonSummary]]:
+    """
+    Stream a dex as lists of at most `page_size` `PokemonSummary` rows, in dex order.
+
+    The National Dex walks the paginated `/pokemon-species/?limit=&offset=`
+    listing, so the first page arrives after one small request. Regional dexes
+    come in one `/pokedex/{name}/` payload and are handed out in slices. Ids are
+    national numbers, which is what `get_pokemon_details` expects.
+    """
+    if _offline_pack is not None:
+        if dex != "kanto":
+            raise PokeAPIError("The offline data pack only holds the Kanto dex.")
+        yield from _pages(_offline_pack.get_pokemon_list(), page_size)
+        return
+
+    pokedex = None
+    if _use_graphql():
+        try:
+            pokedex = _get_graphql_backend().get_pokedex(dex)
+        except PokeAPIError:
+            _fall_back_to_rest()
+
+    if pokedex is None and dex == NATIONAL_DEX:
+        url: Optional[str] = f"{BASE_URL}/pokemon-species/?limit={page_size}&offset=0"
+        while url:
+            listing = _get_json(url, SPECIES_LISTING_FIELDS)
+            yield _summaries(listing.get("results", []))
+            url = listing.get("next")
+        return
+
+    if pokedex is None:
+        pokedex = _get_json(f"{BASE_URL}/pokedex/{dex}/", POKEDEX_FIELDS)
+    species = [entry.get("pokemon_species") or {} for entry in pokedex.get("pokemon_entries", [])]
+    yield from _pages(_summaries(species), page_size)
+
+
+
+def _pages(pokemon: List[PokemonSummary], page_size: int) -> Iterator[List[PokemonSummary]]:
+    for start in range(0, len(pokemon), page_size):
+        yield pokemon[start:start + page_size]
+
+
+
+def _summaries(species: List[Dict[str, Any]]) -> List[PokemonSummary]:
+    """Summaries for `{name, url}` species references (`{id, name}` from GraphQL); malformed ones are skipped."""
+    pokemon = []
+    for entry in species:
+        name = entry.get("name")
+        pokemon_id = entry.get("id")
+        if pokemon_id is None:
+            tail = (entry.get("url") or "").rstrip("/").rsplit("/", 1)[-1]
+            pokemon_id = int(tail) if tail.isdigit() else None
+        if name and isinstance(pokemon_id, int):
+            pokemon.append(PokemonSummary(pokemon_id, name.replace("-", " ").title(), name))
+    return pokemon
+
+
+
+@lru_cache(maxsize=len(DEXES))
+def get_pokedex(dex: str = "kanto") -> List[PokemonSummary]:
+    """The whole of `iter_pokedex(dex)` as one list."""
+    return [pokemon for page in iter_pokedex(dex) for pokemon in page]
+
+
+
 @lru_cache(maxsize=1)
-def get_original_151() -> List[Dict[str, Any]]:
+def get_original_151() -> List[PokemonSummary]:
     """
-    Fetch the original 151 Pokémon from the Kanto Pokédex.
+    The original 151 Pokémon from the Kanto Pokédex.
     Returns a sorted list like:
-    [{"id": 1, "name": "Bulbasaur"}, ...]
+    [PokemonSummary(id=1, name="Bulbasaur", api_name="bulbasaur"), ...]
     """
-    pokedex = _get_json(f"{BASE_URL}/pokedex/kanto/")
-    entries = pokedex.get("pokemon_entries", [])
+    return sorted((pokemon for pokemon in get_pokedex("kanto") if 1 <= pokemon.id <= 151), key=lambda p: p.id)
 
-    pokemon = []
-    for entry in entries:
-        entry_number = entry.get("entry_number")
-        species = entry.get("pokemon_species", {})
-        name = species.get("name", "unknown")
-
-        if isinstance(entry_number, int) and 1 <= entry_number <= 151:
-            pokemon.append(
-                {
-                    "id": entry_number,
-                    "name": name.replace("-", " ").title(),
-                    "api_name": name,
-                }
-            )
 
-    pokemon.sort(key=lambda p: p["id"])
-    return pokemon
 
+@record_cache(maxsize=RECORD_CACHE_SIZE)
+def get_pokemon_details(pokemon_id: int) -> PokemonDetails:
+    """
+    One entry's record. Other fetch paths can peek at and fill the record cache
+    with `get_pokemon_details.cached(pokemon_id)` and `.remember(pokemon_id, details)`.
+    """
+    if _offline_pack is not None:
+        try:
+            return _offline_pack.get_details(pokemon_id)
+        except OfflinePackError as exc:
+            raise PokeAPIError(f"#{pokemon_id:03} is not in the offline data pack.") from exc
+
+    if _use_graphql():
+        try:
+            return _get_graphql_backend().get_details(pokemon_id)
+        except NotFoundError:
+            raise
+        except PokeAPIError:
+            _fall_back_to_rest()
+
+    # The two payloads are independent, so the species one is fetched alongside.
+    species = _get_payload_pool().submit(get_species_payload, pokemon_id)
+    try:
+        pokemon = get_pokemon_payload(pokemon_id)
+    except BaseException:
+        species.cancel()
+        raise
 
-@lru_cache(maxsize=256)
-def get_pokemon_details(pokemon_id: int) -> Dict[str, Any]:
-    pokemon = _get_json(f"{BASE_URL}/pokemon/{pokemon_id}/")
-    species = _get_json(f"{BASE_URL}/pokemon-species/{pokemon_id}/")
+    return build_details(pokemon, species.result())
 
-    types = [t["type"]["name"].title() for t in pokemon.get("types", [])]
-    abilities = [a["ability"]["name"].replace("-", " ").title() for a in pokemon.get("abilities", [])]
 
-    stats = {
-        stat_row["stat"]["name"].replace("-", " ").title(): stat_row["base_stat"]
-        for stat_row in pokemon.get("stats", [])
-    }
+
+def get_pokemon_payload(pokemon_id: int) -> Dict[str, Any]:
+    """The trimmed REST `/pokemon/{id}/` payload that `build_details` reads."""
+    return _get_json(f"{BASE_URL}/pokemon/{pokemon_id}/", POKEMON_FIELDS)
+
+
+
+def get_species_payload(pokemon_id: int) -> Dict[str, Any]:
+    """The trimmed REST `/pokemon-species/{id}/` payload that `build_details` reads."""
+    return _get_json(f"{BASE_URL}/pokemon-species/{pokemon_id}/", SPECIES_FIELDS)
+
+
+
+def get_many_details(pokemon_ids: List[int]) -> List[PokemonDetails]:
+    """
+    Details for several entries, in the order given; entries that cannot be loaded are left out.
+    The GraphQL backend answers this with one query per `BATCH_SIZE` entries.
+    """
+    if _offline_pack is None and _use_graphql():
+        try:
+            found = _get_graphql_backend().get_many_details(pokemon_ids)
+        except PokeAPIError:
+            _fall_back_to_rest()
+        else:
+            return [found[pokemon_id] for pokemon_id in pokemon_ids if pokemon_id in found]
+
+    details = []
+    for pokemon_id in pokemon_ids:
+        try:
+            details.append(get_pokemon_details(pokemon_id))
+        except PokeAPIError:
+            continue
+    return details
+
+
+
+def build_details(pokemon: Dict[str, Any], species: Dict[str, Any]) -> PokemonDetails:
+    """Reduce raw `/pokemon/{id}/` and `/pokemon-species/{id}/` payloads to a `PokemonDetails` record."""
+    types = intern_all(t["type"]["name"].title() for t in pokemon.get("types", []))
+    abilities = intern_all(a["ability"]["name"].replace("-", " ").title() for a in pokemon.get("abilities", []))
+
+    stats = BaseStats.from_mapping(
+        {stat_row["stat"]["name"]: stat_row["base_stat"] for stat_row in pokemon.get("stats", [])}
+    )
 
     genera = species.get("genera", [])
     genus = next(
@@ -90,26 +507,59 @@ def get_pokemon_details(pokemon_id: int) -> Dict[str, Any]:
     )
 
     flavor_text = _pick_best_flavor_text(species.get("flavor_text_entries", []))
-    sprite_url = _get_red_blue_sprite_url(pokemon)
+    sprite_url = get_sprite_url(pokemon)
     cry_url = _get_cry_url(pokemon)
 
-    return {
-        "id": pokemon["id"],
-        "name": pokemon["name"].replace("-", " ").title(),
-        "height_m": pokemon.get("height", 0) / 10,
-        "weight_kg": pokemon.get("weight", 0) / 10,
-        "types": types,
-        "abilities": abilities,
-        "stats": stats,
-        "genus": genus,
-        "flavor_text": flavor_text,
-        "image_url": sprite_url,
-        "cry_url": cry_url,
-    }
+    return PokemonDetails(
+        id=pokemon["id"],
+        name=pokemon["name"].replace("-", " ").title(),
+        height_m=pokemon.get("height", 0) / 10,
+        weight_kg=pokemon.get("weight", 0) / 10,
+        types=types,
+        abilities=abilities,
+        stats=stats,
+        genus=sys.intern(genus),
+        flavor_text=flavor_text,
+        image_url=sprite_url,
+        cry_url=cry_url,
+    )
+
+
+
+def get_type_relations() -> Relations:
+    """
+    `{attacking: {defending: multiplier}}` for every multiplier other than 1x,
+    from the damage relations of the 18 `/type/{name}/` resources.
+    """
+    if _offline_pack is not None:
+        try:
+            return _offline_pack.get_type_relations()
+        except OfflinePackError as exc:
+            raise PokeAPIError("This offline data pack has no type chart; rebuild it to get one.") from exc
+
+    def fetch_relations(type_name: str) -> Dict[str, float]:
+        relations = _get_json(f"{BASE_URL}/type/{type_name.lower()}/", TYPE_FIELDS).get("damage_relations", {})
+        return {
+            target["name"].title(): multiplier
+            for key, multiplier in _DAMAGE_MULTIPLIERS
+            for target in relations.get(key, [])
+            if target.get("name")
+        }
+
+    with ThreadPoolExecutor(max_workers=TYPE_FETCH_WORKERS, thread_name_prefix="type-chart") as pool:
+        return dict(zip(TYPES, pool.map(fetch_relations, TYPES)))
+
+
+
+@lru_cache(maxsize=1)
+def get_type_chart() -> TypeChart:
+    """The compiled 18 x 18 type chart. Fetched once per session (and kept in the HTTP cache)."""
+    return TypeChart.from_relations(get_type_relations())
 
 
 
-def _get_red_blue_sprite_url(pokemon: Dict[str, Any]) -> Optional[str]:
+def get_sprite_url(pokemon: Dict[str, Any]) -> Optional[str]:
+    """The Red/Blue sprite from a `/pokemon/` payload, falling back to the default sprite."""
     sprites = pokemon.get("sprites", {})
     version_sprites = sprites.get("versions", {}).get("generation-i", {}).get("red-blue", {})
 
@@ -143,8 +593,58 @@ def _clean_flavor_text(text: str) -> str:
     return " ".join(text.replace("\n", " ").replace("\f", " ").split())
 
 
-@lru_cache(maxsize=256)
+@lru_cache(maxsize=RECORD_CACHE_SIZE)
 def get_image_bytes(image_url: str) -> bytes:
     if not image_url:
         raise PokeAPIError("No image URL was provided.")
-    return _request(image_url)
+    return _get_asset(image_url)
+
+
+
+def get_cry_bytes(cry_url: str) -> bytes:
+    if not cry_url:
+        raise PokeAPIError("No cry URL was provided.")
+    return _get_asset(cry_url)
+
+
+
+def _get_asset(url: str) -> bytes:
+    if _offline_pack is not None:
+        data = _offline_pack.get_asset(url)
+        if data is None:
+            raise PokeAPIError(f"{url} is not in the offline data pack.")
+        return data
+
+    store = get_asset_store()
+    data = store.get(url)
+    if data is not None:
+        metrics.incr("asset_store.hits")
+        return data
+    metrics.incr("asset_store.misses")
+
+    # Sprite and cry URLs point at immutable files, so the asset store replaces the HTTP cache for them.
+    response = fetch(url, {"User-Agent": USER_AGENT, "Accept": "image/png, audio/ogg, */*;q=0.8"})
+    if response.status >= 400:
+        raise PokeAPIError(f"HTTP {response.status} while requesting {url}")
+    store.put(url, response.body)
+    return response.body
+
+
+
+def get_asset_path(url: str) -> Path:
+    """Local file holding the asset at `url`, downloading (or unpacking) it on first use."""
+    store = get_asset_store()
+    path = store.path_for(url)
+    if path is None:
+        path = store.put(url, _get_asset(url))
+    if path is None:
+        raise PokeAPIError(f"Could not store {url} on disk.")
+    return path
+
+
+
+metrics.register_cache("get_original_151", get_original_151)
+metrics.register_cache("get_pokedex", get_pokedex)
+metrics.register_cache("get_type_chart", get_type_chart)
+metrics.register_cache("get_pokemon_details", get_pokemon_details)
+metrics.register_cache("get_image_bytes", get_image_bytes)
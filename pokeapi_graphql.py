@@ -0,0 +1,256 @@
+"""
+GraphQL batch backend for `pokeapi_client`.
+
+The REST API needs two requests per entry (`/pokemon/` and `/pokemon-species/`).
+PokéAPI's GraphQL endpoint returns the same fields for many species at once,
+so this backend loads the dex list in one query and details in pages of
+`BATCH_SIZE` species. Rows are reshaped into the REST payload layout and
+handed to `pokeapi_client.build_details`, so both backends produce identical
+`PokemonDetails` records.
+
+Enable it with `POKEDEX_BACKEND=graphql` (or `python main.py --backend graphql`);
+`POKEDEX_GRAPHQL_URL` points it at another endpoint such as `fixture_server.py`.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import metrics
+from pokeapi_client import (
+    RECORD_CACHE_SIZE,
+    USER_AGENT,
+    NotFoundError,
+    PokeAPIError,
+    build_details,
+    fetch,
+    get_http_cache,
+)
+from pokemon_models import PokemonDetails
+from record_cache import RecordCache
+from resilience import NegativeCache
+
+GRAPHQL_URL = os.environ.get("POKEDEX_GRAPHQL_URL") or "https://beta.pokeapi.co/graphql/v1beta"
+BATCH_SIZE = 50
+
+DEX_LIST_QUERY = """
+query DexList($dex: String!) {
+  entries: pokemon_v2_pokemondexnumber(
+    where: {pokemon_v2_pokedex: {name: {_eq: $dex}}}
+    order_by: {pokedex_number: asc}
+  ) {
+    pokedex_number
+    species: pokemon_v2_pokemonspecy { id name }
+  }
+}
+"""
+
+SPECIES_BATCH_QUERY = """
+query SpeciesBatch($ids: [Int!]) {
+  species: pokemon_v2_pokemonspecies(where: {id: {_in: $ids}}, order_by: {id: asc}) {
+    id
+    genera: pokemon_v2_pokemonspeciesnames(where: {pokemon_v2_language: {name: {_eq: "en"}}}) { genus }
+    flavor_texts: pokemon_v2_pokemonspeciesflavortexts(where: {pokemon_v2_language: {name: {_eq: "en"}}}) {
+      flavor_text
+      version: pokemon_v2_version { name }
+    }
+    pokemon: pokemon_v2_pokemons(where: {is_default: {_eq: true}}) {
+      id
+      name
+      height
+      weight
+      types: pokemon_v2_pokemontypes(order_by: {slot: asc}) { type: pokemon_v2_type { name } }
+      abilities: pokemon_v2_pokemonabilities(order_by: {slot: asc}) { ability: pokemon_v2_ability { name } }
+      stats: pokemon_v2_pokemonstats { base_stat stat: pokemon_v2_stat { name } }
+      sprites: pokemon_v2_pokemonsprites { sprites }
+      cries: pokemon_v2_pokemoncries { cries }
+    }
+  }
+}
+"""
+
+
+
+def _first_json_blob(rows: List[Dict[str, Any]], field: str) -> Dict[str, Any]:
+    # Hasura exposes these jsonb columns either as objects or as encoded strings depending on version.
+    if not rows:
+        return {}
+    value = rows[0].get(field) or {}
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+
+def species_row_to_rest(row: Dict[str, Any]) -> Optional[tuple]:
+    """Reshape one `SpeciesBatch` row into REST-style (`pokemon`, `species`) payloads."""
+    varieties = row.get("pokemon") or []
+    if not varieties:
+        return None
+    variety = varieties[0]
+
+    pokemon = {
+        "id": variety["id"],
+        "name": variety["name"],
+        "height": variety.get("height") or 0,
+        "weight": variety.get("weight") or 0,
+        "types": variety.get("types", []),
+        "abilities": variety.get("abilities", []),
+        "stats": variety.get("stats", []),
+        "sprites": _first_json_blob(variety.get("sprites", []), "sprites"),
+        "cries": _first_json_blob(variety.get("cries", []), "cries"),
+    }
+    english = {"name": "en"}
+    species = {
+        "genera": [{"genus": genus["genus"], "language": english} for genus in row.get("genera", [])],
+        "flavor_text_entries": [
+            {"flavor_text": entry["flavor_text"], "language": english, "version": entry.get("version") or {}}
+            for entry in row.get("flavor_texts", [])
+        ],
+    }
+    return pokemon, species
+
+
+
+class GraphQLBackend:
+    """
+    Serves dex lists and details from batched GraphQL queries.
+
+    `get_details` loads the whole page of `batch_size` consecutive ids that
+    contains the requested one; concurrent callers for the same page wait for
+    a single query. Responses are kept in the persistent HTTP cache keyed by
+    the query body, records in a bounded `RecordCache`, and ids a query did not
+    return in a `NegativeCache`, so they fail without another query.
+    """
+
+    def __init__(self, url: str = GRAPHQL_URL, batch_size: int = BATCH_SIZE) -> None:
+        self.url = url
+        self.batch_size = batch_size
+        self._details: RecordCache[int, PokemonDetails] = RecordCache(RECORD_CACHE_SIZE)
+        self._not_found = NegativeCache()
+        self._loading: Dict[Any, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def query(self, operation: str, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(
+            {"operationName": operation, "query": query, "variables": variables},
+            separators=(",", ":"),
+            sort_keys=True,
+        ).encode("utf-8")
+        cache_key = f"{self.url}#{hashlib.sha256(body).hexdigest()}"
+        cache = get_http_cache()
+        cached = cache.lookup(cache_key)
+        if cached is not None and cached.is_fresh():
+            return json.loads(cached.body.decode("utf-8"))["data"]
+
+        headers = {"User-Agent": USER_AGENT, "Content-Type": "application/json", "Accept": "application/json"}
+        try:
+            with metrics.span("graphql.query", operation=operation):
+                response = fetch(self.url, headers, method="POST", body=body)
+            if response.status >= 400:
+                raise PokeAPIError(f"HTTP {response.status} while querying {self.url}")
+        except PokeAPIError:
+            if cached is None:
+                raise
+            # An expired answer beats no answer while the endpoint is down.
+            metrics.incr("http_cache.stale_on_error")
+            return json.loads(cached.body.decode("utf-8"))["data"]
+
+        try:
+            payload = json.loads(response.body.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise PokeAPIError(f"Invalid JSON returned from {self.url}") from exc
+        if payload.get("errors") or "data" not in payload:
+            message = (payload.get("errors") or [{}])[0].get("message", "no data returned")
+            raise PokeAPIError(f"GraphQL {operation} failed: {message}")
+
+        cache.store(cache_key, response.body, response.headers)
+        return payload["data"]
+
+    def get_pokedex(self, dex_name: str) -> Dict[str, Any]:
+        """The dex as a REST-shaped `/pokedex/{name}/` payload."""
+        data = self.query("DexList", DEX_LIST_QUERY, {"dex": dex_name})
+        return {
+            "pokemon_entries": [
+                {"entry_number": entry["pokedex_number"], "pokemon_species": entry.get("species") or {}}
+                for entry in data.get("entries", [])
+            ]
+        }
+
+    def get_details(self, pokemon_id: int) -> PokemonDetails:
+        self._raise_if_missing(pokemon_id)
+        details = self._details.get(pokemon_id)
+        if details is not None:
+            return details
+
+        page_start = (pokemon_id - 1) // self.batch_size * self.batch_size + 1
+        details = self._load_page(range(page_start, page_start + self.batch_size), page_start).get(pokemon_id)
+        if details is None:
+            details = self._details.get(pokemon_id)
+        if details is None:
+            self._raise_if_missing(pokemon_id)
+            raise PokeAPIError(f"#{pokemon_id:03} was not returned by the GraphQL backend.")
+        return details
+
+    def get_many_details(self, pokemon_ids: Iterable[int]) -> Dict[int, PokemonDetails]:
+        found: Dict[int, PokemonDetails] = {}
+        missing = []
+        for pokemon_id in sorted(set(pokemon_ids)):
+            details = self._details.get(pokemon_id)
+            if details is not None:
+                found[pokemon_id] = details
+            elif self._not_found.get(self._missing_key(pokemon_id)) is None:
+                missing.append(pokemon_id)
+
+        for start in range(0, len(missing), self.batch_size):
+            page = missing[start:start + self.batch_size]
+            loaded = self._load_page(page, ("ids", tuple(page)))
+            for pokemon_id in page:
+                details = loaded.get(pokemon_id) or self._details.get(pokemon_id)
+                if details is not None:
+                    found[pokemon_id] = details
+        return found
+
+    def _missing_key(self, pokemon_id: int) -> str:
+        return f"{self.url}#species/{pokemon_id}"
+
+    def _raise_if_missing(self, pokemon_id: int) -> None:
+        status = self._not_found.get(self._missing_key(pokemon_id))
+        if status is not None:
+            metrics.incr("negative_cache.hits")
+            raise NotFoundError(f"#{pokemon_id:03} was not returned by the GraphQL backend.")
+
+    def _load_page(self, pokemon_ids: Iterable[int], page_key: Any) -> Dict[int, PokemonDetails]:
+        """Query one page; returns the records it loaded (empty when another caller loaded it)."""
+        pokemon_ids = list(pokemon_ids)
+        with self._lock:
+            event = self._loading.get(page_key)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._loading[page_key] = event
+
+        if not owner:
+            event.wait()
+            return {}
+
+        try:
+            data = self.query("SpeciesBatch", SPECIES_BATCH_QUERY, {"ids": pokemon_ids})
+            loaded = {}
+            for row in data.get("species", []):
+                payloads = species_row_to_rest(row)
+                if payloads is not None:
+                    loaded[row["id"]] = self._details.put(row["id"], build_details(*payloads))
+            for pokemon_id in pokemon_ids:
+                if pokemon_id not in loaded:
+                    self._not_found.put(self._missing_key(pokemon_id), 404)
+            return loaded
+        finally:
+            with self._lock:
+                self._loading.pop(page_key, None)
+            event.set()
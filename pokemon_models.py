@@ -0,0 +1,96 @@
+"""
+Compact record types produced by `pokeapi_client`.
+
+All three are NamedTuples, so instances carry no per-object `__dict__`, and the
+client builds them from just the fields the app uses before the raw PokéAPI
+payload is dropped. Repeated strings (types, abilities, genera) are interned.
+`to_dict`/`from_dict` give the plain JSON shape stored in offline data packs.
+"""
+
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+STAT_LABELS = ("Hp", "Attack", "Defense", "Special Attack", "Special Defense", "Speed")
+
+
+
+class BaseStats(NamedTuple):
+    hp: int = 0
+    attack: int = 0
+    defense: int = 0
+    special_attack: int = 0
+    special_defense: int = 0
+    speed: int = 0
+
+    @classmethod
+    def from_mapping(cls, stats: Dict[str, int]) -> "BaseStats":
+        """Build from `{"Hp": 45, "Special Attack": 65, ...}` (the labels below) or PokéAPI stat names."""
+        values = {}
+        for label, value in stats.items():
+            field = label.strip().lower().replace(" ", "_").replace("-", "_")
+            if field in cls._fields:
+                values[field] = int(value)
+        return cls(**values)
+
+    def labelled(self) -> List[Tuple[str, int]]:
+        return list(zip(STAT_LABELS, self))
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.labelled())
+
+
+
+class PokemonSummary(NamedTuple):
+    id: int
+    name: str
+    api_name: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PokemonSummary":
+        return cls(int(data["id"]), data["name"], data.get("api_name", data["name"].lower()))
+
+
+
+class PokemonDetails(NamedTuple):
+    id: int
+    name: str
+    height_m: float
+    weight_kg: float
+    types: Tuple[str, ...]
+    abilities: Tuple[str, ...]
+    stats: BaseStats
+    genus: str
+    flavor_text: str
+    image_url: Optional[str]
+    cry_url: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self._asdict()
+        data["types"] = list(self.types)
+        data["abilities"] = list(self.abilities)
+        data["stats"] = self.stats.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PokemonDetails":
+        return cls(
+            id=int(data["id"]),
+            name=data["name"],
+            height_m=float(data.get("height_m", 0)),
+            weight_kg=float(data.get("weight_kg", 0)),
+            types=intern_all(data.get("types", [])),
+            abilities=intern_all(data.get("abilities", [])),
+            stats=BaseStats.from_mapping(data.get("stats", {})),
+            genus=sys.intern(data.get("genus", "Unknown Pokémon")),
+            flavor_text=data.get("flavor_text", ""),
+            image_url=data.get("image_url"),
+            cry_url=data.get("cry_url"),
+        )
+
+
+
+def intern_all(values) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values)
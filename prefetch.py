@@ -0,0 +1,146 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from pokeapi_client import PokeAPIError, get_image_bytes, get_pokemon_details
+from pokemon_models import PokemonDetails, PokemonSummary
+
+PREFETCH_WORKERS = 6
+
+ProgressCallback = Callable[[int, int, int], None]
+DetailsCallback = Callable[[PokemonDetails], None]
+Coalesce = Callable[[Hashable, Callable[[], Any]], Any]
+
+
+
+def _run_directly(_key: Hashable, fn: Callable[[], Any]) -> Any:
+    return fn()
+
+
+
+class PrefetchEngine:
+    """
+    Warms `get_pokemon_details` and `get_image_bytes` for a whole dex in the background.
+
+    Work is handed out nearest-first: entries in the current filter results go
+    before everything else, then entries closer to the focused list position.
+    `on_progress(done, failed, total)` and `on_details(details)` are called from
+    worker threads. Passing the selection scheduler's `coalesce` lets a click and
+    a prefetch of the same entry share one request.
+    """
+
+    def __init__(
+        self,
+        on_progress: Optional[ProgressCallback] = None,
+        workers: int = PREFETCH_WORKERS,
+        coalesce: Optional[Coalesce] = None,
+        on_details: Optional[DetailsCallback] = None,
+    ) -> None:
+        self.on_progress = on_progress
+        self.on_details = on_details
+        self.coalesce = coalesce or _run_directly
+        self.workers = workers
+        self._condition = threading.Condition()
+        self._pending: Set[int] = set()
+        self._positions: Dict[int, int] = {}
+        self._preferred: Set[int] = set()
+        self._focus_position = 0
+        self._done = 0
+        self._failed = 0
+        self._total = 0
+        self._cancelled = False
+        # Bumped by every `start()`; a worker finishing an entry from an earlier run does not count it.
+        self._run = 0
+        self._threads: List[threading.Thread] = []
+
+    def start(self, pokemon: List[PokemonSummary]) -> None:
+        with self._condition:
+            self._run += 1
+            self._positions = {entry.id: position for position, entry in enumerate(pokemon)}
+            self._pending = set(self._positions)
+            self._total = len(self._pending)
+            self._done = 0
+            self._failed = 0
+            self._cancelled = False
+            self._condition.notify_all()
+
+        if self._threads:
+            return
+
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"prefetch-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def focus(self, pokemon_id: Optional[int] = None, preferred_ids: Optional[Iterable[int]] = None) -> None:
+        """Move the priority window to the selected entry and/or the current filter results."""
+        with self._condition:
+            if pokemon_id is not None and pokemon_id in self._positions:
+                self._focus_position = self._positions[pokemon_id]
+            if preferred_ids is not None:
+                self._preferred = set(preferred_ids)
+
+    def cancel(self) -> None:
+        with self._condition:
+            self._cancelled = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        with self._condition:
+            return not self._pending and self._done + self._failed >= self._total
+
+    def _next_id(self) -> Optional[int]:
+        # Caller holds the condition. A linear scan is cheap next to a network round trip.
+        def priority(pokemon_id: int):
+            return (
+                0 if pokemon_id in self._preferred else 1,
+                abs(self._positions[pokemon_id] - self._focus_position),
+                self._positions[pokemon_id],
+            )
+
+        best = min(self._pending, key=priority)
+        self._pending.discard(best)
+        return best
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._cancelled:
+                    self._condition.wait()
+                if self._cancelled:
+                    return
+                pokemon_id = self._next_id()
+                run = self._run
+
+            ok = self._prefetch_one(pokemon_id)
+
+            with self._condition:
+                if self._cancelled:
+                    return
+                if run != self._run:
+                    continue
+                if ok:
+                    self._done += 1
+                else:
+                    self._failed += 1
+                progress = (self._done, self._failed, self._total)
+
+            if self.on_progress is not None:
+                self.on_progress(*progress)
+
+    def _prefetch_one(self, pokemon_id: int) -> bool:
+        try:
+            details = self.coalesce(("details", pokemon_id), lambda: get_pokemon_details(pokemon_id))
+        except PokeAPIError:
+            return False
+
+        if self.on_details is not None:
+            self.on_details(details)
+
+        if details.image_url:
+            try:
+                self.coalesce(details.image_url, lambda: get_image_bytes(details.image_url))
+            except PokeAPIError:
+                pass
+        return True
@@ -0,0 +1,94 @@
+"""
+Bounded in-memory LRU store for fetched records.
+
+`RecordCache` reports `cache_info()` and clears with `cache_clear()` like
+`functools.lru_cache`, so `metrics.register_cache` can show it, but callers can
+also look entries up and add them directly. That lets fetch paths which build
+records themselves (the async client, batched GraphQL queries) share one cache
+with the synchronous functions.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+
+class RecordCache(Generic[K, V]):
+    """Thread-safe LRU map holding at most `maxsize` records."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._records: "OrderedDict[K, V]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            value = self._records.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._records.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> V:
+        with self._lock:
+            self._records[key] = value
+            self._records.move_to_end(key)
+            while len(self._records) > self.maxsize:
+                self._records.popitem(last=False)
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._records))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+
+def record_cache(maxsize: int) -> Callable[[Callable[[K], V]], Callable[[K], V]]:
+    """
+    Decorator for a one-argument loader, used in place of `lru_cache(maxsize)`.
+    Besides `cache_info()`/`cache_clear()` the wrapper has `cached(key)`, which
+    returns the record without loading it (None when absent), and
+    `remember(key, record)`, which stores a record loaded some other way.
+    """
+
+    def decorate(load: Callable[[K], V]) -> Callable[[K], V]:
+        cache: RecordCache[K, V] = RecordCache(maxsize)
+
+        @wraps(load)
+        def wrapper(key: K) -> V:
+            value = cache.get(key)
+            if value is None:
+                value = cache.put(key, load(key))
+            return value
+
+        wrapped: Any = wrapper
+        wrapped.cache_info = cache.cache_info
+        wrapped.cache_clear = cache.cache_clear
+        wrapped.cached = cache.get
+        wrapped.remember = cache.put
+        return wrapper
+
+    return decorate
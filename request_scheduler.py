@@ -0,0 +1,136 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+SCHEDULER_WORKERS = 2
+
+T = TypeVar("T")
+Job = Callable[[Callable[[], bool]], Any]
+
+
+
+class InFlightTable:
+    """Coalesces concurrent calls for the same key into a single execution."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+
+    def _claim(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+            return future, owner
+
+    def _release(self, key: Hashable) -> None:
+        with self._lock:
+            self._futures.pop(key, None)
+
+    def run(self, key: Hashable, fn: Callable[[], T]) -> T:
+        future, owner = self._claim(key)
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._release(key)
+
+    async def run_async(self, key: Hashable, start: Callable[[], Awaitable[T]]) -> T:
+        """`run` for coroutines: joins (without blocking the loop) a call made from either side."""
+        future, owner = self._claim(key)
+        if not owner:
+            # Shielded so a cancelled joiner does not cancel the call for everyone else.
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            result = await start()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._release(key)
+
+
+
+class RequestScheduler:
+    """
+    Runs selection fetches on a fixed worker pool with latest-wins semantics.
+
+    Every call to `begin()` starts a new generation and supersedes all earlier
+    ones. Jobs from an older generation are dropped when dequeued, jobs can poll
+    `is_current()` between network stages, and callbacks only fire for the
+    generation that is still current when the job finishes.
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS) -> None:
+        self.inflight = InFlightTable()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._threads: List[threading.Thread] = []
+
+        for index in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"scheduler-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def begin(self) -> int:
+        with self._lock:
+            self._generation += 1
+            return self._generation
+
+    def is_current(self, generation: int) -> bool:
+        with self._lock:
+            return generation == self._generation
+
+    def coalesce(self, key: Hashable, fn: Callable[[], T]) -> T:
+        return self.inflight.run(key, fn)
+
+    def submit(
+        self,
+        generation: int,
+        job: Job,
+        on_success: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        self._queue.put((generation, job, on_success, on_error))
+
+    def shutdown(self) -> None:
+        self.begin()
+        for _ in self._threads:
+            self._queue.put(None)
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            generation, job, on_success, on_error = item
+            if not self.is_current(generation):
+                continue
+
+            try:
+                result = job(lambda: self.is_current(generation))
+            except Exception as exc:
+                if self.is_current(generation):
+                    on_error(exc)
+                continue
+
+            if self.is_current(generation):
+                on_success(result)
@@ -0,0 +1,148 @@
+"""
+Failure handling for `pokeapi_client`: retries, circuit breaking and negative caching.
+
+- `RetryPolicy`: exponential backoff with full jitter, capped by a per-call deadline
+  so a flaky upstream cannot hold a worker for long.
+- `CircuitBreaker`: after `failure_threshold` consecutive failures a host is
+  skipped for `reset_after` seconds; then one trial request decides whether it
+  closes again.
+- `NegativeCache`: remembers 404/410 answers for a while, since `lru_cache`
+  never caches the exceptions they turn into.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+NEGATIVE_STATUSES = frozenset((404, 410))
+
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 4.0,
+        deadline: float = 12.0,
+    ) -> None:
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def delays(self) -> Iterator[float]:
+        """Sleep before each retry: uniform in [0, min(max_delay, base_delay * 2**n)]."""
+        for attempt in range(self.attempts - 1):
+            yield random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    @staticmethod
+    def retry_after(value: Optional[str], cap: float) -> Optional[float]:
+        """Seconds from a `Retry-After: <seconds>` header, capped; None when absent or a date."""
+        try:
+            return min(cap, max(0.0, float(value))) if value else None
+        except ValueError:
+            return None
+
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one host. Thread-safe."""
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        """Seconds until a trial request will be let through (0 when closed)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_after - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or time.monotonic() - self._opened_at < self.reset_after:
+                return False
+            # Half-open: exactly one caller probes the host.
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+
+class CircuitBreakers:
+    """One `CircuitBreaker` per host, created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_after)
+            return breaker
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+
+class NegativeCache:
+    """URL -> HTTP status for resources that do not exist, kept for `ttl` seconds."""
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            status, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[url]
+                return None
+            return status
+
+    def put(self, url: str, status: int) -> None:
+        with self._lock:
+            self._entries[url] = (status, time.monotonic() + self.ttl)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,207 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pokemon_models import PokemonDetails, PokemonSummary
+
+MAX_GRAM = 3
+
+# Ranking tiers, lower is better.
+TIER_EXACT = 0
+TIER_PREFIX = 1
+TIER_NUMBER = 2
+TIER_SUBSTRING = 3
+TIER_TAG = 4
+TIER_FUZZY = 5
+
+
+
+def _grams(text: str) -> Set[str]:
+    grams = set()
+    for size in range(1, MAX_GRAM + 1):
+        for start in range(len(text) - size + 1):
+            grams.add(text[start:start + size])
+    return grams
+
+
+
+def _edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal string alignment distance, giving up early once it exceeds `limit`."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, start=1):
+        current = [i] + [0] * len(right)
+        for j, right_char in enumerate(right, start=1):
+            cost = 0 if left_char == right_char else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and left_char == right[j - 2] and left[i - 2] == right_char:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+
+class SearchIndex:
+    """
+    N-gram index over names, ids and (once details are known) types and abilities.
+
+    Substrings of up to three characters are answered straight from the gram
+    tables; longer queries intersect their trigram postings and verify only the
+    survivors. When a query extends the previous one, matching starts from the
+    previous result set instead of the whole dex. Queries with no direct hit
+    fall back to typo-tolerant matching over names that share a bigram.
+    """
+
+    def __init__(self, pokemon: Iterable[PokemonSummary] = ()) -> None:
+        self.pokemon: List[PokemonSummary] = []
+        self._names: List[str] = []
+        self._ids: List[str] = []
+        self._by_id: Dict[int, int] = {}
+        self._name_grams: Dict[str, Set[int]] = {}
+        self._id_grams: Dict[str, Set[int]] = {}
+        self._tags: Dict[str, Set[int]] = {}
+        self._tagged: Set[int] = set()
+        self._last_query = ""
+        self._last_candidates: Optional[Set[int]] = None
+        self.extend(pokemon)
+
+    def extend(self, pokemon: Iterable[PokemonSummary]) -> None:
+        """Index more entries, e.g. the next page of a streamed dex."""
+        for entry in pokemon:
+            position = len(self.pokemon)
+            self.pokemon.append(entry)
+            self._names.append(entry.name.lower())
+            self._ids.append(str(entry.id))
+            self._by_id[entry.id] = position
+            self._index_text(self._name_grams, self._names[position], position)
+            self._index_text(self._id_grams, self._ids[position], position)
+        # New entries may match the last query, so it can no longer seed a narrower one.
+        self._last_candidates = None
+
+    @staticmethod
+    def _index_text(table: Dict[str, Set[int]], text: str, position: int) -> None:
+        for gram in _grams(text):
+            table.setdefault(gram, set()).add(position)
+
+    def add_details(self, details: PokemonDetails) -> None:
+        """Make an entry findable by its types and abilities."""
+        position = self._by_id.get(details.id)
+        if position is None or position in self._tagged:
+            return
+
+        self._tagged.add(position)
+        for tag in details.types + details.abilities:
+            self._tags.setdefault(tag.lower(), set()).add(position)
+        self._last_candidates = None
+
+    def search(self, query: str) -> List[PokemonSummary]:
+        query = query.strip().lower()
+        if not query:
+            self._last_query = ""
+            self._last_candidates = None
+            return self.pokemon[:]
+
+        scope = self._last_candidates if self._narrows(query) else None
+
+        ranked = self._direct_matches(query, scope)
+        self._last_query = query
+        self._last_candidates = {position for _, position in ranked}
+
+        if not ranked:
+            ranked = self._fuzzy_matches(query)
+            # Fuzzy hits do not narrow monotonically, so never reuse them as a scope.
+            self._last_candidates = None
+
+        ranked.sort()
+        return [self.pokemon[position] for _, position in ranked]
+
+    def _narrows(self, query: str) -> bool:
+        """Whether every match of `query` is also a match of the previous query."""
+        if self._last_candidates is None or not self._last_query or not query.startswith(self._last_query):
+            return False
+        number = query.lstrip("#")
+        if not number.isdigit():
+            return True
+        # Numbers match with their leading zeros stripped: "00" -> "002" goes from "0" to "2".
+        previous = self._last_query.lstrip("#")
+        return previous.isdigit() and (number.lstrip("0") or "0").startswith(previous.lstrip("0") or "0")
+
+    def _postings(self, table: Dict[str, Set[int]], text: str) -> Set[int]:
+        if len(text) <= MAX_GRAM:
+            return set(table.get(text, ()))
+
+        grams = [text[start:start + MAX_GRAM] for start in range(len(text) - MAX_GRAM + 1)]
+        postings = sorted((table.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def _direct_matches(self, query: str, scope: Optional[Set[int]]) -> List[Tuple[Tuple[int, int, int], int]]:
+        number = query.lstrip("#")
+        ranked: Dict[int, Tuple[int, int, int]] = {}
+
+        def offer(position: int, tier: int, detail: int = 0) -> None:
+            key = (tier, detail, position)
+            if position not in ranked or key < ranked[position]:
+                ranked[position] = key
+
+        if number.isdigit():
+            exact = self._by_id.get(int(number))
+            if exact is not None and (scope is None or exact in scope):
+                offer(exact, TIER_EXACT)
+            stripped = number.lstrip("0") or "0"
+            for position in self._candidates(self._id_grams, stripped, scope):
+                if stripped in self._ids[position]:
+                    offer(position, TIER_NUMBER, self._ids[position].index(stripped))
+
+        for position in self._candidates(self._name_grams, query, scope):
+            name = self._names[position]
+            offset = name.find(query)
+            if offset < 0:
+                continue
+            if name == query:
+                offer(position, TIER_EXACT)
+            elif offset == 0:
+                offer(position, TIER_PREFIX, len(name))
+            else:
+                offer(position, TIER_SUBSTRING, offset)
+
+        for tag, positions in self._tags.items():
+            if tag.startswith(query):
+                for position in positions if scope is None else positions & scope:
+                    offer(position, TIER_TAG)
+
+        return [(key, position) for position, key in ranked.items()]
+
+    def _candidates(self, table: Dict[str, Set[int]], text: str, scope: Optional[Set[int]]) -> Iterable[int]:
+        if scope is not None and len(scope) < 64:
+            return scope
+        postings = self._postings(table, text)
+        return postings if scope is None else postings & scope
+
+    def _fuzzy_matches(self, query: str) -> List[Tuple[Tuple[int, int, int], int]]:
+        if len(query) < 3 or query.lstrip("#").isdigit():
+            return []
+
+        limit = 1 if len(query) <= 5 else 2
+        candidates: Set[int] = set()
+        for start in range(len(query) - 1):
+            candidates |= self._name_grams.get(query[start:start + 2], set())
+
+        ranked = []
+        for position in candidates:
+            name = self._names[position]
+            # Compare against the whole name and against its prefix so partially typed names still match.
+            distance = min(
+                _edit_distance(query, name, limit),
+                _edit_distance(query, name[:len(query)], limit),
+            )
+            if distance <= limit:
+                ranked.append(((TIER_FUZZY, distance, position), position))
+        return ranked
@@ -11,8 +11,11 @@ class ShellStyle:
     BUTTON_GREEN = "#6BCB77"
     BUTTON_BLACK = "#2A2A2A"
     WINDOW_BG = "#151515"
+    LIST_PANEL_BG = "#ABB87A"
+    LIST_SELECT_BG = "#6F8D0D"
+    LIST_SELECT_TEXT = "#F8F8F8"
 
-    WINDOW_TITLE = "Kanto Pokédex"
+    WINDOW_TITLE = "{dex} Pokédex"  # formatted with the selected dex's label
     WINDOW_SIZE = "1320x780"
     MIN_WIDTH = 1180
     MIN_HEIGHT = 720
@@ -34,3 +37,29 @@ class Fonts:
     LIST = ("Courier", 12)
     BUTTON = ("Helvetica", 10, "bold")
     CRY_BUTTON = ("Helvetica", 10, "bold")
+    TYPE_BADGE = ("Helvetica", 7, "bold")
+
+
+class TypeColors:
+    BADGE_TEXT = "#FFFFFF"
+    DEFAULT = "#68A090"
+    BY_TYPE = {
+        "Normal": "#A8A878",
+        "Fire": "#F08030",
+        "Water": "#6890F0",
+        "Grass": "#78C850",
+        "Electric": "#C8A000",
+        "Ice": "#78C8C8",
+        "Fighting": "#C03028",
+        "Poison": "#A040A0",
+        "Ground": "#C0A048",
+        "Flying": "#8870E0",
+        "Psychic": "#F85888",
+        "Bug": "#98A820",
+        "Rock": "#B8A038",
+        "Ghost": "#705898",
+        "Dragon": "#7038F8",
+        "Dark": "#705848",
+        "Steel": "#A0A0C0",
+        "Fairy": "#E080A0",
+    }
@@ -0,0 +1,164 @@
+"""
+Single-image sprite atlas for the whole dex.
+
+Once every sprite of a dex has been fetched, `build_atlas` pastes them into one
+PNG on a fixed grid and writes a JSON index of (x, y, width, height) boxes next
+to it. Each dex has its own pair of files in the cache directory.
+At startup the atlas is decoded once and per-entry sprites are cut out of it
+in memory, so thumbnails and first paints need no I/O or PNG decoding.
+Requires Pillow; without it the atlas is simply unavailable.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pokeapi_client
+from pokeapi_client import PokeAPIError, get_image_bytes, get_pokemon_details
+from pokemon_models import PokemonSummary
+from sprite_pipeline import PreparedSprite, SpriteError, decode_sprite, fit_scale, pil_image, scale_sprite
+
+ATLAS_FORMAT_VERSION = 1
+
+Box = Tuple[int, int, int, int]
+
+
+
+def atlas_available() -> bool:
+    return pil_image() is not None
+
+
+
+def atlas_paths(dex: str) -> Tuple[Path, Path]:
+    """The (image, index) files for `dex`'s atlas, under the client's current cache directory."""
+    cache_dir = pokeapi_client.CACHE_DIR
+    return cache_dir / f"sprite_atlas-{dex}.png", cache_dir / f"sprite_atlas-{dex}.json"
+
+
+
+class SpriteAtlas:
+    def __init__(self, image, boxes: Dict[int, Box], urls: Dict[int, str]) -> None:
+        self.image = image
+        self.boxes = boxes
+        self.urls = urls
+        self._crops: Dict[int, Any] = {}
+        self._thumbnails: Dict[Tuple[int, int], Any] = {}
+
+    def __contains__(self, pokemon_id: int) -> bool:
+        return pokemon_id in self.boxes
+
+    def crop(self, pokemon_id: int):
+        """Return the entry's sprite as an RGBA image, or None if the atlas does not have it."""
+        crop = self._crops.get(pokemon_id)
+        if crop is None:
+            box = self.boxes.get(pokemon_id)
+            if box is None:
+                return None
+            x, y, width, height = box
+            crop = self.image.crop((x, y, x + width, y + height))
+            self._crops[pokemon_id] = crop
+        return crop
+
+    def thumbnail(self, pokemon_id: int, size: int):
+        """Return the sprite shrunk to fit a `size` x `size` square, or None."""
+        key = (pokemon_id, size)
+        thumbnail = self._thumbnails.get(key)
+        if thumbnail is None:
+            crop = self.crop(pokemon_id)
+            if crop is None:
+                return None
+            # Gen I sprites sit in a padded frame; trim it so the thumbnail is not mostly margin.
+            bbox = crop.getbbox()
+            thumbnail = crop.crop(bbox) if bbox else crop.copy()
+            thumbnail.thumbnail((size, size), pil_image().Resampling.BOX)
+            self._thumbnails[key] = thumbnail
+        return thumbnail
+
+    def prepare(self, pokemon_id: int, image_data: bytes, max_width: int, max_height: int) -> Optional[PreparedSprite]:
+        """
+        Build a `PreparedSprite` for `image_data` from the atlas crop instead of decoding it.
+        Returns None when the atlas does not have the entry.
+        """
+        decoded = self.crop(pokemon_id)
+        if decoded is None:
+            return None
+        scale = fit_scale(decoded.size[0], decoded.size[1], max_width, max_height)
+        return PreparedSprite(image_data, decoded.size, scale, decoded=decoded, scaled=scale_sprite(decoded, scale))
+
+    def covers(self, pokemon_ids: Iterable[int]) -> bool:
+        return all(pokemon_id in self.boxes for pokemon_id in pokemon_ids)
+
+    @classmethod
+    def load(cls, dex: str) -> Optional["SpriteAtlas"]:
+        """The saved atlas for `dex`, or None when there is none (or Pillow is missing)."""
+        if not atlas_available():
+            return None
+
+        image_path, index_path = atlas_paths(dex)
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("version") != ATLAS_FORMAT_VERSION:
+                return None
+            image = decode_sprite(image_path.read_bytes())
+        except (OSError, ValueError, SpriteError):
+            return None
+
+        boxes = {int(key): tuple(entry["box"]) for key, entry in index.get("sprites", {}).items()}
+        urls = {int(key): entry["url"] for key, entry in index.get("sprites", {}).items()}
+        return cls(image, boxes, urls)
+
+
+
+def build_atlas(dex: str, pokemon: List[PokemonSummary]) -> Optional[SpriteAtlas]:
+    """
+    Compose every available sprite for `pokemon` into one atlas and save it as `dex`'s atlas.
+    Uses the already cached details and sprite bytes; entries that fail are skipped.
+    """
+    if not atlas_available():
+        return None
+
+    sprites: List[Tuple[int, str, Any]] = []
+    for entry in pokemon:
+        try:
+            details = get_pokemon_details(entry.id)
+            if not details.image_url:
+                continue
+            sprites.append((entry.id, details.image_url, decode_sprite(get_image_bytes(details.image_url))))
+        except (PokeAPIError, SpriteError):
+            continue
+
+    if not sprites:
+        return None
+
+    cell_width = max(image.size[0] for _, _, image in sprites)
+    cell_height = max(image.size[1] for _, _, image in sprites)
+    columns = max(1, math.ceil(math.sqrt(len(sprites))))
+    rows = math.ceil(len(sprites) / columns)
+
+    atlas_image = pil_image().new("RGBA", (columns * cell_width, rows * cell_height), (0, 0, 0, 0))
+    boxes: Dict[int, Box] = {}
+    urls: Dict[int, str] = {}
+    for slot, (pokemon_id, url, image) in enumerate(sprites):
+        x = (slot % columns) * cell_width
+        y = (slot // columns) * cell_height
+        atlas_image.paste(image, (x, y))
+        boxes[pokemon_id] = (x, y, image.size[0], image.size[1])
+        urls[pokemon_id] = url
+
+    index = {
+        "version": ATLAS_FORMAT_VERSION,
+        "sprites": {str(pokemon_id): {"box": list(box), "url": urls[pokemon_id]} for pokemon_id, box in boxes.items()},
+    }
+
+    image_path, index_path = atlas_paths(dex)
+    image_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_image = image_path.with_name(image_path.name + ".tmp")
+    tmp_index = index_path.with_name(index_path.name + ".tmp")
+    atlas_image.save(tmp_image, format="PNG", optimize=True)
+    tmp_index.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_image, image_path)
+    os.replace(tmp_index, index_path)
+
+    return SpriteAtlas(atlas_image, boxes, urls)
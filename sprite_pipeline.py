@@ -0,0 +1,101 @@
+"""
+Tk-free sprite decode and scale stage.
+
+Everything here is safe to run on a worker thread; the Tk main thread only has
+to wrap the result in a PhotoImage (see `ui_utils.SpriteRenderer.adopt`).
+Pillow is imported on first use rather than at startup (see `pil_image`).
+"""
+
+import base64
+import io
+import struct
+import threading
+from typing import Any, NamedTuple, Optional, Tuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_pil_lock = threading.Lock()
+_pil_loaded = False
+_pil_image = None
+
+
+
+def pil_image():
+    """Pillow's `Image` module, imported on first call; None when Pillow is not installed."""
+    global _pil_loaded, _pil_image
+    if not _pil_loaded:
+        with _pil_lock:
+            if not _pil_loaded:
+                try:
+                    from PIL import Image  # pyright: ignore[reportMissingImports]
+                except Exception:  # pragma: no cover - optional dependency fallback
+                    Image = None
+                _pil_image = Image
+                _pil_loaded = True
+    return _pil_image
+
+
+
+class SpriteError(Exception):
+    """Raised when sprite bytes cannot be decoded."""
+
+
+
+class PreparedSprite(NamedTuple):
+    source: bytes
+    base_size: Tuple[int, int]
+    scale: int
+    # With Pillow: the decoded RGBA image and its scaled copy, ready for ImageTk.
+    decoded: Optional[Any] = None
+    scaled: Optional[Any] = None
+    # Without Pillow: base64 PNG for tk.PhotoImage, which then zooms by `scale`.
+    png_base64: Optional[str] = None
+
+
+
+def fit_scale(width: int, height: int, max_width: int, max_height: int) -> int:
+    """Largest integer scale that keeps the sprite inside the box (at least 1)."""
+    return max(1, min(max(1, int(max_width)) // max(1, width), max(1, int(max_height)) // max(1, height)))
+
+
+
+def png_size(image_data: bytes) -> Tuple[int, int]:
+    """Read width and height from the PNG header without decoding pixel data."""
+    if len(image_data) < 24 or not image_data.startswith(PNG_SIGNATURE) or image_data[12:16] != b"IHDR":
+        raise SpriteError("Sprite is not a PNG image.")
+    return struct.unpack(">II", image_data[16:24])
+
+
+
+def decode_sprite(image_data: bytes):
+    Image = pil_image()
+    if Image is None:
+        raise SpriteError("Pillow is not installed.")
+    try:
+        return Image.open(io.BytesIO(image_data)).convert("RGBA")
+    except Exception as exc:  # PIL raises a variety of errors for bad input
+        raise SpriteError(f"Could not decode sprite: {exc}") from exc
+
+
+
+def scale_sprite(decoded, scale: int):
+    width, height = decoded.size
+    return decoded.resize((width * scale, height * scale), pil_image().Resampling.NEAREST)
+
+
+
+def prepare_sprite(image_data: bytes, max_width: int, max_height: int) -> PreparedSprite:
+    """Decode and nearest-neighbour scale a sprite to fit the box."""
+    if pil_image() is not None:
+        decoded = decode_sprite(image_data)
+        scale = fit_scale(decoded.size[0], decoded.size[1], max_width, max_height)
+        return PreparedSprite(image_data, decoded.size, scale, decoded=decoded, scaled=scale_sprite(decoded, scale))
+
+    width, height = png_size(image_data)
+    scale = fit_scale(width, height, max_width, max_height)
+    return PreparedSprite(
+        image_data,
+        (width, height),
+        scale,
+        png_base64=base64.b64encode(image_data).decode("ascii"),
+    )
@@ -0,0 +1,304 @@
+"""
+Base-stat analytics over loaded entries.
+
+`StatMatrix` lays the base stats of a set of `PokemonDetails` out as a species
+x stat matrix (the six stats plus their total, one row per species in id
+order) and answers three kinds of query against it:
+
+- `top(stat, count, type_name)`: "top 10 by Speed among Water types"
+- `percentile(pokemon_id, stat)`: where an entry stands in a stat
+- `similar(pokemon_id, count)`: the entries with the closest stat spread
+  (Euclidean distance over the six base stats)
+
+With NumPy each query is a handful of vectorized passes over the matrix (type
+filters are precomputed boolean masks, percentiles binary-search presorted
+columns, and top-k selection partitions before it sorts). Without NumPy the
+same queries run over plain per-column lists and return identical results,
+just more slowly. Ties are broken by the lower id in both.
+
+It needs no Tk, so it works headlessly too:
+
+    python stat_analytics.py top speed --type water --count 10
+    python stat_analytics.py similar 25 --dex national
+    python stat_analytics.py percentile 143
+"""
+
+import argparse
+import bisect
+import heapq
+import math
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pokemon_models import STAT_LABELS, BaseStats, PokemonDetails
+
+STAT_COLUMNS = BaseStats._fields + ("total",)
+COLUMN_LABELS = STAT_LABELS + ("Total",)
+TOTAL_COLUMN = len(STAT_COLUMNS) - 1
+_ALIASES = {"bst": TOTAL_COLUMN, "base_stat_total": TOTAL_COLUMN}
+
+
+class StatQueryError(Exception):
+    """Raised for an unknown stat name or an entry that is not in the matrix."""
+
+
+
+class RankedEntry(NamedTuple):
+    id: int
+    name: str
+    score: float
+
+
+
+def resolve_stat(stat: str) -> int:
+    """Column index for a stat given as a field name, a label ("Special Attack") or "total"."""
+    key = stat.strip().lower().replace(" ", "_").replace("-", "_")
+    if key in STAT_COLUMNS:
+        return STAT_COLUMNS.index(key)
+    if key in _ALIASES:
+        return _ALIASES[key]
+    raise StatQueryError(f"Unknown stat {stat!r}; expected one of {', '.join(STAT_COLUMNS)}.")
+
+
+
+@lru_cache(maxsize=1)
+def _numpy():
+    # Imported on first use rather than with the module, so the app's cold start does not pay for NumPy.
+    try:
+        import numpy  # pyright: ignore[reportMissingImports]
+    except Exception:  # pragma: no cover - optional dependency fallback
+        return None
+    return numpy
+
+
+
+def numpy_available() -> bool:
+    return _numpy() is not None
+
+
+
+class StatMatrix:
+    def __init__(self, details: Iterable[PokemonDetails], use_numpy: Optional[bool] = None) -> None:
+        entries = sorted({entry.id: entry for entry in details}.values(), key=lambda entry: entry.id)
+        self.ids: List[int] = [entry.id for entry in entries]
+        self.names: List[str] = [entry.name for entry in entries]
+        self._row_of: Dict[int, int] = {pokemon_id: row for row, pokemon_id in enumerate(self.ids)}
+        rows = [tuple(entry.stats) + (sum(entry.stats),) for entry in entries]
+
+        type_rows: Dict[str, List[int]] = {}
+        for row, entry in enumerate(entries):
+            for type_name in entry.types:
+                type_rows.setdefault(type_name, []).append(row)
+
+        numpy = _numpy() if use_numpy is not False else None
+        self.engine = "numpy" if numpy is not None else "python"
+        if self.engine == "numpy":
+            self._values = numpy.array(rows, dtype=numpy.int64).reshape(len(rows), len(STAT_COLUMNS))
+            self._stats = self._values[:, :TOTAL_COLUMN]
+            self._sorted = numpy.sort(self._values, axis=0)
+            self._type_masks = {}
+            for type_name, members in type_rows.items():
+                mask = numpy.zeros(len(rows), dtype=bool)
+                mask[members] = True
+                self._type_masks[type_name] = mask
+        else:
+            self._columns = [list(column) for column in zip(*rows)] or [[] for _ in STAT_COLUMNS]
+            self._sorted_columns = [sorted(column) for column in self._columns]
+            self._rows = rows
+            self._stat_rows = [values[:TOTAL_COLUMN] for values in rows]
+            self._type_rows = type_rows
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, pokemon_id: int) -> bool:
+        return pokemon_id in self._row_of
+
+    def types(self) -> List[str]:
+        members = self._type_masks if self.engine == "numpy" else self._type_rows
+        return sorted(members)
+
+    def _row(self, pokemon_id: int) -> int:
+        row = self._row_of.get(pokemon_id)
+        if row is None:
+            raise StatQueryError(f"#{pokemon_id:03} has no loaded stats.")
+        return row
+
+    def _ranked(self, rows: Sequence[int], scores: Sequence[float]) -> List[RankedEntry]:
+        return [RankedEntry(self.ids[row], self.names[row], score) for row, score in zip(rows, scores)]
+
+    def top(self, stat: str, count: int = 10, type_name: Optional[str] = None, lowest: bool = False) -> List[RankedEntry]:
+        """The `count` highest (or with `lowest`, lowest) entries by `stat`, optionally of one type."""
+        column = resolve_stat(stat)
+        type_name = type_name.title() if type_name else None
+        if count <= 0 or not self.ids:
+            return []
+
+        if self.engine == "numpy":
+            numpy = _numpy()
+            values = self._values[:, column]
+            if type_name is not None:
+                mask = self._type_masks.get(type_name)
+                if mask is None:
+                    return []
+                candidates = numpy.flatnonzero(mask)
+                values = values[candidates]
+            else:
+                candidates = numpy.arange(len(values))
+            keys = values if lowest else -values
+            if count < len(keys):
+                # Partition first so only the k best (and their ties) are sorted.
+                cutoff = numpy.partition(keys, count - 1)[count - 1]
+                keep = numpy.flatnonzero(keys <= cutoff)
+                candidates, keys = candidates[keep], keys[keep]
+            order = numpy.argsort(keys, kind="stable")[:count]
+            rows = candidates[order].tolist()
+            return self._ranked(rows, self._values[rows, column].tolist())
+
+        values = self._columns[column]
+        rows = self._type_rows.get(type_name, []) if type_name is not None else range(len(values))
+        sign = 1 if lowest else -1
+        best = heapq.nsmallest(count, rows, key=lambda row: (sign * values[row], row))
+        return self._ranked(best, [values[row] for row in best])
+
+    def percentile(self, pokemon_id: int, stat: str, type_name: Optional[str] = None) -> float:
+        """Percentile rank (0-100, ties counted half) of an entry's `stat` among all entries or one type."""
+        row = self._row(pokemon_id)
+        column = resolve_stat(stat)
+        type_name = type_name.title() if type_name else None
+
+        if self.engine == "numpy":
+            numpy = _numpy()
+            value = self._values[row, column]
+            if type_name is None:
+                ordered = self._sorted[:, column]
+                below = numpy.searchsorted(ordered, value, side="left")
+                equal = numpy.searchsorted(ordered, value, side="right") - below
+                total = len(ordered)
+            else:
+                values = self._values[self._type_masks.get(type_name, numpy.zeros(len(self.ids), dtype=bool)), column]
+                below = int(numpy.count_nonzero(values < value))
+                equal = int(numpy.count_nonzero(values == value))
+                total = len(values)
+        else:
+            value = self._columns[column][row]
+            if type_name is None:
+                ordered = self._sorted_columns[column]
+                below = bisect.bisect_left(ordered, value)
+                equal = bisect.bisect_right(ordered, value) - below
+                total = len(ordered)
+            else:
+                values = [self._columns[column][member] for member in self._type_rows.get(type_name, [])]
+                below = sum(1 for other in values if other < value)
+                equal = sum(1 for other in values if other == value)
+                total = len(values)
+
+        if not total:
+            return 0.0
+        return float(100.0 * (below + 0.5 * equal) / total)
+
+    def percentiles(self, pokemon_id: int) -> List[Tuple[str, int, float]]:
+        """(label, value, percentile) for every column of one entry, as shown in the stats panel."""
+        row = self._row(pokemon_id)
+        values = self._values[row].tolist() if self.engine == "numpy" else list(self._rows[row])
+        return [
+            (label, value, self.percentile(pokemon_id, column))
+            for label, column, value in zip(COLUMN_LABELS, STAT_COLUMNS, values)
+        ]
+
+    def similar(self, pokemon_id: int, count: int = 5, type_name: Optional[str] = None) -> List[RankedEntry]:
+        """The `count` other entries whose six base stats are closest to this one's; score is the distance."""
+        row = self._row(pokemon_id)
+        type_name = type_name.title() if type_name else None
+        if count <= 0:
+            return []
+
+        if self.engine == "numpy":
+            numpy = _numpy()
+            difference = self._stats - self._stats[row]
+            distances = numpy.einsum("ij,ij->i", difference, difference)
+            if type_name is not None:
+                candidates = numpy.flatnonzero(self._type_masks.get(type_name, numpy.zeros(len(self.ids), dtype=bool)))
+            else:
+                candidates = numpy.arange(len(self.ids))
+            candidates = candidates[candidates != row]
+            keys = distances[candidates]
+            if count < len(keys):
+                cutoff = numpy.partition(keys, count - 1)[count - 1]
+                keep = numpy.flatnonzero(keys <= cutoff)
+                candidates, keys = candidates[keep], keys[keep]
+            order = numpy.argsort(keys, kind="stable")[:count]
+            rows = candidates[order].tolist()
+            return self._ranked(rows, [math.sqrt(squared) for squared in keys[order].tolist()])
+
+        stat_rows = self._stat_rows
+        target = stat_rows[row]
+        rows = self._type_rows.get(type_name, []) if type_name is not None else range(len(self.ids))
+        best = heapq.nsmallest(count, ((math.dist(stat_rows[other], target), other) for other in rows if other != row))
+        return self._ranked([other for _, other in best], [distance for distance, _ in best])
+
+
+
+def load_matrix(dex: str = "kanto") -> StatMatrix:
+    """A matrix over every entry of `dex`, fetched (or read from the caches) through `pokeapi_client`."""
+    from pokeapi_client import get_many_details, get_pokedex
+
+    return StatMatrix(get_many_details([pokemon.id for pokemon in get_pokedex(dex)]))
+
+
+
+def _find(matrix: StatMatrix, key: str) -> int:
+    if key.isdigit():
+        return int(key)
+    wanted = key.strip().lower().replace("-", " ")
+    for pokemon_id, name in zip(matrix.ids, matrix.names):
+        if name.lower() == wanted:
+            return pokemon_id
+    raise StatQueryError(f"No loaded entry is called {key!r}.")
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from pokeapi_client import DEXES, PokeAPIError, enable_offline_mode
+
+    parser = argparse.ArgumentParser(description="Rank, compare and find similar base-stat spreads.")
+    parser.add_argument("--dex", choices=list(DEXES), default="kanto", help="dex whose entries are compared")
+    parser.add_argument("--offline", metavar="PACK", type=Path, help="read entries from an offline data pack")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    top = subcommands.add_parser("top", help="highest (or lowest) entries by one stat")
+    top.add_argument("stat")
+    top.add_argument("--type", dest="type_name")
+    top.add_argument("--count", type=int, default=10)
+    top.add_argument("--lowest", action="store_true")
+    similar = subcommands.add_parser("similar", help="entries with the closest stat spread")
+    similar.add_argument("pokemon", help="national number or name")
+    similar.add_argument("--type", dest="type_name")
+    similar.add_argument("--count", type=int, default=5)
+    percentile = subcommands.add_parser("percentile", help="percentile of every stat of one entry")
+    percentile.add_argument("pokemon", help="national number or name")
+    args = parser.parse_args(argv)
+
+    if args.offline is not None:
+        enable_offline_mode(args.offline)
+    try:
+        matrix = load_matrix(args.dex)
+        if args.command == "top":
+            for position, entry in enumerate(matrix.top(args.stat, args.count, args.type_name, args.lowest), start=1):
+                print(f"{position:>3}. #{entry.id:03} {entry.name:<16} {entry.score:g}")
+        elif args.command == "similar":
+            for entry in matrix.similar(_find(matrix, args.pokemon), args.count, args.type_name):
+                print(f"#{entry.id:03} {entry.name:<16} distance {entry.score:.1f}")
+        else:
+            for label, value, rank in matrix.percentiles(_find(matrix, args.pokemon)):
+                print(f"{label:<16} {value:>4}  p{rank:.0f}")
+    except (StatQueryError, PokeAPIError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live flat at the repository root rather than in a package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pokeapi_client  # noqa: E402
+from fixture_server import FixtureServer, synthesize  # noqa: E402
+from resilience import CircuitBreakers, NegativeCache  # noqa: E402
+
+FIXTURE_COUNT = 30
+GRAPHQL_BATCH_SIZE = 10
+
+
+
+def _clear_client_caches() -> None:
+    for cached in (
+        pokeapi_client.get_original_151,
+        pokeapi_client.get_pokedex,
+        pokeapi_client.get_type_chart,
+        pokeapi_client.get_pokemon_details,
+        pokeapi_client.get_image_bytes,
+        pokeapi_client.get_http_cache,
+        pokeapi_client.get_asset_store,
+    ):
+        cached.cache_clear()
+
+
+
+@pytest.fixture(scope="session")
+def fixtures_dir(tmp_path_factory) -> Path:
+    """A synthetic Kanto dex of `FIXTURE_COUNT` entries, with sprites, type data and no cries."""
+    path = tmp_path_factory.mktemp("fixtures")
+    synthesize(path, FIXTURE_COUNT)
+    return path
+
+
+
+@pytest.fixture(scope="session")
+def stand_in(fixtures_dir):
+    with FixtureServer(fixtures_dir) as server:
+        yield server
+
+
+
+@pytest.fixture
+def client(stand_in, tmp_path, monkeypatch):
+    """`pokeapi_client` pointed at the stand-in, with a fresh cache directory and no state from other tests."""
+    pokeapi_client.disable_offline_mode()
+    monkeypatch.setattr(pokeapi_client, "BASE_URL", stand_in.rest_url)
+    monkeypatch.setattr(pokeapi_client, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(pokeapi_client, "_backend", "rest")
+    monkeypatch.setattr(pokeapi_client, "_breakers", CircuitBreakers())
+    monkeypatch.setattr(pokeapi_client, "_not_found", NegativeCache())
+    _clear_client_caches()
+    yield pokeapi_client
+    _clear_client_caches()
+
+
+
+@pytest.fixture
+def graphql_client(client, stand_in, monkeypatch):
+    """`client` on the GraphQL backend, batching `GRAPHQL_BATCH_SIZE` species per query."""
+    from pokeapi_graphql import GraphQLBackend
+
+    monkeypatch.setattr(client, "_backend", "graphql")
+    monkeypatch.setattr(client, "_graphql_retry_at", 0.0)
+    monkeypatch.setattr(client, "_graphql_backend", GraphQLBackend(stand_in.graphql_url, GRAPHQL_BATCH_SIZE))
+    return client
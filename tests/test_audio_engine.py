@@ -0,0 +1,111 @@
+import struct
+
+import pytest
+
+import cry_player
+from audio_engine import (
+    AudioError,
+    ClipCache,
+    NullSink,
+    PCMClip,
+    WavFileSink,
+    decode_audio,
+    default_sink,
+    encode_wav,
+)
+
+
+
+def _clip(frames: int, channels: int = 1, sample_rate: int = 8000) -> PCMClip:
+    samples = b"".join(struct.pack("<h", (index * 97) % 30000 - 15000) for index in range(frames * channels))
+    return PCMClip(samples, sample_rate, channels)
+
+
+
+def test_wav_round_trips_through_the_decoder():
+    clip = _clip(400, channels=2, sample_rate=22050)
+    assert decode_audio(encode_wav(clip)) == clip
+
+
+
+def test_undecodable_audio_raises_audio_error():
+    with pytest.raises(AudioError):
+        decode_audio(b"RIFF\x00\x00\x00\x00WAVEnot really a wav file")
+
+
+
+def test_clip_cache_evicts_least_recently_used_clips_past_its_size():
+    clip = _clip(100)  # 200 bytes of PCM
+    cache = ClipCache(max_bytes=3 * len(clip.samples))
+    for key in ("a", "b", "c"):
+        cache.put(key, clip)
+    assert cache.get("a") is clip
+
+    cache.put("d", clip)
+    assert cache.get("b") is None
+    assert [cache.get(key) is clip for key in ("a", "c", "d")] == [True, True, True]
+    assert len(cache) == 3
+    assert cache.size == 3 * len(clip.samples)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+
+def test_an_oversized_clip_is_still_kept_on_its_own():
+    cache = ClipCache(max_bytes=10)
+    cache.put("big", _clip(100))
+    assert len(cache) == 1
+
+
+
+def test_null_sink_records_what_it_was_asked_to_play():
+    sink = NullSink()
+    clip = _clip(10)
+    sink.play(clip)
+    assert sink.played == [clip]
+
+
+
+def test_wav_file_sink_writes_one_decodable_file_per_clip(tmp_path):
+    sink = WavFileSink(tmp_path / "cries")
+    first, second = _clip(50), _clip(80, channels=2)
+    sink.play(first)
+    sink.play(second)
+
+    assert sorted(path.name for path in (tmp_path / "cries").iterdir()) == ["clip_0001.wav", "clip_0002.wav"]
+    assert decode_audio(sink.last_path.read_bytes()) == second
+
+
+
+def test_environment_selects_a_headless_sink(monkeypatch, tmp_path):
+    monkeypatch.setenv("POKEDEX_AUDIO_SINK", "null")
+    assert isinstance(default_sink(), NullSink)
+
+    monkeypatch.setenv("POKEDEX_AUDIO_SINK", f"wav:{tmp_path}")
+    sink = default_sink()
+    assert isinstance(sink, WavFileSink)
+    assert sink.directory == tmp_path
+
+
+
+def test_set_audio_sink_replaces_and_stops_the_previous_sink(monkeypatch):
+    monkeypatch.setattr(cry_player, "_sink", None)
+    monkeypatch.setattr(cry_player, "_sink_resolved", False)
+    stopped = []
+
+    class RecordingSink(NullSink):
+        def stop(self) -> None:
+            stopped.append(self)
+
+    first, second = RecordingSink(), NullSink()
+    cry_player.set_audio_sink(first)
+    assert cry_player.get_audio_sink() is first
+
+    cry_player.set_audio_sink(second)
+    assert cry_player.get_audio_sink() is second
+    assert stopped == [first]
+
+    cry_player.set_audio_sink(None)
+    assert cry_player.get_audio_sink() is None
@@ -0,0 +1,43 @@
+import csv
+import json
+
+from conftest import FIXTURE_COUNT
+from export_dex import CSV_NAME, JSONL_NAME, DexExporter
+
+
+
+def test_export_writes_every_entry_in_dex_order(client, tmp_path):
+    counts = DexExporter(tmp_path / "out", workers=4).run()
+    assert counts == {"exported": FIXTURE_COUNT, "skipped": 0, "failed": 0}
+
+    rows = [json.loads(line) for line in (tmp_path / "out" / JSONL_NAME).read_text(encoding="utf-8").splitlines()]
+    assert [row["id"] for row in rows] == list(range(1, FIXTURE_COUNT + 1))
+    assert all((tmp_path / "out" / row["sprite_file"]).is_file() for row in rows)
+    # The synthetic dex has no cries, so there is nothing to export for them.
+    assert all(row["cry_file"] is None for row in rows)
+
+    with open(tmp_path / "out" / CSV_NAME, encoding="utf-8", newline="") as handle:
+        assert [int(row["id"]) for row in csv.DictReader(handle)] == list(range(1, FIXTURE_COUNT + 1))
+
+
+
+def test_rerun_skips_entries_without_cries(client, tmp_path):
+    DexExporter(tmp_path / "out", workers=4).run()
+    assert DexExporter(tmp_path / "out", workers=4).run() == {"exported": 0, "skipped": FIXTURE_COUNT, "failed": 0}
+
+
+
+def test_rerun_resumes_only_missing_entries_and_assets(client, tmp_path):
+    out = tmp_path / "out"
+    DexExporter(out, workers=4).run()
+
+    lines = (out / JSONL_NAME).read_text(encoding="utf-8").splitlines(keepends=True)
+    # Interrupted mid-line after 10 entries, and one exported sprite went missing.
+    (out / JSONL_NAME).write_text("".join(lines[:10]) + lines[10][:20], encoding="utf-8")
+    (out / json.loads(lines[3])["sprite_file"]).unlink()
+
+    counts = DexExporter(out, formats=("jsonl",), workers=4).run()
+    assert counts == {"exported": FIXTURE_COUNT - 9, "skipped": 9, "failed": 0}
+    ids = [json.loads(line)["id"] for line in (out / JSONL_NAME).read_text(encoding="utf-8").splitlines()]
+    assert ids == list(range(1, FIXTURE_COUNT + 1))
+    assert (out / json.loads(lines[3])["sprite_file"]).is_file()
@@ -0,0 +1,96 @@
+import time
+
+import metrics
+from http_cache import HTTPCache, freshness_lifetime
+
+URL = "https://example.test/api/v2/pokemon/1/"
+
+
+
+def test_freshness_lifetime_follows_cache_control():
+    assert freshness_lifetime({"Cache-Control": "public, max-age=60"}) == 60
+    assert freshness_lifetime({"cache-control": "s-maxage=30, max-age=60"}) == 30
+    assert freshness_lifetime({"Cache-Control": "no-cache"}) == 0
+    assert freshness_lifetime({"Cache-Control": "no-store"}) is None
+
+
+
+def test_store_lookup_and_refresh(tmp_path):
+    cache = HTTPCache(tmp_path / "cache.sqlite3")
+    cache.store(URL, b"{}", {"ETag": '"v1"', "Cache-Control": "max-age=0"})
+
+    entry = cache.lookup(URL)
+    assert entry.body == b"{}"
+    assert not entry.is_fresh()
+    assert entry.validator_headers() == {"If-None-Match": '"v1"'}
+
+    cache.refresh(URL, {"Cache-Control": "max-age=60"})
+    assert cache.lookup(URL).is_fresh()
+    assert cache.lookup(URL).etag == '"v1"'
+
+
+
+def test_no_store_responses_are_dropped(tmp_path):
+    cache = HTTPCache(tmp_path / "cache.sqlite3")
+    cache.store(URL, b"old", {"Cache-Control": "max-age=60"})
+    cache.store(URL, b"new", {"Cache-Control": "no-store"})
+    assert cache.lookup(URL) is None
+
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HTTPCache(tmp_path / "cache.sqlite3", max_bytes=10)
+    cache.store(URL + "a", b"12345", {"Cache-Control": "max-age=60"})
+    cache.store(URL + "b", b"12345", {"Cache-Control": "max-age=60"})
+    cache.lookup(URL + "a")
+    cache.store(URL + "c", b"12345", {"Cache-Control": "max-age=60"})
+    assert cache.lookup(URL + "a") is not None
+    assert cache.lookup(URL + "b") is None
+    assert cache.total_bytes() == 10
+
+
+
+def _expire(client, seconds_ago: float) -> None:
+    cache = client.get_http_cache()
+    with cache._lock:
+        cache._conn.execute("UPDATE responses SET expires_at = ?", (time.time() - seconds_ago,))
+
+
+
+def test_expired_entries_are_revalidated_with_their_etag(client):
+    url = f"{client.BASE_URL}/pokemon/1/"
+    body = client._request(url)
+    _expire(client, client.STALE_WHILE_REVALIDATE_SECONDS + 60)
+
+    metrics.reset()
+    assert client._request(url) == body
+    counters = metrics.snapshot()["counters"]
+    assert counters["http_cache.revalidations"] == 1
+    assert counters["http.requests"] == 1
+    # The stand-in answered 304, which made the entry fresh again.
+    assert client.get_http_cache().lookup(url).is_fresh()
+
+
+
+def test_recently_expired_entries_are_served_stale_and_refreshed_in_the_background(client):
+    url = f"{client.BASE_URL}/pokemon/2/"
+    body = client._request(url)
+    _expire(client, 60)
+
+    metrics.reset()
+    assert client._request(url) == body
+    assert metrics.snapshot()["counters"]["http_cache.stale_served"] == 1
+
+    deadline = time.monotonic() + 5
+    while not client.get_http_cache().lookup(url).is_fresh():
+        assert time.monotonic() < deadline, "the background revalidation never finished"
+        time.sleep(0.01)
+
+
+
+def test_fresh_entries_need_no_request(client):
+    url = f"{client.BASE_URL}/pokemon/3/"
+    client._request(url)
+    metrics.reset()
+    client._request(url)
+    assert metrics.snapshot()["counters"] == {"http_cache.hits": 1}
@@ -0,0 +1,58 @@
+from urllib.parse import urlsplit
+
+import pytest
+
+from http_transport import HTTPTransport, TransportError
+
+
+
+class _DeadConnection:
+    """An idle pooled connection whose socket the server already closed."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    def request(self, *_args, **_kwargs) -> None:
+        self.requests += 1
+        raise BrokenPipeError("connection closed while idle")
+
+    def close(self) -> None:
+        pass
+
+
+
+def _pool_with_dead_connections(transport: HTTPTransport, url: str, count: int):
+    parts = urlsplit(url)
+    pool = transport._pool_for((parts.scheme, parts.hostname, parts.port))
+    dead = [_DeadConnection() for _ in range(count)]
+    pool.idle.extend(dead)
+    return pool, dead
+
+
+
+def test_stale_connection_is_retried_on_a_new_socket(stand_in):
+    transport = HTTPTransport()
+    url = f"{stand_in.rest_url}/pokemon/1/"
+    pool, dead = _pool_with_dead_connections(transport, url, 3)
+    try:
+        response = transport.get(url)
+    finally:
+        transport.close()
+
+    assert response.status == 200
+    # One dead socket was tried; the retry skipped the other idle ones, which were dropped.
+    assert sum(connection.requests for connection in dead) == 1
+    assert pool.idle == []
+
+
+
+def test_non_idempotent_requests_are_not_resent(stand_in):
+    transport = HTTPTransport()
+    pool, dead = _pool_with_dead_connections(transport, stand_in.graphql_url, 1)
+    try:
+        with pytest.raises(TransportError):
+            transport.request("POST", stand_in.graphql_url, body=b"{}")
+    finally:
+        transport.close()
+
+    assert dead[0].requests == 1
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from json_extract import SKIP_DEPTH, JSONExtractError, extract
+
+DOCUMENT = {
+    "id": 25,
+    "name": "pikachu",
+    "moves": [{"move": {"name": f"move-{n}", "url": "x"}, "details": [[n, {"a": "]}"}]]} for n in range(50)],
+    "tricky": "quotes \" and brackets ]}[{ and a backslash \\",
+    "deep": {"level": [[[[[[[[[[[[{"bottom": True}]]]]]]]]]]]]},
+    "sprites": {"front_default": "front.png", "versions": {"generation-i": {"red-blue": {"front_default": "rb.png"}}}},
+    "types": [{"type": {"name": "electric"}}],
+    "empty": {},
+    "nothing": None,
+}
+TEXT = json.dumps(DOCUMENT)
+
+
+
+def test_whole_values_match_json_loads():
+    spec = {key: True for key in DOCUMENT}
+    assert extract(TEXT, spec) == DOCUMENT
+    assert extract(TEXT.encode("utf-8"), spec) == DOCUMENT
+
+
+
+def test_only_requested_paths_are_kept():
+    spec = {"id": True, "sprites": {"versions": {"generation-i": True}}, "types": True, "missing": True}
+    assert extract(TEXT, spec) == {
+        "id": 25,
+        "sprites": {"versions": {"generation-i": {"red-blue": {"front_default": "rb.png"}}}},
+        "types": [{"type": {"name": "electric"}}],
+    }
+
+
+
+def test_skipped_values_may_contain_strings_that_look_like_structure():
+    assert extract(TEXT, {"tricky": True, "nothing": True}) == {"tricky": DOCUMENT["tricky"], "nothing": None}
+    assert extract(TEXT, {"empty": True}) == {"empty": {}}
+
+
+
+def test_containers_nested_deeper_than_the_skip_pattern_are_skipped_too():
+    nested = "[" * (SKIP_DEPTH + 5) + '"]"' + "]" * (SKIP_DEPTH + 5)
+    text = '{"deep": ' + nested + ', "id": 1}'
+    assert extract(text, {"id": True}) == {"id": 1}
+    assert extract(TEXT, {"deep": {"level": True}, "name": True}) == {"deep": DOCUMENT["deep"], "name": "pikachu"}
+
+
+
+@pytest.mark.parametrize("text", ['[1, 2]', '{"id": 1', '{"id" 1}', '{"moves": [1, 2}', '{"id": tru}'])
+def test_malformed_documents_raise(text):
+    with pytest.raises(JSONExtractError):
+        extract(text, {"id": True})
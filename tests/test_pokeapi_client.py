@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+import metrics
+from conftest import FIXTURE_COUNT
+from offline_pack import build_pack
+from pokeapi_async import AsyncPokeAPIClient, EventLoopThread
+from resilience import CircuitBreakers, RetryPolicy
+
+
+
+def test_dex_list_comes_in_pages_of_national_numbers(client):
+    pages = list(client.iter_pokedex("kanto", page_size=8))
+    assert [len(page) for page in pages] == [8, 8, 8, 6]
+    assert [pokemon.id for page in pages for pokemon in page] == list(range(1, FIXTURE_COUNT + 1))
+    assert client.get_original_151() == [pokemon for page in pages for pokemon in page]
+
+
+
+def test_details_are_built_from_both_payloads(client, fixtures_dir):
+    details = client.get_pokemon_details(7)
+    payload = json.loads((fixtures_dir / "rest" / "pokemon" / "7.json").read_text(encoding="utf-8"))
+
+    assert details.id == 7
+    assert details.types == tuple(entry["type"]["name"].title() for entry in payload["types"])
+    assert details.stats.hp == payload["stats"][0]["base_stat"]
+    assert details.genus == "Synthetic Pokémon"
+    assert details.flavor_text == "A synthetic entry number 7 for benchmarks."
+    assert details.image_url.startswith(client.BASE_URL.rsplit("/api/v2", 1)[0])
+    assert details.cry_url is None
+    assert client.get_image_bytes(details.image_url).startswith(b"\x89PNG")
+    # The record is cached, so asking again is free.
+    assert client.get_pokemon_details(7) is details
+
+
+
+def test_missing_entries_are_remembered(client):
+    metrics.reset()
+    with pytest.raises(client.NotFoundError):
+        client.get_pokemon_details(FIXTURE_COUNT + 1)
+    requests = metrics.snapshot()["counters"]["http.requests"]
+    with pytest.raises(client.NotFoundError):
+        client.get_pokemon_details(FIXTURE_COUNT + 1)
+    assert metrics.snapshot()["counters"]["http.requests"] == requests
+    assert metrics.snapshot()["counters"]["negative_cache.hits"] >= 1
+
+
+
+def test_many_details_skip_entries_that_fail(client):
+    details = client.get_many_details([3, FIXTURE_COUNT + 5, 1])
+    assert [entry.id for entry in details] == [3, 1]
+
+
+
+def test_type_chart_compiles_from_type_resources(client, fixtures_dir):
+    payload = json.loads((fixtures_dir / "rest" / "type" / "fire.json").read_text(encoding="utf-8"))
+    chart = client.get_type_chart()
+    for target in payload["damage_relations"]["double_damage_to"]:
+        assert chart.multiplier("Fire", [target["name"]]) == 2.0
+    for target in payload["damage_relations"]["half_damage_to"]:
+        assert chart.multiplier("Fire", [target["name"]]) == 0.5
+
+
+
+def test_offline_pack_serves_the_same_records(client, tmp_path):
+    online = client.get_many_details([pokemon.id for pokemon in client.get_original_151()])
+    pack = tmp_path / "kanto.pack"
+    assert build_pack(pack) == FIXTURE_COUNT
+
+    client.enable_offline_mode(pack)
+    try:
+        assert [pokemon.id for pokemon in client.get_original_151()] == list(range(1, FIXTURE_COUNT + 1))
+        assert client.get_many_details([entry.id for entry in online]) == online
+        assert client.get_type_chart().multipliers == client.TypeChart.from_relations(client.get_type_relations()).multipliers
+    finally:
+        client.disable_offline_mode()
+
+
+
+def test_async_client_shares_the_record_cache(client):
+    loop, async_client = EventLoopThread(), AsyncPokeAPIClient(concurrency=4)
+    try:
+        details = loop.run(async_client.get_many_details(range(1, 11)))
+        assert [entry.id for entry in details] == list(range(1, 11))
+        entry, image_data = loop.run(async_client.get_entry(4))
+        assert entry is details[3]
+        assert image_data.startswith(b"\x89PNG")
+    finally:
+        loop.stop()
+        async_client.close()
+
+
+
+def test_async_entry_fills_the_synchronous_caches(client):
+    loop, async_client = EventLoopThread(), AsyncPokeAPIClient(concurrency=4)
+    metrics.reset()
+    try:
+        entry, image_data = loop.run(async_client.get_entry(7))
+    finally:
+        loop.stop()
+        async_client.close()
+
+    # The /pokemon/ and /pokemon-species/ payloads, then the sprite.
+    assert metrics.snapshot()["counters"]["http.requests"] == 3
+    assert client.get_pokemon_details(7) is entry
+    assert client.get_image_bytes(entry.image_url) == image_data
+    assert metrics.snapshot()["counters"]["http.requests"] == 3
+
+
+
+def test_unreachable_host_is_retried_then_skipped_by_its_breaker(client, monkeypatch):
+    monkeypatch.setattr(client, "_retry_policy", RetryPolicy(attempts=2, base_delay=0.01))
+    monkeypatch.setattr(client, "_breakers", CircuitBreakers(failure_threshold=2, reset_after=60))
+    url = "http://127.0.0.1:9/api/v2/pokemon/1/"
+
+    metrics.reset()
+    with pytest.raises(client.PokeAPIError, match="Network error"):
+        client._request(url)
+    assert metrics.snapshot()["counters"]["http.retries"] == 1
+
+    with pytest.raises(client.PokeAPIError, match="not responding"):
+        client._request(url)
+    assert metrics.snapshot()["counters"]["http.circuit_open"] == 1
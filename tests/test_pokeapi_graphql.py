@@ -0,0 +1,66 @@
+import pytest
+
+import metrics
+from conftest import FIXTURE_COUNT, GRAPHQL_BATCH_SIZE
+from pokeapi_graphql import GraphQLBackend
+
+
+
+def _requests() -> int:
+    return metrics.snapshot()["counters"].get("http.requests", 0)
+
+
+
+def test_records_match_the_rest_backend(graphql_client):
+    details = graphql_client.get_pokemon_details(7)
+    rest = graphql_client.build_details(
+        graphql_client.get_pokemon_payload(7),
+        graphql_client.get_species_payload(7),
+    )
+    assert details == rest
+    assert graphql_client.get_image_bytes(details.image_url).startswith(b"\x89PNG")
+
+
+
+def test_dex_list_and_details_come_in_batches(graphql_client):
+    metrics.reset()
+    assert [pokemon.id for pokemon in graphql_client.get_original_151()] == list(range(1, FIXTURE_COUNT + 1))
+    assert _requests() == 1
+
+    # One query loads the whole page holding #3; the rest of the dex takes one query per remaining page.
+    graphql_client.get_pokemon_details(3)
+    assert _requests() == 2
+    details = graphql_client.get_many_details(list(range(1, FIXTURE_COUNT + 1)))
+    assert [entry.id for entry in details] == list(range(1, FIXTURE_COUNT + 1))
+    assert _requests() == 2 + (FIXTURE_COUNT - GRAPHQL_BATCH_SIZE) // GRAPHQL_BATCH_SIZE
+
+
+
+def test_missing_ids_are_remembered(graphql_client):
+    metrics.reset()
+    with pytest.raises(graphql_client.NotFoundError):
+        graphql_client.get_pokemon_details(FIXTURE_COUNT + 1)
+    assert _requests() == 1
+
+    with pytest.raises(graphql_client.NotFoundError):
+        graphql_client.get_pokemon_details(FIXTURE_COUNT + 1)
+    # The rest of that page was missing too, so batches skip it without asking again.
+    assert graphql_client.get_many_details([FIXTURE_COUNT + 2, FIXTURE_COUNT + 3]) == []
+    assert _requests() == 1
+    assert metrics.snapshot()["counters"]["negative_cache.hits"] >= 1
+
+
+
+def test_failing_endpoint_falls_back_to_rest(graphql_client, stand_in, monkeypatch):
+    monkeypatch.setattr(graphql_client, "_graphql_backend", GraphQLBackend(f"{stand_in.base_url}/no-graphql"))
+    metrics.reset()
+
+    details = graphql_client.get_pokemon_details(5)
+    assert details.id == 5
+    assert metrics.snapshot()["counters"]["graphql.rest_fallbacks"] == 1
+
+    # Until GRAPHQL_RETRY_SECONDS pass, REST answers without trying GraphQL first.
+    requests = _requests()
+    assert [pokemon.id for pokemon in graphql_client.get_original_151()] == list(range(1, FIXTURE_COUNT + 1))
+    assert _requests() == requests + 1
+    assert metrics.snapshot()["counters"]["graphql.rest_fallbacks"] == 1
@@ -0,0 +1,53 @@
+import threading
+import time
+
+from pokemon_models import BaseStats, PokemonDetails, PokemonSummary
+from prefetch import PrefetchEngine
+
+TIMEOUT = 5
+
+
+
+def _summary(pokemon_id: int) -> PokemonSummary:
+    return PokemonSummary(pokemon_id, f"Mon {pokemon_id}", f"mon-{pokemon_id}")
+
+
+
+def _details(pokemon_id: int) -> PokemonDetails:
+    return PokemonDetails(pokemon_id, f"Mon {pokemon_id}", 1.0, 1.0, ("Normal",), (), BaseStats(), "", "", None, None)
+
+
+
+def test_restart_ignores_workers_from_the_previous_run():
+    started, release, finished = threading.Event(), threading.Event(), threading.Event()
+    progress = []
+
+    def coalesce(key, _fn):
+        _, pokemon_id = key
+        if pokemon_id == 1:
+            started.set()
+            release.wait(TIMEOUT)
+        return _details(pokemon_id)
+
+    def on_progress(done, failed, total):
+        progress.append((done, failed, total))
+        if done + failed >= total:
+            finished.set()
+
+    engine = PrefetchEngine(on_progress=on_progress, workers=2, coalesce=coalesce)
+    try:
+        engine.start([_summary(1)])
+        assert started.wait(TIMEOUT)
+
+        engine.start([_summary(2), _summary(3)])
+        assert finished.wait(TIMEOUT)
+        release.set()
+        time.sleep(0.05)  # let the first run's worker finish its entry
+        assert engine.finished
+    finally:
+        release.set()
+        engine.cancel()
+
+    # The slow entry from the first run finished during the second one and must not count there.
+    assert progress[-1] == (2, 0, 2)
+    assert all(done + failed <= total for done, failed, total in progress)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+from request_scheduler import InFlightTable, RequestScheduler
+
+TIMEOUT = 5
+
+
+
+def test_only_the_newest_generation_is_delivered():
+    scheduler = RequestScheduler(workers=2)
+    delivered, errors = [], []
+    started, release, finished = threading.Event(), threading.Event(), threading.Event()
+    stages = []
+
+    def slow_job(is_current):
+        started.set()
+        release.wait(TIMEOUT)
+        stages.append(("first", is_current()))
+        return "first"
+
+    def fast_job(_is_current):
+        return "second"
+
+    try:
+        first = scheduler.begin()
+        scheduler.submit(first, slow_job, delivered.append, errors.append)
+        assert started.wait(TIMEOUT)
+
+        second = scheduler.begin()
+        scheduler.submit(second, fast_job, lambda result: (delivered.append(result), finished.set()), errors.append)
+        assert finished.wait(TIMEOUT)
+        release.set()
+
+        # A third request that is superseded before a worker picks it up never runs.
+        third = scheduler.begin()
+        scheduler.begin()
+        scheduler.submit(third, lambda _is_current: stages.append(("third", True)), delivered.append, errors.append)
+    finally:
+        scheduler.shutdown()
+        for thread in scheduler._threads:
+            thread.join(TIMEOUT)
+
+    assert delivered == ["second"]
+    assert errors == []
+    assert stages == [("first", False)]
+
+
+
+def test_errors_only_reach_the_current_generation():
+    scheduler = RequestScheduler(workers=1)
+    errors, done = [], threading.Event()
+
+    def failing(_is_current):
+        raise ValueError("boom")
+
+    try:
+        generation = scheduler.begin()
+        scheduler.submit(generation, failing, lambda _result: None, lambda exc: (errors.append(exc), done.set()))
+        assert done.wait(TIMEOUT)
+    finally:
+        scheduler.shutdown()
+    assert [str(exc) for exc in errors] == ["boom"]
+
+
+
+def test_concurrent_calls_for_one_key_share_a_single_execution():
+    table = InFlightTable()
+    calls, results = [], []
+    entered, release = threading.Event(), threading.Event()
+
+    def fetch():
+        calls.append(1)
+        entered.set()
+        release.wait(TIMEOUT)
+        return "payload"
+
+    owner = threading.Thread(target=lambda: results.append(table.run("details", fetch)))
+    owner.start()
+    assert entered.wait(TIMEOUT)
+    joiners = [threading.Thread(target=lambda: results.append(table.run("details", fetch))) for _ in range(3)]
+    for thread in joiners:
+        thread.start()
+    # Give the joiners time to block on the owner's call before it finishes.
+    for thread in joiners:
+        thread.join(0.05)
+    release.set()
+    for thread in [owner] + joiners:
+        thread.join(TIMEOUT)
+
+    assert results == ["payload"] * 4
+    assert len(calls) == 1
+    # Once the call is over the key is free again.
+    assert table.run("details", lambda: "again") == "again"
+
+
+
+def test_a_coroutine_joins_a_blocking_call_for_the_same_key():
+    table = InFlightTable()
+    calls = []
+    entered, release = threading.Event(), threading.Event()
+
+    def fetch():
+        calls.append("sync")
+        entered.set()
+        release.wait(TIMEOUT)
+        return "payload"
+
+    async def fetch_async():
+        calls.append("async")
+        return "other"
+
+    async def join():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, release.set)
+        return await table.run_async("details", fetch_async)
+
+    owner = threading.Thread(target=lambda: table.run("details", fetch))
+    owner.start()
+    assert entered.wait(TIMEOUT)
+    assert asyncio.run(join()) == "payload"
+    owner.join(TIMEOUT)
+    assert calls == ["sync"]
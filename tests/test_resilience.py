@@ -0,0 +1,65 @@
+import time
+
+from resilience import CircuitBreaker, CircuitBreakers, NegativeCache, RetryPolicy
+
+
+
+def test_retry_delays_are_bounded_and_counted():
+    policy = RetryPolicy(attempts=4, base_delay=0.5, max_delay=1.0)
+    delays = list(policy.delays())
+    assert len(delays) == 3
+    assert all(0 <= delay <= bound for delay, bound in zip(delays, (0.5, 1.0, 1.0)))
+
+
+
+def test_retry_after_accepts_seconds_only():
+    assert RetryPolicy.retry_after("2", cap=4.0) == 2.0
+    assert RetryPolicy.retry_after("120", cap=4.0) == 4.0
+    assert RetryPolicy.retry_after("Wed, 21 Oct 2026 07:28:00 GMT", cap=4.0) is None
+    assert RetryPolicy.retry_after(None, cap=4.0) is None
+
+
+
+def test_breaker_opens_after_consecutive_failures_and_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=3, reset_after=0.05)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert not breaker.allow()
+    assert breaker.retry_in() > 0
+    time.sleep(0.06)
+    assert breaker.allow()
+    # Only one probe at a time while half-open.
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.retry_in() == 0
+
+
+
+def test_breakers_are_per_host():
+    breakers = CircuitBreakers(failure_threshold=1)
+    breakers.for_url("https://pokeapi.co/api/v2/pokemon/1/").record_failure()
+    assert not breakers.for_url("https://pokeapi.co/api/v2/pokemon/2/").allow()
+    assert breakers.for_url("https://raw.githubusercontent.com/sprite.png").allow()
+
+
+
+def test_negative_cache_expires_and_stays_bounded():
+    cache = NegativeCache(ttl=0.05, max_entries=2)
+    cache.put("a", 404)
+    assert cache.get("a") == 404
+    cache.put("b", 410)
+    cache.put("c", 404)
+    assert cache.get("a") is None
+    time.sleep(0.06)
+    assert cache.get("c") is None
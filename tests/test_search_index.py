@@ -0,0 +1,68 @@
+from pokemon_models import BaseStats, PokemonDetails, PokemonSummary
+from search_index import SearchIndex
+
+NAMES = {1: "Bulbasaur", 2: "Ivysaur", 4: "Charmander", 20: "Raticate", 25: "Pikachu", 102: "Exeggcute", 120: "Staryu"}
+
+
+
+def make_index() -> SearchIndex:
+    return SearchIndex(PokemonSummary(pokemon_id, name, name.lower()) for pokemon_id, name in NAMES.items())
+
+
+
+def ids(results):
+    return [pokemon.id for pokemon in results]
+
+
+
+def test_exact_number_ranks_first():
+    assert ids(make_index().search("25")) == [25]
+    assert ids(make_index().search("#2"))[0] == 2
+
+
+
+def test_zero_padded_query_typed_incrementally_keeps_the_exact_number():
+    index = make_index()
+    index.search("0")
+    index.search("00")
+    typed = index.search("002")
+    assert typed == make_index().search("002")
+    assert ids(typed)[0] == 2
+
+
+
+def test_narrowing_matches_a_fresh_search():
+    index = make_index()
+    for prefix in ("c", "ch", "cha", "char"):
+        assert index.search(prefix) == make_index().search(prefix)
+    assert ids(index.search("char")) == [4]
+
+
+
+def test_prefix_ranks_before_substring():
+    assert ids(make_index().search("c")) == [4, 20, 25, 102]
+    assert ids(make_index().search("saur")) == [2, 1]
+
+
+
+def test_typo_falls_back_to_fuzzy_matching():
+    assert ids(make_index().search("pikachoo")) == [25]
+
+
+
+def test_details_make_types_and_abilities_searchable():
+    index = make_index()
+    assert index.search("grass") == []
+    index.add_details(PokemonDetails(
+        id=1, name="Bulbasaur", height_m=0.7, weight_kg=6.9, types=("Grass", "Poison"), abilities=("Overgrow",),
+        stats=BaseStats(45, 49, 49, 65, 65, 45), genus="Seed Pokémon", flavor_text="", image_url=None, cry_url=None,
+    ))
+    assert ids(index.search("grass")) == [1]
+
+
+
+def test_extend_widens_a_narrowed_query():
+    index = make_index()
+    assert ids(index.search("bu")) == [1]
+    index.extend([PokemonSummary(152, "Chikorita", "chikorita"), PokemonSummary(153, "Bulbabuddy", "bulbabuddy")])
+    assert ids(index.search("bul")) == [1, 153]
@@ -0,0 +1,25 @@
+import pytest
+
+import sprite_atlas
+from sprite_atlas import SpriteAtlas, atlas_paths, build_atlas
+
+
+
+def test_each_dex_has_its_own_files_under_the_current_cache_dir(client, tmp_path):
+    kanto, national = atlas_paths("kanto"), atlas_paths("national")
+    assert kanto != national
+    assert all(path.parent == client.CACHE_DIR for path in kanto + national)
+    assert client.CACHE_DIR.is_relative_to(tmp_path)
+
+
+
+def test_atlases_for_two_dexes_do_not_overwrite_each_other(client):
+    if not sprite_atlas.atlas_available():
+        pytest.skip("Pillow is not installed")
+    pokemon = client.get_original_151()
+    assert build_atlas("kanto", pokemon[:4]) is not None
+    assert build_atlas("national", pokemon[:9]) is not None
+
+    assert sorted(SpriteAtlas.load("kanto").boxes) == [entry.id for entry in pokemon[:4]]
+    assert sorted(SpriteAtlas.load("national").boxes) == [entry.id for entry in pokemon[:9]]
+    assert SpriteAtlas.load("johto") is None
@@ -0,0 +1,70 @@
+import pytest
+
+import stat_analytics
+from pokemon_models import BaseStats, PokemonDetails
+from stat_analytics import StatMatrix, StatQueryError, resolve_stat
+
+ENGINES = [False] + ([True] if stat_analytics.numpy_available() else [])
+
+
+
+def entry(pokemon_id, name, types, *stats):
+    return PokemonDetails(
+        id=pokemon_id, name=name, height_m=1.0, weight_kg=10.0, types=types, abilities=(),
+        stats=BaseStats(*stats), genus="", flavor_text="", image_url=None, cry_url=None,
+    )
+
+
+
+DEX = [
+    entry(1, "Bulbasaur", ("Grass", "Poison"), 45, 49, 49, 65, 65, 45),
+    entry(4, "Charmander", ("Fire",), 39, 52, 43, 60, 50, 65),
+    entry(7, "Squirtle", ("Water",), 44, 48, 65, 50, 64, 43),
+    entry(25, "Pikachu", ("Electric",), 35, 55, 40, 50, 50, 90),
+    entry(54, "Psyduck", ("Water",), 50, 52, 48, 65, 50, 55),
+    entry(60, "Poliwag", ("Water",), 40, 50, 40, 40, 40, 90),
+    entry(143, "Snorlax", ("Normal",), 160, 110, 65, 65, 110, 30),
+]
+
+
+
+@pytest.fixture(params=ENGINES, ids=lambda numpy: "numpy" if numpy else "python")
+def matrix(request):
+    return StatMatrix(reversed(DEX), use_numpy=request.param)
+
+
+
+def test_resolve_stat_accepts_fields_labels_and_aliases():
+    assert resolve_stat("speed") == resolve_stat("Speed")
+    assert resolve_stat("Special Attack") == resolve_stat("special-attack") == 3
+    assert resolve_stat("bst") == resolve_stat("total") == 6
+    with pytest.raises(StatQueryError):
+        resolve_stat("luck")
+
+
+
+def test_top_breaks_ties_by_id(matrix):
+    assert [(row.id, row.score) for row in matrix.top("speed", 3)] == [(25, 90), (60, 90), (4, 65)]
+    assert [row.id for row in matrix.top("speed", 2, type_name="water")] == [60, 54]
+    assert [row.id for row in matrix.top("total", 1, lowest=True)] == [60]
+    assert matrix.top("speed", 3, type_name="Dragon") == []
+
+
+
+def test_percentile_counts_ties_half(matrix):
+    assert matrix.percentile(143, "hp") == pytest.approx(100 * 6.5 / 7)
+    assert matrix.percentile(25, "speed") == pytest.approx(100 * 6 / 7)
+    assert matrix.percentile(7, "defense", type_name="water") == pytest.approx(100 * 2.5 / 3)
+    labels = [label for label, _, _ in matrix.percentiles(1)]
+    assert labels[-1] == "Total" and len(labels) == 7
+    with pytest.raises(StatQueryError):
+        matrix.percentile(999, "hp")
+
+
+
+def test_similar_is_nearest_by_euclidean_distance(matrix):
+    nearest = matrix.similar(7, 2)
+    assert [row.id for row in nearest] == [1, 54]
+    assert nearest[0].score == pytest.approx(sum((a - b) ** 2 for a, b in zip(DEX[2].stats, DEX[0].stats)) ** 0.5)
+    assert all(row.id != 7 for row in matrix.similar(7, 10))
+    assert [row.id for row in matrix.similar(7, 5, type_name="water")] == [54, 60]
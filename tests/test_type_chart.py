@@ -0,0 +1,90 @@
+import pytest
+
+import type_chart
+from pokemon_models import BaseStats, PokemonDetails
+from type_chart import MAX_TEAM_SIZE, TypeChart, TypeChartError, format_multiplier
+
+RELATIONS = {
+    "Fire": {"Grass": 2.0, "Ice": 2.0, "Bug": 2.0, "Steel": 2.0, "Fire": 0.5, "Water": 0.5, "Rock": 0.5, "Dragon": 0.5},
+    "Water": {"Fire": 2.0, "Ground": 2.0, "Rock": 2.0, "Water": 0.5, "Grass": 0.5, "Dragon": 0.5},
+    "Grass": {"Water": 2.0, "Ground": 2.0, "Rock": 2.0, "Fire": 0.5, "Grass": 0.5, "Poison": 0.5, "Flying": 0.5,
+              "Bug": 0.5, "Dragon": 0.5, "Steel": 0.5},
+    "Electric": {"Water": 2.0, "Flying": 2.0, "Electric": 0.5, "Grass": 0.5, "Dragon": 0.5, "Ground": 0.0},
+    "Ground": {"Fire": 2.0, "Electric": 2.0, "Poison": 2.0, "Rock": 2.0, "Steel": 2.0, "Grass": 0.5, "Bug": 0.5,
+               "Flying": 0.0},
+    "Rock": {"Fire": 2.0, "Ice": 2.0, "Flying": 2.0, "Bug": 2.0, "Fighting": 0.5, "Ground": 0.5, "Steel": 0.5},
+    "Ice": {"Grass": 2.0, "Ground": 2.0, "Flying": 2.0, "Dragon": 2.0, "Fire": 0.5, "Water": 0.5, "Ice": 0.5, "Steel": 0.5},
+}
+
+
+
+def entry(pokemon_id, name, *types):
+    return PokemonDetails(
+        id=pokemon_id, name=name, height_m=1.0, weight_kg=10.0, types=types, abilities=(),
+        stats=BaseStats(), genus="", flavor_text="", image_url=None, cry_url=None,
+    )
+
+
+
+@pytest.fixture
+def chart():
+    return TypeChart.from_relations(RELATIONS)
+
+
+
+def test_dual_types_multiply(chart):
+    assert chart.multiplier("Rock", ["fire", "flying"]) == 4.0
+    assert chart.multiplier("Electric", ["Water", "Ground"]) == 0.0
+    assert chart.multiplier("Normal", ["Ghost"]) == 1.0
+
+
+
+def test_weaknesses_resistances_and_immunities(chart):
+    assert chart.weaknesses(["Fire", "Flying"])[0] == ("Rock", 4.0)
+    assert {m.type for m in chart.weaknesses(["Fire", "Flying"])} == {"Rock", "Water", "Electric"}
+    assert ("Grass", 0.25) in chart.resistances(["Fire", "Flying"])
+    assert chart.immunities(["Fire", "Flying"]) == ["Ground"]
+
+
+
+def test_unknown_types_and_oversized_teams_are_rejected(chart):
+    with pytest.raises(TypeChartError):
+        chart.weaknesses(["Sound"])
+    with pytest.raises(TypeChartError):
+        chart.weaknesses(["Fire", "Water", "Grass"])
+    with pytest.raises(TypeChartError):
+        chart.team_coverage([["Fire"]] * (MAX_TEAM_SIZE + 1))
+
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_best_counters_rank_offense_then_risk_then_id(chart, vectorized):
+    if vectorized and type_chart._numpy() is None:
+        pytest.skip("NumPy is not installed")
+    if not vectorized:
+        chart._array = None
+    candidates = [
+        entry(1, "Bulbasaur", "Grass", "Poison"),
+        entry(7, "Squirtle", "Water"),
+        entry(74, "Geodude", "Rock", "Ground"),
+        entry(95, "Onix", "Rock", "Ground"),
+        entry(25, "Pikachu", "Electric"),
+        entry(230, "Kingdra", "Water", "Dragon"),
+    ]
+    counters = chart.best_counters(["Fire"], candidates, count=3)
+    # Everything but Bulbasaur and Pikachu deals 2x; Water/Dragon takes the least back.
+    assert [(c.id, c.offense, c.risk) for c in counters] == [(230, 2.0, 0.25), (7, 2.0, 0.5), (74, 2.0, 0.5)]
+
+
+
+def test_team_coverage_reports_gaps(chart):
+    coverage = chart.team_coverage([["Fire"], ["Water"], ["Grass"]])
+    assert coverage.offense["Grass"] == 2.0
+    assert "Dragon" in coverage.offensive_gaps
+    assert coverage.weak["Rock"] == 1 and coverage.resist["Fire"] == 2
+    assert "Rock" in coverage.defensive_gaps and "Fire" not in coverage.defensive_gaps
+
+
+
+def test_format_multiplier():
+    assert [format_multiplier(value) for value in (0.0, 0.25, 0.5, 1.0, 4.0)] == ["x0", "x¼", "x½", "x1", "x4"]
@@ -0,0 +1,279 @@
+"""
+Type effectiveness as a dense 18 x 18 multiplier array.
+
+`TypeChart.from_relations` compiles the damage relations of PokéAPI's
+`/type/{name}/` resources (fetched and cached once by
+`pokeapi_client.get_type_chart`) into `multipliers[attacking][defending]`,
+with a 19th all-ones column standing in for "no second type". After that
+every query is array lookups:
+
+- `defense(types)`: what each attacking type does to a (dual-)type, from
+  which `weaknesses`, `resistances` and `immunities` are cut
+- `best_counters(types, candidates)`: candidates whose own types hit hardest
+  and take the least back; vectorized over the whole dex with NumPy
+- `team_coverage(team)`: for up to six members, the best multiplier the team
+  deals to each type and how many members are weak to / resist each type,
+  plus the gaps on both sides
+
+It needs no Tk, so it works headlessly too:
+
+    python type_chart.py weak fire flying
+    python type_chart.py counters gyarados
+    python type_chart.py team charizard blastoise venusaur --dex kanto
+"""
+
+import argparse
+import heapq
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pokemon_models import PokemonDetails
+
+TYPES = (
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice", "Fighting", "Poison", "Ground",
+    "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+)
+TYPE_INDEX = {name: index for index, name in enumerate(TYPES)}
+NO_TYPE = len(TYPES)
+MAX_TEAM_SIZE = 6
+
+Relations = Dict[str, Dict[str, float]]
+
+
+class TypeChartError(Exception):
+    """Raised for an unknown type name or a team larger than `MAX_TEAM_SIZE`."""
+
+
+
+class Matchup(NamedTuple):
+    type: str
+    multiplier: float
+
+
+
+class Counter(NamedTuple):
+    id: int
+    name: str
+    types: Tuple[str, ...]
+    offense: float  # best multiplier the counter's own types deal to the target
+    risk: float  # best multiplier the target's own types deal to the counter
+
+
+
+class TeamCoverage(NamedTuple):
+    offense: Dict[str, float]
+    weak: Dict[str, int]
+    resist: Dict[str, int]
+    offensive_gaps: Tuple[str, ...]  # types no member hits super effectively
+    defensive_gaps: Tuple[str, ...]  # attacking types more members are weak to than resist
+
+
+
+@lru_cache(maxsize=1)
+def _numpy():
+    # Imported when the first chart is built rather than with the module, to keep the app's cold start light.
+    try:
+        import numpy  # pyright: ignore[reportMissingImports]
+    except Exception:  # pragma: no cover - optional dependency fallback
+        return None
+    return numpy
+
+
+
+class TypeChart:
+    def __init__(self, multipliers: Sequence[Sequence[float]]) -> None:
+        if len(multipliers) != len(TYPES) or any(len(row) != len(TYPES) for row in multipliers):
+            raise TypeChartError(f"A type chart needs {len(TYPES)} x {len(TYPES)} multipliers.")
+        self.multipliers: Tuple[Tuple[float, ...], ...] = tuple(tuple(float(value) for value in row) + (1.0,) for row in multipliers)
+        numpy = _numpy()
+        self._array = numpy.array(self.multipliers, dtype=numpy.float64) if numpy is not None else None
+
+    @classmethod
+    def from_relations(cls, relations: Relations) -> "TypeChart":
+        """Build from `{attacking: {defending: multiplier}}`; pairs that are not listed are 1x."""
+        multipliers = [[1.0] * len(TYPES) for _ in TYPES]
+        for attacking, targets in relations.items():
+            row = TYPE_INDEX.get(attacking.title())
+            if row is None:
+                continue
+            for defending, multiplier in targets.items():
+                column = TYPE_INDEX.get(defending.title())
+                if column is not None:
+                    multipliers[row][column] = float(multiplier)
+        return cls(multipliers)
+
+    @staticmethod
+    def index(type_name: str) -> int:
+        index = TYPE_INDEX.get(type_name.strip().title())
+        if index is None:
+            raise TypeChartError(f"Unknown type {type_name!r}.")
+        return index
+
+    def _columns(self, types: Sequence[str]) -> Tuple[int, int]:
+        if not 1 <= len(types) <= 2:
+            raise TypeChartError("A Pokémon has one or two types.")
+        first = self.index(types[0])
+        return first, self.index(types[1]) if len(types) > 1 else NO_TYPE
+
+    def multiplier(self, attacking: str, defending: Sequence[str]) -> float:
+        first, second = self._columns(defending)
+        row = self.multipliers[self.index(attacking)]
+        return row[first] * row[second]
+
+    def defense(self, types: Sequence[str]) -> List[Matchup]:
+        """The multiplier every attacking type deals to `types`, in `TYPES` order."""
+        first, second = self._columns(types)
+        return [Matchup(name, row[first] * row[second]) for name, row in zip(TYPES, self.multipliers)]
+
+    def weaknesses(self, types: Sequence[str]) -> List[Matchup]:
+        return sorted((m for m in self.defense(types) if m.multiplier > 1), key=lambda m: -m.multiplier)
+
+    def resistances(self, types: Sequence[str]) -> List[Matchup]:
+        return sorted((m for m in self.defense(types) if 0 < m.multiplier < 1), key=lambda m: m.multiplier)
+
+    def immunities(self, types: Sequence[str]) -> List[str]:
+        return [m.type for m in self.defense(types) if m.multiplier == 0]
+
+    def best_counters(
+        self,
+        types: Sequence[str],
+        candidates: Iterable[PokemonDetails],
+        count: int = 5,
+    ) -> List[Counter]:
+        """
+        Candidates ranked by the best multiplier their own types deal to `types`,
+        then by the least damage the target's own types deal back, then by id.
+        """
+        first, second = self._columns(types)
+        target_types = [first] if second == NO_TYPE else [first, second]
+        pool = [entry for entry in candidates if entry.types and all(t in TYPE_INDEX for t in entry.types[:2])]
+        if count <= 0 or not pool:
+            return []
+
+        own_first = [TYPE_INDEX[entry.types[0]] for entry in pool]
+        own_second = [TYPE_INDEX[entry.types[1]] if len(entry.types) > 1 else NO_TYPE for entry in pool]
+
+        if self._array is not None:
+            numpy = _numpy()
+            chart = self._array
+            first_column, second_column = numpy.array(own_first), numpy.array(own_second)
+            attack = chart[:, first] * chart[:, second]
+            # A single-typed attacker only has its first type to attack with.
+            offense = numpy.maximum(attack[first_column], attack[numpy.where(second_column == NO_TYPE, first_column, second_column)])
+            risk = (chart[target_types][:, first_column] * chart[target_types][:, second_column]).max(axis=0)
+            ids = numpy.array([entry.id for entry in pool])
+            order = numpy.lexsort((ids, risk, -offense))[:count].tolist()
+            scores = [(offense[position].item(), risk[position].item()) for position in order]
+        else:
+            chart = self.multipliers
+            attack = [row[first] * row[second] for row in chart]
+
+            def scored(position: int) -> Tuple[float, float, int, int]:
+                own = own_first[position], own_second[position]
+                offense = max(attack[t] for t in own if t != NO_TYPE)
+                risk = max(chart[t][own[0]] * chart[t][own[1]] for t in target_types)
+                return -offense, risk, pool[position].id, position
+
+            best = heapq.nsmallest(count, (scored(position) for position in range(len(pool))))
+            order = [position for *_, position in best]
+            scores = [(-negative_offense, risk) for negative_offense, risk, _, _ in best]
+
+        return [
+            Counter(pool[position].id, pool[position].name, pool[position].types, offense, risk)
+            for position, (offense, risk) in zip(order, scores)
+        ]
+
+    def team_coverage(self, team: Sequence[Sequence[str]]) -> TeamCoverage:
+        """Offensive and defensive coverage of up to `MAX_TEAM_SIZE` members, each given as its types."""
+        if len(team) > MAX_TEAM_SIZE:
+            raise TypeChartError(f"A team has at most {MAX_TEAM_SIZE} members.")
+        members = [self._columns(types) for types in team]
+        attacking = sorted({t for member in members for t in member if t != NO_TYPE})
+
+        offense = {
+            name: max((self.multipliers[t][column] for t in attacking), default=0.0)
+            for column, name in enumerate(TYPES)
+        }
+        weak = dict.fromkeys(TYPES, 0)
+        resist = dict.fromkeys(TYPES, 0)
+        for row, name in zip(self.multipliers, TYPES):
+            for first, second in members:
+                taken = row[first] * row[second]
+                if taken > 1:
+                    weak[name] += 1
+                elif taken < 1:
+                    resist[name] += 1
+
+        return TeamCoverage(
+            offense=offense,
+            weak=weak,
+            resist=resist,
+            offensive_gaps=tuple(name for name in TYPES if offense[name] <= 1),
+            defensive_gaps=tuple(name for name in TYPES if weak[name] > resist[name]),
+        )
+
+
+
+def format_multiplier(value: float) -> str:
+    return {0.25: "x¼", 0.5: "x½"}.get(value, f"x{value:g}")
+
+
+
+def _resolve(pokemon: Sequence[PokemonDetails], key: str) -> PokemonDetails:
+    wanted = key.strip().lower().replace("-", " ")
+    for entry in pokemon:
+        if (key.isdigit() and entry.id == int(key)) or entry.name.lower() == wanted:
+            return entry
+    raise TypeChartError(f"No entry of this dex is called {key!r}.")
+
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from pokeapi_client import DEXES, PokeAPIError, enable_offline_mode, get_many_details, get_pokedex, get_type_relations
+
+    parser = argparse.ArgumentParser(description="Type matchups, counters and team coverage.")
+    parser.add_argument("--dex", choices=list(DEXES), default="kanto", help="dex counters and team members come from")
+    parser.add_argument("--offline", metavar="PACK", type=Path, help="read everything from an offline data pack")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    weak = subcommands.add_parser("weak", help="weaknesses, resistances and immunities of one or two types")
+    weak.add_argument("types", nargs="+")
+    counters = subcommands.add_parser("counters", help="entries of the dex that counter one entry")
+    counters.add_argument("pokemon", help="national number or name")
+    counters.add_argument("--count", type=int, default=5)
+    team = subcommands.add_parser("team", help=f"coverage gaps of up to {MAX_TEAM_SIZE} entries")
+    team.add_argument("members", nargs="+", help="national numbers or names")
+    args = parser.parse_args(argv)
+
+    if args.offline is not None:
+        enable_offline_mode(args.offline)
+    try:
+        # Not `get_type_chart()`: run as a script, this module's classes are not the ones the client imported.
+        chart = TypeChart.from_relations(get_type_relations())
+        if args.command == "weak":
+            print("Weak to:   " + ", ".join(f"{m.type} {format_multiplier(m.multiplier)}" for m in chart.weaknesses(args.types)))
+            print("Resists:   " + ", ".join(f"{m.type} {format_multiplier(m.multiplier)}" for m in chart.resistances(args.types)))
+            print("Immune to: " + (", ".join(chart.immunities(args.types)) or "-"))
+            return 0
+
+        pokemon = get_many_details([entry.id for entry in get_pokedex(args.dex)])
+        if args.command == "counters":
+            target = _resolve(pokemon, args.pokemon)
+            others = [entry for entry in pokemon if entry.id != target.id]
+            for counter in chart.best_counters(target.types, others, args.count):
+                print(f"#{counter.id:03} {counter.name:<14} {'/'.join(counter.types):<16} "
+                      f"deals {format_multiplier(counter.offense)}, takes {format_multiplier(counter.risk)}")
+        else:
+            coverage = chart.team_coverage([_resolve(pokemon, key).types for key in args.members])
+            print("No super-effective hit on: " + (", ".join(coverage.offensive_gaps) or "-"))
+            print("Team is weak to:           " + (", ".join(coverage.defensive_gaps) or "-"))
+    except (TypeChartError, PokeAPIError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,29 @@
 import base64
 import io
 import tkinter as tk
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 
-try:
-    from PIL import Image, ImageTk  # pyright: ignore[reportMissingImports]
-except Exception:  # pragma: no cover - optional dependency fallback
-    Image = None
-    ImageTk = None
+import metrics
+from sprite_pipeline import PreparedSprite, decode_sprite, fit_scale, pil_image, scale_sprite
+
+_image_tk_loaded = False
+_image_tk = None
+
+
+
+def pil_image_tk():
+    """Pillow's `ImageTk` module, imported on first call; None when Pillow is not installed."""
+    global _image_tk_loaded, _image_tk
+    if not _image_tk_loaded:
+        if pil_image() is not None:
+            try:
+                from PIL import ImageTk  # pyright: ignore[reportMissingImports]
+            except Exception:  # pragma: no cover - Pillow built without Tk support
+                ImageTk = None
+            _image_tk = ImageTk
+        _image_tk_loaded = True
+    return _image_tk
 
 
 def set_readonly_text(widget: tk.Text, content: str) -> None:
@@ -17,19 +34,121 @@ def set_readonly_text(widget: tk.Text, content: str) -> None:
 
 
 
+def pil_to_photoimage(image):
+    """Wrap an already decoded Pillow image (e.g. an atlas thumbnail) for Tk."""
+    return pil_image_tk().PhotoImage(image)
+
+
+
 def image_bytes_to_photoimage(image_data: bytes, max_width: int, max_height: int):
     """Return a pixel-crisp image scaled to fit inside the given box."""
     safe_max_width = max(1, int(max_width))
     safe_max_height = max(1, int(max_height))
 
-    if Image is not None and ImageTk is not None:
-        image = Image.open(io.BytesIO(image_data)).convert("RGBA")
-        width, height = image.size
-        scale = max(1, min(safe_max_width // width, safe_max_height // height))
-        resized = image.resize((width * scale, height * scale), Image.Resampling.NEAREST)
-        return ImageTk.PhotoImage(resized)
-
-    encoded = base64.b64encode(image_data).decode("ascii")
-    photo = tk.PhotoImage(data=encoded, format="png")
-    scale = max(1, min(safe_max_width // photo.width(), safe_max_height // photo.height()))
-    return photo.zoom(scale, scale)
+    with metrics.span("sprite.decode", bytes=len(image_data)):
+        ImageTk = pil_image_tk()
+        if ImageTk is not None:
+            Image = pil_image()
+            image = Image.open(io.BytesIO(image_data)).convert("RGBA")
+            width, height = image.size
+            scale = max(1, min(safe_max_width // width, safe_max_height // height))
+            resized = image.resize((width * scale, height * scale), Image.Resampling.NEAREST)
+            return ImageTk.PhotoImage(resized)
+
+        encoded = base64.b64encode(image_data).decode("ascii")
+        photo = tk.PhotoImage(data=encoded, format="png")
+        scale = max(1, min(safe_max_width // photo.width(), safe_max_height // photo.height()))
+        return photo.zoom(scale, scale)
+
+
+
+class SpriteRenderer:
+    """
+    Caches sprite rendering work across redraws.
+
+    Each distinct sprite is decoded once; scaled PhotoImages are kept in a small
+    LRU keyed by (sprite bytes, integer scale), so resizing back and forth or
+    revisiting an entry reuses an existing image instead of decoding again.
+    Sprites prepared on a worker thread by `sprite_pipeline.prepare_sprite` are
+    handed in through `adopt`, leaving only the PhotoImage wrap on the Tk thread.
+    """
+
+    def __init__(self, max_decoded: int = 64, max_scaled: int = 16) -> None:
+        self.max_decoded = max_decoded
+        self.max_scaled = max_scaled
+        self._decoded: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._scaled: "OrderedDict[Tuple[bytes, int], Any]" = OrderedDict()
+
+    @property
+    def uses_pillow(self) -> bool:
+        return pil_image_tk() is not None
+
+    def render(self, image_data: bytes, max_width: int, max_height: int):
+        decoded = self._decoded.get(image_data)
+        if decoded is None:
+            decoded = self._decode(image_data)
+        else:
+            self._decoded.move_to_end(image_data)
+
+        width, height = self._size(decoded)
+        scale = fit_scale(width, height, max_width, max_height)
+        photo = self._cached(image_data, scale)
+        if photo is not None:
+            return photo
+
+        if self.uses_pillow:
+            photo = pil_image_tk().PhotoImage(scale_sprite(decoded, scale))
+        else:
+            photo = decoded.zoom(scale, scale)
+        return self._remember(image_data, scale, photo)
+
+    def adopt(self, prepared: PreparedSprite):
+        photo = self._cached(prepared.source, prepared.scale)
+        if photo is not None:
+            return photo
+
+        if self.uses_pillow and prepared.scaled is not None:
+            self._remember_decoded(prepared.source, prepared.decoded)
+            return self._remember(prepared.source, prepared.scale, pil_image_tk().PhotoImage(prepared.scaled))
+
+        base = self._decoded.get(prepared.source)
+        if base is None:
+            base = self._decode(prepared.source, prepared.png_base64)
+        return self._remember(prepared.source, prepared.scale, base.zoom(prepared.scale, prepared.scale))
+
+    def _cached(self, image_data: bytes, scale: int):
+        # bytes objects cache their hash, so keying by the payload itself is cheap.
+        key = (image_data, scale)
+        photo = self._scaled.get(key)
+        if photo is not None:
+            self._scaled.move_to_end(key)
+            metrics.incr("sprite_renderer.hits")
+        else:
+            metrics.incr("sprite_renderer.misses")
+        return photo
+
+    def _remember(self, image_data: bytes, scale: int, photo):
+        self._scaled[(image_data, scale)] = photo
+        while len(self._scaled) > self.max_scaled:
+            self._scaled.popitem(last=False)
+        return photo
+
+    def _remember_decoded(self, image_data: bytes, decoded) -> None:
+        self._decoded[image_data] = decoded
+        while len(self._decoded) > self.max_decoded:
+            self._decoded.popitem(last=False)
+
+    def _decode(self, image_data: bytes, png_base64: Optional[str] = None):
+        with metrics.span("sprite.decode", bytes=len(image_data)):
+            if self.uses_pillow:
+                decoded = decode_sprite(image_data)
+            else:
+                encoded = png_base64 or base64.b64encode(image_data).decode("ascii")
+                decoded = tk.PhotoImage(data=encoded, format="png")
+        self._remember_decoded(image_data, decoded)
+        return decoded
+
+    def _size(self, decoded) -> Tuple[int, int]:
+        if self.uses_pillow:
+            return decoded.size
+        return decoded.width(), decoded.height()